@@ -22,6 +22,13 @@ setup(
         'lxml==4.2.5',
         'suds-jurko==0.6',
     ],
+    extras_require={
+        'async': ['aiohttp>=3.5'],
+        'parquet': ['pyarrow>=0.15'],
+    },
+    entry_points={
+        'console_scripts': ['sfmc-export=sfmc.export:main'],
+    },
     test_suite="tests",
     classifiers=[
         'Intended Audience :: Developers',
@@ -0,0 +1,642 @@
+"""
+asyncio client. Request payloads are built and replies are parsed by the same suds machinery as for blocking
+Client, only http exchange is asynchronous. Requires aiohttp.
+
+Usage:
+    async with AsyncClient.make(client_factory) as client:
+        rows = await client.DataExtensionRow.set_name(name).add(payload)
+        async for row in await client.DataExtensionRow.get(m_props=props):
+            ...
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency
+    aiohttp = None
+
+from sfmc.client import (Authenticator, Client, ClientFactory, Response, StreamedResponse, ResourceHandler,
+                         ResourceBase, ObjectDefinition, SoapCall)
+from sfmc.http import check_soap_reply
+from sfmc.metrics import SoapCallRecord
+from sfmc.retry import RETRY_AUTH
+from sfmc.exceptions import (ConfigureError, AuthenticationError, APIRequestError, SOAPRequestError,
+                             ResourceHandlerException, PartialWriteError)
+from sfmc.resources.filter import SearchFilter
+from sfmc.resources.mixins import Gettable
+from sfmc.resources.data_extension import (DataExtensionHandler, DataExtensionFieldHandler, DataExtensionRowHandler,
+                                           UpsertResult)
+
+DEFAULT_ASYNC_CONCURRENCY = 10  # max in-flight requests per client
+
+
+def _require_aiohttp():
+    if aiohttp is None:
+        raise ConfigureError('aiohttp is required for async client, install it with: pip install aiohttp')
+
+
+class AsyncAuthenticator(Authenticator):
+    """
+    Authenticator refreshing token without blocking event loop.
+    Concurrent callers wait for single refresh request instead of sending own ones.
+    Token cache is read and written, but not locked, so event loop never waits for other processes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(AsyncAuthenticator, self).__init__(*args, **kwargs)
+        self.session: 'aiohttp.ClientSession' = None
+        self._lock: asyncio.Lock = None
+
+    @classmethod
+    def make_from(cls, authenticator: Authenticator) -> 'AsyncAuthenticator':
+        """Async authenticator with credentials and current tokens of given one"""
+        inst = cls(authenticator.client_id, authenticator.client_secret, auth_url=authenticator.auth_url,
+                   user_agent=authenticator.user_agent, http_client=authenticator.http_client,
+                   endpoints_url=authenticator.endpoints_url)
+
+        for attr in ('endpoint', 'auth_token_expiration', 'auth_legacy_token', 'auth_refresh_token', 'appsignature',
+                     'auth_token', 'last_refresh_ts', 'refresh_delay', 'refresh_margin', 'token_cache',
+                     'instrumentation'):
+            setattr(inst, attr, getattr(authenticator, attr))
+
+        return inst
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        # built lazily so lock belongs to running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        return self._lock
+
+    async def refresh(self, force=False, ahead: float = 0):
+        """Refresh token if it's expired, see Authenticator.refresh"""
+        if not (force or self.auth_expired(ahead) or self.endpoint is None):
+            return
+
+        token = self.auth_token
+        async with self.lock:
+            self.load_shared_token()
+            if force and self.auth_token != token:  # refreshed by concurrent caller while waiting
+                force = False
+
+            if not (force or self.auth_expired(ahead) or self.endpoint is None):
+                return
+
+            if self.auth_expired(ahead) or force:
+                await self.refresh_token()
+
+            if self.endpoint is None or force:
+                await self.detect_endpoint()
+
+            self.store_shared_token()
+
+    async def refresh_token(self):
+        """Refresh auth token"""
+        headers, data = self.token_request()
+
+        with self.instrumentation.auth_refresh():
+            async with self.session.post(self.auth_url, headers=headers, data=data) as res:
+                if res.status != 200:
+                    raise AuthenticationError('Authorization failed: ' + repr(res))
+
+                response_body = await res.json(content_type=None)
+
+            self.apply_token_response(response_body)
+
+    async def detect_endpoint(self):
+        """Detect soap-service end point"""
+        try:
+            async with self.session.get(self.endpoint_url(), headers={'user-agent': self.user_agent}) as res:
+                self.apply_endpoint_response(await res.json(content_type=None))
+        except Exception as e:
+            raise APIRequestError('Unable to determine endpoints stack: ' + str(e))
+
+
+class AsyncClient:
+    """
+    Sales Force client with awaitable api. Mirror of Client:
+    await client.some_resource.action(args, kwargs)
+    Shares parsed wsdl, soap client pool and object definition cache with blocking client it's built from.
+    Count of in-flight requests is bounded by concurrency.
+    """
+
+    def __init__(self, client: Client, concurrency: int = DEFAULT_ASYNC_CONCURRENCY):
+        """
+        :param client:      configured blocking client
+        :param concurrency: max count of concurrent requests
+        """
+        _require_aiohttp()
+
+        self.client = client
+        self.authenticator = AsyncAuthenticator.make_from(client.authenticator)
+        self.concurrency = concurrency
+        self.resource_handlers_map = client.resource_handlers_map
+        self.resource_handlers = {}
+        self._session: 'aiohttp.ClientSession' = None
+        self._semaphore: asyncio.Semaphore = None
+
+    @classmethod
+    def make(cls, factory: ClientFactory, concurrency: int = DEFAULT_ASYNC_CONCURRENCY) -> 'AsyncClient':
+        """
+        Build async client. Wsdl is loaded and initial token is requested by blocking calls,
+        so it's expected to be done once on application start
+        :param factory:     configured client factory
+        :param concurrency: max count of concurrent requests
+        """
+        return cls(factory.make(), concurrency)
+
+    @property
+    def session(self) -> 'aiohttp.ClientSession':
+        """Lazily built http session, connections are pooled up to concurrency"""
+        if self._session is None or self._session.closed:
+            http_client = self.authenticator.http_client
+            timeout = aiohttp.ClientTimeout(total=None, connect=http_client.connect_timeout,
+                                            sock_read=http_client.read_timeout)
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.concurrency),
+                                                  timeout=timeout)
+            self.authenticator.session = self._session
+
+        return self._session
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        return self._semaphore
+
+    async def refresh(self, force: bool = False):
+        """Refresh auth token if it's expired"""
+        self.authenticator.session = self.session
+        await self.authenticator.refresh(force)
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def __getattr__(self, item: str) -> 'ResourceHandler':
+        if item not in self.resource_handlers_map:
+            raise LookupError('Missing handler for resource ' + item)
+
+        if item not in self.resource_handlers:
+            self.resource_handlers[item] = async_handler_class(self.resource_handlers_map[item])(self)
+
+        return self.resource_handlers[item]
+
+    @property
+    def templates(self):
+        """Request payloads of blocking client, shared by pooled soap clients"""
+        return self.client.templates
+
+    @property
+    def definition_cache(self):
+        return self.client.definition_cache
+
+    @property
+    def response_cache(self):
+        return self.client.response_cache
+
+    @property
+    def de_catalog(self):
+        """Data extension catalog is loaded by blocking calls, handlers of async client always use Retrieve"""
+        return None
+
+    @property
+    def instrumentation(self):
+        return self.client.instrumentation
+
+    @property
+    def retry_policy(self):
+        return self.client.retry_policy
+
+    async def retrying(self, operation: str, obj_type: str, attempt: Callable[[], Awaitable[Response]]) -> Response:
+        """Repeat call while it fails by transient reason, see Client.retrying"""
+        number = 1
+        while True:
+            try:
+                response = await attempt()
+            except Exception as e:
+                reason = self.retry_policy.classify_error(e, (aiohttp.ClientError, asyncio.TimeoutError))
+                if not self.retry_policy.should_retry(operation, reason, number):
+                    raise
+                failure = e
+            else:
+                reason = self.retry_policy.classify_response(response)
+                if not self.retry_policy.should_retry(operation, reason, number):
+                    return response
+                failure = response
+
+            delay = self.retry_policy.delay(reason, number)
+            logging.getLogger('sfmc').warning('%s of %s failed by %s reason, retry in %.1fs: %s',
+                                              operation, obj_type, reason, delay, failure)
+            self.instrumentation.retry(operation, obj_type, reason)
+
+            if reason == RETRY_AUTH:
+                await self.authenticator.refresh(force=True)
+
+            await asyncio.sleep(delay)
+            number += 1
+
+    @property
+    def cache_namespace(self) -> str:
+        """Key separating cached data of different endpoints and accounts"""
+        namespace = '{}|{}'.format(self.authenticator.endpoint, self.authenticator.client_id)
+        if self.client.client_ids:
+            namespace += '|' + ','.join(str(i) for i in self.client.client_ids)
+
+        return namespace
+
+    async def send(self, record: SoapCallRecord, operation: str, *args,
+                   render: Callable[[SoapCall], bytes] = None) -> Tuple[SoapCall, int, str, bytes]:
+        """
+        Build soap request by pooled suds client and send it
+        :param record:      measurements of call, sent and received bytes are put into it
+        :param operation:   soap operation name
+        :param args:        operation arguments
+        :param render:      envelope of built call, by default envelope marshalled by suds
+        :return: call, http status, reason and reply content
+        """
+        await self.refresh()
+
+        with self.client.soap_client_pool.client(self.authenticator) as soap_client:
+            call = SoapCall.make(soap_client, operation, *args)
+
+        envelope = call.envelope if render is None else render(call)
+        async with self.semaphore:
+            async with self.session.post(call.url, data=envelope, headers=call.headers) as res:
+                content = await res.read()
+
+        record.read_exchange((len(envelope), len(content)))
+        check_soap_reply(res.status, res.headers, content)
+
+        return call, res.status, res.reason, content
+
+    async def invoke(self, record: SoapCallRecord, operation: str, *args) -> Any:
+        """
+        Execute soap operation. Envelope is built and reply is parsed by pooled suds client
+        :param record:      measurements of call
+        :param operation:   soap operation name
+        :param args:        operation arguments
+        :return: suds reply, like returned by soap_client.service.<operation>(*args)
+        """
+        call, status, reason, content = await self.send(record, operation, *args)
+
+        return call.process_reply(content, status, reason)
+
+    async def _soap_retrieve(self, request, obj_type: str, stream: bool = None) -> Response:
+        operation = 'Retrieve' if getattr(request, 'ContinueRequest', None) is None else 'ContinueRetrieve'
+
+        return await self.retrying(operation, obj_type,
+                                   lambda: self._soap_retrieve_once(operation, request, obj_type, stream))
+
+    async def _soap_retrieve_once(self, operation: str, request, obj_type: str, stream: bool = None) -> Response:
+        with self.instrumentation.soap_call(operation, obj_type) as record:
+            response = await self._send_retrieve(record, request, stream)
+            response.object_type = obj_type
+            record.read_response(response)
+
+        return response
+
+    async def _send_retrieve(self, record: SoapCallRecord, request, stream: bool = None) -> Response:
+        if stream is None:
+            stream = self.client.stream_results
+
+        if not stream:
+            return Response.make_from_service_response(await self.invoke(record, 'Retrieve', request))
+
+        call, status, reason, content = await self.send(record, 'Retrieve', request)
+
+        if status != 200:
+            return Response.make_from_service_response(call.process_reply(content, status, reason))
+
+        return StreamedResponse.make_from_content(content, self.client.soap_client_factory.field_types)
+
+    async def soap_describe_object(self, obj_type: str) -> Response:
+        """
+        Get object definition
+        :param obj_type: Resource type described at wsdl
+        :return:
+        """
+        return await self.soap_describe_objects([obj_type])
+
+    async def soap_describe_objects(self, obj_types: List[str]) -> Response:
+        """
+        Get definitions of several object types by single request
+        :param obj_types: Resource types described at wsdl
+        :return:
+        """
+        request = self.client.make_describe_request(obj_types)
+        obj_type = ','.join(obj_types)
+
+        return await self.retrying('Describe', obj_type, lambda: self._soap_describe(request, obj_type))
+
+    async def _soap_describe(self, request, obj_type: str) -> Response:
+        with self.instrumentation.soap_call('Describe', obj_type) as record:
+            resp = await self.invoke(record, 'Describe', request)
+
+            if resp is None:
+                raise SOAPRequestError('Empty response for describe request for {} object types'.format(obj_type))
+
+            response = Response.make_from_service_response(resp)
+            record.read_response(response)
+
+        return response
+
+    async def prewarm_object_definitions(self, obj_types: List[str] = None) -> List[ObjectDefinition]:
+        """
+        Describe object types by single request and put definitions into definition cache
+        :param obj_types: Resource types, by default types of all bound resource handlers
+        :return: fetched definitions
+        """
+        if obj_types is None:
+            obj_types = []
+            for handler in self.resource_handlers_map.values():
+                if handler.get_resource_type() not in obj_types:
+                    obj_types.append(handler.get_resource_type())
+
+        resp = await self.soap_describe_objects(obj_types)
+
+        if not resp.is_valid:
+            raise ResourceHandlerException('Can not describe objects {}: invalid response[{}]'.format(obj_types, resp))
+
+        definitions = [ObjectDefinition.make_from_result(r) for r in resp.results]
+
+        if self.definition_cache is not None:
+            for definition in definitions:
+                self.definition_cache.set(self.cache_namespace, definition)
+
+        return definitions
+
+    async def soap_get(self, obj_type: str, search_filter: SearchFilter = None, props: list = None,
+                       options: dict = None, stream: bool = None) -> Response:
+        """
+        Get single object or array of objects by soap request, cached responses are served like by Client.soap_get
+        :param obj_type: requested object type
+        :param search_filter: search filter
+        :param props: requested object fields
+        :param options: additional request option
+        :param stream: parse reply by lxml into StreamedResponse, by default stream_results of client
+        :return: service response
+        """
+        cache_key = None
+        if self.response_cache is not None and self.response_cache.type_ttl(obj_type) is not None:
+            cache_key = self.response_cache.make_key(self.cache_namespace, obj_type, search_filter, props, options,
+                                                     self.client.stream_results if stream is None else stream)
+            response = self.response_cache.get(cache_key)
+            if response is not None:
+                return response
+
+        request = self.client.make_retrieve_request(obj_type, search_filter, props, options)
+        response = await self._soap_retrieve(request, obj_type, stream)
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+
+        return response
+
+    async def soap_get_more_results(self, request_id: str, stream: bool = None, obj_type: str = None) -> Response:
+        """
+        Retrieve more results
+        :param request_id: Id of request marked as has more results
+        :param stream: parse reply by lxml into StreamedResponse, by default stream_results of client
+        :param obj_type: object type of initial request, used by instrumentation only
+        :return: ws response
+        """
+        request = self.client.make_continue_request(request_id)
+
+        return await self._soap_retrieve(request, obj_type, stream)
+
+    async def _soap_write_chunk(self, operation: str, obj_type: str, props,
+                                options: Mapping[str, Any] = None) -> Response:
+        ws_options = self.client.make_write_options(operation, options)
+
+        if obj_type in self.client.direct_write_types:
+            objects = props if isinstance(props, list) else [props]
+            return await self.retrying(operation, obj_type,
+                                       lambda: self._soap_write_direct(operation, obj_type, objects, ws_options))
+
+        payload = self.client.parse_props_into_ws_object(obj_type, props)
+
+        return await self.retrying(operation, obj_type,
+                                   lambda: self._soap_write_payload(operation, obj_type, payload, ws_options))
+
+    async def _soap_write_direct(self, operation: str, obj_type: str, objects: List[Mapping[str, Any]],
+                                 ws_options=None) -> Response:
+        def render(call: SoapCall) -> bytes:
+            return self.client.render_write_envelope(call, operation, obj_type, objects)
+
+        with self.instrumentation.soap_call(operation, obj_type) as record:
+            call, status, reason, content = await self.send(record, operation, ws_options, [], render=render)
+            response = Response.make_from_service_response(call.process_reply(content, status, reason))
+            record.read_response(response)
+
+        return response
+
+    async def _soap_write_payload(self, operation: str, obj_type: str, payload, ws_options=None) -> Response:
+        with self.instrumentation.soap_call(operation, obj_type) as record:
+            service_response = await self.invoke(record, operation, ws_options, payload)
+            response = Response.make_from_service_response(service_response)
+            record.read_response(response)
+
+        return response
+
+    async def soap_write(self, operation: str, obj_type: str, props, options: Mapping[str, Any] = None) -> Response:
+        """
+        Execute Create/Update/Delete request. List of objects is split into chunks like by Client.soap_write,
+        chunks are sent concurrently within client concurrency, failed chunk does not stop others
+        :param operation:   Create, Update or Delete
+        :param obj_type:    object type described
+        :param props:       dict|list   target object field in ws format
+        :param options:     operation options sent with every chunk, see Client.make_write_options
+        :return: ws response
+        """
+        try:
+            chunks = self.client.write_chunks(props)
+
+            if len(chunks) <= 1:
+                return await self._soap_write_chunk(operation, obj_type, props, options)
+
+            outcomes = await asyncio.gather(*[self._soap_write_chunk(operation, obj_type, c, options)
+                                              for c in chunks], return_exceptions=True)
+
+            return self.client.merge_write_outcomes(chunks, list(outcomes))
+        finally:
+            if self.response_cache is not None:
+                self.response_cache.invalidate(self.cache_namespace, obj_type)
+
+    async def soap_post(self, obj_type: str, props) -> Response:
+        """
+        Create request
+        :param obj_type: object type described
+        :param props:   dict|list   target object field in ws format
+        :return: ws response
+        """
+        return await self.soap_write('Create', obj_type, props)
+
+    async def soap_patch(self, obj_type: str, props, options: Mapping[str, Any] = None) -> Response:
+        """
+        Update request
+        :param obj_type: object type described
+        :param props:   dict|list   target object field in ws format
+        :param options: UpdateOptions values, like SaveOptions
+        :return: ws response
+        """
+        return await self.soap_write('Update', obj_type, props, options)
+
+    async def soap_delete(self, obj_type, props) -> Response:
+        """
+        Delete object
+        :param obj_type: object type described
+        :param props:   dict|list   target object field in ws format
+        :return: ws response
+        """
+        return await self.soap_write('Delete', obj_type, props)
+
+
+class AsyncResourceHandler:
+    """
+    Awaitable counterpart of ResourceHandler, mixed into resource handlers of async client.
+    Handler methods building resource of client response are awaitable as is, cause make_resource
+    of awaitable response is awaitable too.
+    """
+
+    client: AsyncClient
+
+    def make_resource(self, response) -> ResourceBase:
+        if inspect.isawaitable(response):
+            return self._make_resource_async(response)
+
+        return super(AsyncResourceHandler, self).make_resource(response)
+
+    async def _make_resource_async(self, response: Awaitable[Response]) -> ResourceBase:
+        return super(AsyncResourceHandler, self).make_resource(await response)
+
+    async def describe(self) -> ObjectDefinition:
+        """Object definition. Served from client definition cache if it's available"""
+        definition = self.cached_definition()
+
+        if definition is None:
+            definition = self.store_definition(await self.client.soap_describe_object(self.get_resource_type()))
+
+        return definition
+
+
+class AsyncGettable:
+    async def get(self, m_filter: SearchFilter = None, m_props: list = None, m_options: dict = None) -> ResourceBase:
+        """
+        Get objects, see Gettable.get
+        :param m_filter:    filter
+        :param m_props:     retrieve given props
+        :param m_options:   additional options
+        :return: ResourceBase
+        """
+        if m_props is None:
+            try:
+                m_props = (await self.describe()).retrievable_property_names()
+            except Exception as e:
+                raise ResourceHandlerException('Can not describe object: {}'.format(e))
+
+        if m_options is not None and type(m_options) is not dict:
+            raise ResourceHandlerException('options must be a dict')
+
+        resp = await self.client.soap_get(self.get_resource_type(), m_filter, m_props, m_options)
+
+        return self.make_resource(resp)
+
+
+class AsyncDataExtensionHandler:
+    async def _first_entity(self, prop: str, value: str) -> Any:
+        res = await self.get(m_filter=SearchFilter.equals(prop, value), m_props=["Name", "CustomerKey"])
+
+        if not res.is_valid:
+            msg = 'Can not find data extension by {}[{}]: invalid service response[{}]'.format(prop, value, res)
+            raise ResourceHandlerException(msg)
+
+        if res.is_empty:
+            msg = 'Can not find data extension by {}[{}]: result set is empty, resource: {}'.format(prop, value, res)
+            raise ResourceHandlerException(msg)
+
+        return res.entities[0]
+
+    async def name_for_customer_key(self, key: str) -> str:
+        """
+        Get data extension name for given key
+        :param key: data extension key
+        :return: de name
+        """
+        return (await self._first_entity('CustomerKey', key)).Name
+
+    async def customer_key_for_name(self, name: str) -> str:
+        """
+        Get data extension key for given name
+        :param name: data extension name
+        :return: de key
+        """
+        return (await self._first_entity('Name', name)).CustomerKey
+
+
+class AsyncDataExtensionFieldHandler:
+    async def get(self, customer_key: str = None, m_props: List[str] = None) -> ResourceBase:
+        if m_props is None or type(m_props) is not list:
+            try:
+                m_props = (await self.describe()).retrievable_property_names()
+            except Exception as e:
+                raise ResourceHandlerException('Can not describe object: {}'.format(e))
+
+        return await super(AsyncDataExtensionFieldHandler, self).get(customer_key, m_props)
+
+
+class AsyncDataExtensionRowHandler:
+    def make_upsert_result(self, response, rows_count: int) -> UpsertResult:
+        if inspect.isawaitable(response):
+            return self._make_upsert_result_async(response, rows_count)
+
+        return super(AsyncDataExtensionRowHandler, self).make_upsert_result(response, rows_count)
+
+    async def _make_upsert_result_async(self, response: Awaitable[Response], rows_count: int) -> UpsertResult:
+        try:
+            response = await response
+        except PartialWriteError as e:
+            return super(AsyncDataExtensionRowHandler, self).make_upsert_result(e.response, rows_count, e.errors)
+
+        return super(AsyncDataExtensionRowHandler, self).make_upsert_result(response, rows_count)
+
+
+# async overrides of handler methods which use responses itself, not only wrap them into resource
+ASYNC_HANDLER_MIXINS = [
+    (Gettable, AsyncGettable),
+    (DataExtensionHandler, AsyncDataExtensionHandler),
+    (DataExtensionFieldHandler, AsyncDataExtensionFieldHandler),
+    (DataExtensionRowHandler, AsyncDataExtensionRowHandler),
+]
+
+_async_handler_classes: Dict[type, type] = {}
+
+
+def async_handler_class(handler_class: type) -> type:
+    """
+    Async counterpart of resource handler class
+    :param handler_class: ResourceHandler subclass
+    :return: handler class with awaitable methods
+    """
+    cls = _async_handler_classes.get(handler_class)
+
+    if cls is None:
+        mixins = [m for base, m in ASYNC_HANDLER_MIXINS if issubclass(handler_class, base)]
+        cls = type('Async' + handler_class.__name__, tuple(mixins) + (AsyncResourceHandler, handler_class), {})
+        _async_handler_classes[handler_class] = cls
+
+    return cls
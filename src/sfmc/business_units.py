@@ -0,0 +1,176 @@
+"""
+Clients of many business units built by single client factory. Clients share parsed wsdl, connection pool and caches
+of factory. Business units configured with own credentials keep own tokens, other business units are queried
+by factory credentials with ClientIDs of Retrieve request and written with Client of Create/Update/Delete options.
+Describe has no client option, definitions are described in factory account.
+The same query is fanned out to business units in parallel.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from sfmc.client import Authenticator, Client, ClientFactory, Entity
+from sfmc.exceptions import ConfigureError, ResourceHandlerException
+from sfmc.resources.filter import SearchFilter
+
+DEFAULT_FAN_OUT_PARALLELISM = 8
+
+
+class BusinessUnitResult:
+    """Result of fanned out call for single business unit"""
+
+    def __init__(self, business_unit_id: int, value: Any = None, error: Exception = None):
+        self.business_unit_id = business_unit_id
+        self.value = value
+        self.error = error
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return '{}[business_unit_id:{},is_valid:{},error:{}]'.format(
+            self.__class__.__name__, self.business_unit_id, self.is_valid, self.error)
+
+
+class BusinessUnitPool:
+    """
+    Clients of business units, built lazily on first use. Business units sharing credentials share authenticator,
+    so token is requested once per credentials instead of once per business unit.
+    Usage:
+        pool = BusinessUnitPool(factory)
+        pool.discover()
+        for mid, entity in pool.merge(pool.get('DataExtension', m_props=['Name', 'CustomerKey'])):
+            ...
+    """
+
+    def __init__(self, factory: ClientFactory, business_units: Mapping[int, Mapping[str, Any]] = None,
+                 parallelism: int = DEFAULT_FAN_OUT_PARALLELISM):
+        """
+        :param factory:         configured client factory, its credentials are used by business units without own
+        :param business_units:  business unit MID to auth params overriding factory params(client_id, client_secret,
+                                endpoint, ...), business unit with empty params is queried by factory credentials
+        :param parallelism:     count of business units queried concurrently
+        """
+        self.factory = factory
+        self.business_units: Dict[int, Dict[str, Any]] = {int(k): dict(v or {})
+                                                          for k, v in (business_units or {}).items()}
+        self.parallelism = parallelism
+        self._authenticators: Dict[tuple, Authenticator] = {}
+        self._clients: Dict[int, Client] = {}
+        self._locks: Dict[Any, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key) -> threading.Lock:
+        """Lock of single authenticator or client, so different business units are prepared concurrently"""
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def authenticator(self, params: Mapping[str, Any] = None) -> Authenticator:
+        """Authenticator of credentials, built once per distinct auth params"""
+        key = tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+        authenticator = self._authenticators.get(key)
+        if authenticator is None:
+            with self._key_lock(('auth', key)):
+                authenticator = self._authenticators.get(key)
+                if authenticator is None:
+                    authenticator = self._authenticators[key] = self.factory.make_authentificator(params)
+
+        return authenticator
+
+    def client(self, business_unit_id: int) -> Client:
+        """Client of business unit"""
+        business_unit_id = int(business_unit_id)
+        if business_unit_id not in self.business_units:
+            raise ConfigureError('Unknown business unit {}'.format(business_unit_id))
+
+        cl = self._clients.get(business_unit_id)
+        if cl is None:
+            with self._key_lock(('client', business_unit_id)):
+                cl = self._clients.get(business_unit_id)
+                if cl is None:
+                    params = self.business_units[business_unit_id]
+                    if params.get('client_id') not in (None, ''):
+                        cl = self.factory.make_client(self.authenticator(params))
+                    else:
+                        cl = self.factory.make_client(self.authenticator(), [business_unit_id])
+                    self._clients[business_unit_id] = cl
+
+        return cl
+
+    def discover(self, m_filter: SearchFilter = None) -> List[int]:
+        """
+        Add business units of factory account found by BusinessUnit Retrieve, configured business units are kept
+        :param m_filter: filter of business units
+        :return: MIDs of all business units of pool
+        """
+        cl = self.factory.make_client(self.authenticator())
+        resource = cl.BusinessUnit.get(m_filter=m_filter, m_props=['ID', 'Name'])
+        if not resource.is_valid:
+            raise ResourceHandlerException('Can not discover business units: invalid response[{}]'.format(resource))
+
+        for e in resource:
+            self.business_units.setdefault(int(e.ID), {})
+
+        return list(self.business_units)
+
+    def fan_out(self, call: Callable[[Client], Any], business_units: Iterable[int] = None) -> List[BusinessUnitResult]:
+        """
+        Run call with client of every business unit in parallel, error of single business unit does not stop others
+        :param call:            function of client
+        :param business_units:  MIDs of queried business units, by default all business units of pool
+        :return: results in order of business units
+        """
+        ids = [int(i) for i in business_units] if business_units is not None else list(self.business_units)
+
+        def run(business_unit_id: int) -> BusinessUnitResult:
+            try:
+                return BusinessUnitResult(business_unit_id, call(self.client(business_unit_id)))
+            except Exception as e:
+                logging.getLogger('sfmc').warning('Call of business unit %s failed: %s', business_unit_id, e)
+                return BusinessUnitResult(business_unit_id, error=e)
+
+        if not ids:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.parallelism, len(ids))) as executor:
+            return list(executor.map(run, ids))
+
+    def get(self, resource_name: str, m_filter: SearchFilter = None, m_props: list = None, m_options: dict = None,
+            business_units: Iterable[int] = None) -> List[BusinessUnitResult]:
+        """
+        The same handler get for every business unit, all pages are fetched
+        :param resource_name:   name of bound gettable resource handler, e.g. DataExtension
+        :param m_filter:        filter
+        :param m_props:         retrieved props
+        :param m_options:       additional options
+        :param business_units:  MIDs of queried business units, by default all business units of pool
+        :return: results with list of entities of business unit as value
+        """
+        def call(cl: Client) -> List[Entity]:
+            resource = getattr(cl, resource_name).get(m_filter=m_filter, m_props=m_props, m_options=m_options)
+            if not resource.is_valid:
+                raise ResourceHandlerException('Can not retrieve {}: invalid response[{}]'.format(resource_name,
+                                                                                                  resource))
+            return list(resource)
+
+        return self.fan_out(call, business_units)
+
+    @staticmethod
+    def merge(results: List[BusinessUnitResult]) -> Iterator[Tuple[int, Entity]]:
+        """Entities of valid results tagged by business unit MID"""
+        for result in results:
+            if result.is_valid:
+                for e in result.value:
+                    yield result.business_unit_id, e
+
+    def close(self):
+        """Stop background token refresh of authenticators"""
+        for authenticator in self._authenticators.values():
+            authenticator.stop_background_refresh()
+
+    def __repr__(self):
+        return '{}[business_units:{},clients:{},authenticators:{}]'.format(
+            self.__class__.__name__, len(self.business_units), len(self._clients), len(self._authenticators))
@@ -0,0 +1,296 @@
+"""Cache backends"""
+
+import os
+import shutil
+import time
+import pickle
+import hashlib
+import pathlib
+import tempfile
+import json
+import threading
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Hashable, List, Mapping, Dict, Iterator, Set
+
+try:
+    import fcntl
+except ImportError:  # not available on windows, file lock is skipped
+    fcntl = None
+
+logger = logging.getLogger('sfmc')
+
+
+class MemoryCache:
+    """Thread safe in-memory cache with per entry TTL and LRU eviction"""
+
+    def __init__(self, ttl: float = None, max_size: int = None, group_size: int = 0):
+        """
+        :param ttl:         default entry time to live in seconds, None - never expire
+        :param max_size:    max entries count, None - unbounded
+        :param group_size:  count of leading items of tuple keys forming group, see delete_group
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.group_size = group_size
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._groups: Dict[tuple, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def _index(self, key: Hashable):
+        if self.group_size:
+            self._groups.setdefault(key[:self.group_size], set()).add(key)
+
+    def _drop(self, key: Hashable):
+        """Remove entry and its group index, lock must be held"""
+        self._data.pop(key, None)
+
+        if self.group_size:
+            keys = self._groups.get(key[:self.group_size])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._groups[key[:self.group_size]]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires, value = entry
+            if expires is not None and expires < time.time():
+                self._drop(key)
+                return default
+
+            self._data.move_to_end(key)
+
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            self._index(key)
+
+            if self.max_size is not None:
+                while len(self._data) > self.max_size:
+                    self._drop(next(iter(self._data)))
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._drop(key)
+
+    def delete_group(self, group: tuple):
+        """Drop entries which keys start with group of group_size items, other entries are not visited"""
+        with self._lock:
+            for key in self._groups.pop(tuple(group), ()):
+                self._data.pop(key, None)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._data.keys())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._groups.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FileCache:
+    """
+    Cache persisted to directory, one pickle file per entry. Can be shared between processes:
+    entries are written to temporary file and atomically moved into place.
+    With group_size entries of group are kept in own subdirectory, so group is dropped without reading entries.
+    """
+
+    SUFFIX = '.cache'
+
+    def __init__(self, path: str, ttl: float = None, group_size: int = 0):
+        """
+        :param path:        cache directory
+        :param ttl:         default entry time to live in seconds, None - never expire
+        :param group_size:  count of leading items of tuple keys forming group, see delete_group
+        """
+        self.path = path
+        self.ttl = ttl
+        self.group_size = group_size
+
+        p = pathlib.Path(path)
+        if not p.exists():
+            p.mkdir(parents=True)
+
+    @staticmethod
+    def _digest(key: Hashable) -> str:
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def _group_path(self, group: tuple) -> str:
+        return os.path.join(self.path, 'group-' + self._digest(tuple(group)))
+
+    def _file_name(self, key: Hashable) -> str:
+        path = self._group_path(key[:self.group_size]) if self.group_size else self.path
+
+        return os.path.join(path, self._digest(key) + self.SUFFIX)
+
+    def _load(self, file_name: str):
+        try:
+            with open(file_name, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug('Can not load cache entry %s: %s', file_name, e)
+            return None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        file_name = self._file_name(key)
+        entry = self._load(file_name)
+        if entry is None:
+            return default
+
+        stored_key, expires, value = entry
+        if stored_key != key:
+            return default
+
+        if expires is not None and expires < time.time():
+            self._remove(file_name)
+            return default
+
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.time() + ttl if ttl is not None else None
+
+        file_name = self._file_name(key)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, expires, value), f, pickle.HIGHEST_PROTOCOL)
+            os.makedirs(os.path.dirname(file_name), exist_ok=True)
+            os.replace(tmp_name, file_name)
+        except Exception as e:
+            self._remove(tmp_name)
+            logger.debug('Can not store cache entry %s: %s', key, e)
+
+    @staticmethod
+    def _remove(file_name: str):
+        try:
+            os.remove(file_name)
+        except OSError:
+            pass
+
+    def delete(self, key: Hashable):
+        self._remove(self._file_name(key))
+
+    def delete_group(self, group: tuple):
+        """Drop entries which keys start with group of group_size items, other entries are not visited"""
+        shutil.rmtree(self._group_path(group), ignore_errors=True)
+
+    def _files(self) -> List[str]:
+        files = []
+        for root, _, names in os.walk(self.path):
+            files.extend(os.path.join(root, n) for n in names if n.endswith(self.SUFFIX))
+
+        return files
+
+    def keys(self) -> List[Hashable]:
+        keys = []
+        for file_name in self._files():
+            entry = self._load(file_name)
+            if entry is not None:
+                keys.append(entry[0])
+
+        return keys
+
+    def clear(self):
+        for file_name in self._files():
+            self._remove(file_name)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._files())
+
+
+class TokenFileCache:
+    """
+    Auth tokens shared by processes of one host. Each key(auth url and client id) is stored in own json file,
+    refresh is serialized between processes by exclusive lock of sidecar lock file.
+    """
+
+    PREFIX = 'token-'
+
+    def __init__(self, path: str):
+        """
+        :param path: cache directory
+        """
+        self.path = path
+
+        p = pathlib.Path(path)
+        if not p.exists():
+            p.mkdir(parents=True)
+
+    def _file_name(self, key: str, suffix: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+        return os.path.join(self.path, self.PREFIX + digest + suffix)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Exclusive inter-process lock of key"""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._file_name(key, '.lock'), 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def load(self, key: str) -> Dict[str, Any]:
+        """Stored token state or None"""
+        try:
+            with open(self._file_name(key, '.json'), 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug('Can not load token of %s: %s', key, e)
+            return None
+
+        if state.get('key') != key:
+            return None
+
+        return state
+
+    def store(self, key: str, state: Mapping[str, Any]):
+        state = dict(state, key=key)
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_name, self._file_name(key, '.json'))
+        except Exception as e:
+            FileCache._remove(tmp_name)
+            logger.debug('Can not store token of %s: %s', key, e)
+
+
+class CheckpointFileCache(TokenFileCache):
+    """Sync checkpoints, like high-water marks of incremental event sync, stored as json file per key"""
+
+    PREFIX = 'checkpoint-'
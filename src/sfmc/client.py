@@ -1,41 +1,87 @@
 import os
 import os.path
+import sys
+import shutil
+import pickle
+import hashlib
+import inspect
 import pathlib
 import time
 import datetime
 import json
 import logging
-from typing import Mapping, Any, Dict, List, Iterable, Callable, MutableMapping
-
-import requests
-from suds.client import Client as SoapClient
+import queue
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Mapping, Any, Dict, List, Iterable, Iterator, Callable, MutableMapping, Sequence, Tuple, \
+    AsyncIterator, Awaitable
+
+import suds
+from suds.cache import ObjectCache
+from suds.client import Client as SoapClient, ServiceSelector
+from suds.options import Options as SoapOptions
+from suds.properties import Unskin
 from suds.wsse import Security, UsernameToken
 from suds.sax.element import Element
 
 from sfmc.exceptions import (ConfigureError, AuthenticationError, APIRequestError, SOAPRequestError,
-                             ResourceMissingPropertyException, NoMoreDataAvailable, ResourceHandlerException)
-from sfmc.util import check_required_keys, all_keys_not_none, any_keys_not_none, suds_results_to_simple_types
+                             ResourceMissingPropertyException, NoMoreDataAvailable, ResourceHandlerException,
+                             PartialWriteError)
+from sfmc.cache import MemoryCache, FileCache, TokenFileCache, CheckpointFileCache
+from sfmc.http import Client as HttpClient, ClientFactory as HttpClientFactory, SoapTransport, check_soap_reply
+from sfmc.util import (check_required_keys, all_keys_not_none, any_keys_not_none, suds_results_to_simple_types,
+                       sobject_to_dict, chunked)
+from sfmc.converter import get_converter
+from sfmc.parser import (read_retrieve_status, iter_retrieve_results, count_retrieve_results, FieldTypes, NS_PARTNER,
+                         TRANSLATORS, BUILTIN_TYPE_PREFIX)
+from sfmc.metrics import Instrumentation, MetricsInstrumentation, SoapCallRecord
+from sfmc.retry import RetryPolicy, RETRY_AUTH
+from sfmc.templates import RequestTemplates
+from sfmc.envelope import render_write_envelope
 from sfmc.resources.filter import SearchFilter
 
 DEFAULT_USER_AGENT = 'sfmc'
 DEFAULT_AUTH_URL = 'https://auth.exacttargetapis.com/v1/requestToken?legacy=1'
+DEFAULT_ENDPOINTS_URL = 'https://www.exacttargetapis.com/platform/v1/endpoints/soap'
 DEFAULT_WSDL_URL = 'https://webservice.exacttarget.com/etframework.wsdl'
 DEFAULT_WSDL_FILE_EXPIRE_TIME = 60 * 60 * 24  # 1 day in seconds
+DEFAULT_OBJECT_DEFINITION_TTL = 60 * 60 * 24  # 1 day in seconds
+DEFAULT_RESPONSE_CACHE_SIZE = 10000  # cached Retrieve responses kept in memory
+WSDL_CACHE_VERSION = 1  # bump when cached wsdl format becomes incompatible
+WSDL_PICKLE_RECURSION_LIMIT = 10000
+WSDL_PICKLE_STACK_SIZE = 256 * 1024 * 1024  # bytes, stack of thread pickling parsed wsdl
+PREFETCH_POLL_INTERVAL = 0.1  # seconds
+DEFAULT_SOAP_POOL_SIZE = 10
+DEFAULT_WRITE_CHUNK_SIZE = 2500  # objects per create/update/delete request
+DEFAULT_WRITE_CHUNK_BYTES = 3 * 1024 * 1024  # estimated envelope size
+DEFAULT_WRITE_PARALLELISM = 1
+DEFAULT_AUTH_REFRESH_MARGIN = 300  # token is refreshed this count of seconds before expiration
+DEFAULT_AUTH_REFRESH_LEAD = 60  # background refresh happens this count of seconds before token is due
+AUTH_REFRESH_RETRY_INTERVAL = 30  # seconds
+AUTH_REFRESH_MIN_INTERVAL = 1  # seconds
 
 
 class Authenticator:
     """Provide authentication"""
 
     def __init__(self, client_id: str, client_secret: str, auth_url: str = DEFAULT_AUTH_URL,
-                 user_agent: str = DEFAULT_USER_AGENT):
+                 user_agent: str = DEFAULT_USER_AGENT, http_client: HttpClient = None,
+                 endpoints_url: str = DEFAULT_ENDPOINTS_URL):
         """
            :param auth_url: Authorization url
            :param client_id: client id
            :param client_secret: client secret
            :param user_agent: user agent
+           :param http_client: pooled http client, shared with soap transport
+           :param endpoints_url: url of soap endpoint discovery
            :return:
            """
+        self.http_client = http_client if http_client is not None else HttpClient()
         self.auth_url = auth_url
+        self.endpoints_url = endpoints_url
         self.client_id = client_id
         self.client_secret = client_secret
         self.user_agent = user_agent
@@ -48,13 +94,122 @@ class Authenticator:
         self.auth_token = None
         self.last_refresh_ts = time.time()
         self.refresh_delay = 60 * 10  # 10 minutes
+        self.refresh_margin = DEFAULT_AUTH_REFRESH_MARGIN
+        self.token_cache: TokenFileCache = None
+        self.instrumentation: Instrumentation = Instrumentation()
+
+        self._refresh_lock = threading.Lock()
+        self._background_stop: threading.Event = None
+
+    def refresh(self, force=False, ahead: float = 0):
+        """
+        Refresh token if it's expired. Concurrent callers wait for single refresh instead of sending own requests,
+        with token cache token is refreshed once for all processes sharing cache.
+        :param force:   refresh even if token is not expired, skipped if token was changed by concurrent caller
+        :param ahead:   treat token as expired if it's due within given count of seconds
+        """
+        if not (force or self.auth_expired(ahead) or self.endpoint is None):
+            return
+
+        token = self.auth_token
+        with self._refresh_lock, self._shared_lock():
+            self.load_shared_token()
+            if force and self.auth_token != token:  # refreshed by concurrent caller while waiting
+                force = False
+
+            if not (force or self.auth_expired(ahead) or self.endpoint is None):
+                return
+
+            if self.auth_expired(ahead) or force:
+                self.refresh_token()
+
+            if self.endpoint is None or force:
+                self.detect_endpoint()
+
+            self.store_shared_token()
+
+    @property
+    def token_cache_key(self) -> str:
+        return '{}|{}'.format(self.auth_url, self.client_id)
+
+    @contextmanager
+    def _shared_lock(self):
+        if self.token_cache is None:
+            yield
+            return
+
+        with self.token_cache.lock(self.token_cache_key):
+            yield
+
+    def token_state(self) -> Dict[str, Any]:
+        """Tokens and endpoint, shared through token cache"""
+        return {
+            'auth_token': self.auth_token,
+            'auth_token_expiration': self.auth_token_expiration,
+            'auth_legacy_token': self.auth_legacy_token,
+            'auth_refresh_token': self.auth_refresh_token,
+            'last_refresh_ts': self.last_refresh_ts,
+            'endpoint': self.endpoint,
+        }
+
+    def load_shared_token(self):
+        """Take token from token cache if it's refreshed later than own one"""
+        if self.token_cache is None:
+            return
+
+        state = self.token_cache.load(self.token_cache_key)
+        if state is None or state.get('auth_token') is None:
+            return
+
+        if self.auth_token is not None and state['last_refresh_ts'] <= self.last_refresh_ts:
+            return
 
-    def refresh(self, force=False):
-        if self.auth_expired() or force:
-            self.refresh_token()
+        for k in self.token_state():
+            if state.get(k) is not None:
+                setattr(self, k, state[k])
 
-        if self.endpoint is None or force:
-            self.detect_endpoint()
+    def store_shared_token(self):
+        if self.token_cache is not None and self.auth_token is not None:
+            self.token_cache.store(self.token_cache_key, self.token_state())
+
+    def start_background_refresh(self, lead: float = DEFAULT_AUTH_REFRESH_LEAD):
+        """
+        Refresh token in background thread before it's due, so requests never wait for refresh
+        :param lead: count of seconds before token is due
+        """
+        if self._background_stop is not None:
+            return
+
+        self._background_stop = threading.Event()
+        # thread must not reference authenticator itself, otherwise it's never collected
+        thread = threading.Thread(target=self._background_refresh,
+                                  args=(weakref.ref(self), self._background_stop, lead), daemon=True)
+        thread.start()
+
+    def stop_background_refresh(self):
+        if self._background_stop is not None:
+            self._background_stop.set()
+            self._background_stop = None
+
+    @staticmethod
+    def _background_refresh(ref: Callable[[], 'Authenticator'], stop: threading.Event, lead: float):
+        delay = 0
+        while not stop.wait(delay):
+            authenticator = ref()
+            if authenticator is None:
+                return
+
+            try:
+                authenticator.refresh(ahead=lead)
+                delay = max(authenticator.refresh_due_ts() - lead - time.time(), AUTH_REFRESH_MIN_INTERVAL)
+            except Exception as e:
+                logging.getLogger('sfmc').warning('Background token refresh failed: %s', e)
+                delay = AUTH_REFRESH_RETRY_INTERVAL
+
+            del authenticator
+
+    def __del__(self):
+        self.stop_background_refresh()
 
     def refresh_token(self):
         """
@@ -66,6 +221,17 @@ class Authenticator:
             :param user_agent: user agent
             :return:
             """
+        headers, data = self.token_request()
+
+        with self.instrumentation.auth_refresh():
+            res = self.http_client.post(self.auth_url, headers=headers, data=data)
+            if res.status_code != 200:
+                raise AuthenticationError('Authorization failed: ' + repr(res))
+
+            self.apply_token_response(res.json())
+
+    def token_request(self) -> Tuple[Dict[str, str], str]:
+        """Headers and body of token request"""
         headers = {'content-type': 'application/json', 'user-agent': self.user_agent}
 
         payload = {
@@ -77,11 +243,10 @@ class Authenticator:
         if self.auth_refresh_token is not None:
             payload['refreshToken'] = self.auth_refresh_token
 
-        res = requests.post(self.auth_url, headers=headers, data=json.dumps(payload))
-        if res.status_code != 200:
-            raise AuthenticationError('Authorization failed: ' + repr(res))
+        return headers, json.dumps(payload)
 
-        response_body = res.json()
+    def apply_token_response(self, response_body: Mapping[str, Any]):
+        """Store tokens of token request response"""
         if 'accessToken' not in response_body:
             raise Exception('Unable to validate provided pair client_id/client_secret):' + repr(response_body))
 
@@ -89,49 +254,158 @@ class Authenticator:
         self.auth_token_expiration = time.time() + response_body['expiresIn']
         self.auth_legacy_token = response_body['legacyToken']
         self.auth_refresh_token = response_body['refreshToken'] if 'refreshToken' in response_body else None
+        self.last_refresh_ts = time.time()
 
     def detect_endpoint(self):
         """
             Detect soap-service end point
             """
-        url = 'https://www.exacttargetapis.com/platform/v1/endpoints/soap?access_token=' + self.auth_token
-        headers = {'user-agent': self.user_agent}
-
         try:
-            res = requests.get(url, headers)
-            response_body = res.json()
-            if 'url' in response_body:
-                self.endpoint = str(response_body['url'])
+            res = self.http_client.get(self.endpoint_url(), headers={'user-agent': self.user_agent})
+            self.apply_endpoint_response(res.json())
         except Exception as e:
             raise APIRequestError('Unable to determine endpoints stack: ' + str(e))
 
-    def auth_expired(self) -> bool:
+    def endpoint_url(self) -> str:
+        """Url of soap endpoint discovery for current token"""
+        return self.endpoints_url + '?access_token=' + self.auth_token
+
+    def apply_endpoint_response(self, response_body: Mapping[str, Any]):
+        if 'url' in response_body:
+            self.endpoint = str(response_body['url'])
+
+    def refresh_due_ts(self) -> float:
+        """Time when token is considered expired and has to be refreshed"""
+        if self.auth_token is None or self.auth_token_expiration is None:
+            return 0
+
+        return min(self.auth_token_expiration - self.refresh_margin, self.last_refresh_ts + self.refresh_delay)
+
+    def auth_expired(self, ahead: float = 0) -> bool:
         """
         Check auth token expiration
+        :param ahead: treat token as expired if it's due within given count of seconds
         :return: is expired
         """
-        if self.auth_token is None:
-            return True
+        return self.refresh_due_ts() < time.time() + ahead
 
-        if self.auth_token_expiration is None or self.auth_token_expiration < time.time() + 300:
-            return True
 
-        if self.last_refresh_ts + self.refresh_delay < time.time():
-            return True
+_recursion_limit_lock = threading.Lock()
 
-        return False
+
+def _raise_recursion_limit(limit: int):
+    """Recursion limit is process wide, so it is only ever raised, never restored behind other threads"""
+    with _recursion_limit_lock:
+        if sys.getrecursionlimit() < limit:
+            sys.setrecursionlimit(limit)
+
+
+def _call_with_deep_stack(fn, *args):
+    """
+    Run fn in dedicated thread with stack big enough for WSDL_PICKLE_RECURSION_LIMIT nested frames,
+    exception of fn is raised in calling thread
+    """
+    _raise_recursion_limit(WSDL_PICKLE_RECURSION_LIMIT)
+    outcome = {}
+
+    def run():
+        try:
+            outcome['value'] = fn(*args)
+        except BaseException as e:
+            outcome['error'] = e
+
+    with _recursion_limit_lock:
+        size = threading.stack_size(WSDL_PICKLE_STACK_SIZE)
+        try:
+            thread = threading.Thread(target=run, name='sfmc-wsdl-cache', daemon=True)
+            thread.start()
+        finally:
+            threading.stack_size(size)
+    thread.join()
+
+    if 'error' in outcome:
+        raise outcome['error']
+
+    return outcome.get('value')
+
+
+class WsdlObjectCache(ObjectCache):
+    """
+    Cache of parsed wsdl definitions. Schema object graph is deep, so pickling runs in thread with large stack
+    and a failed write only costs a regular parse on the next start.
+    """
+
+    protocol = pickle.HIGHEST_PROTOCOL
+
+    def get(self, id):
+        return _call_with_deep_stack(super(WsdlObjectCache, self).get, id)
+
+    def put(self, id, object):
+        try:
+            return _call_with_deep_stack(super(WsdlObjectCache, self).put, id, object)
+        except Exception as e:
+            logging.getLogger('sfmc').warning('Can not cache parsed wsdl: %s', e)
+            return object
+
+
+def schema_field_types(schema) -> Dict[str, Dict[str, str]]:
+    """
+    Field types of partner API complex types, used by parser of streamed replies to convert values like suds does.
+    Field type is xsd: prefixed name of builtin type converted by suds, or name of complex type.
+    Anonymous types are named by parent type and field, like ObjectExtension.Properties
+    :param schema: parsed wsdl schema of suds client
+    :return: complex type name to its field name and field type, inherited fields included
+    """
+    types: Dict[str, Dict[str, str]] = {}
+
+    def walk(type_name: str, complex_type):
+        if type_name in types:
+            return
+
+        fields = types[type_name] = {}
+        for child, _ in complex_type.children():
+            resolved = child.resolve()
+            if resolved.builtin():
+                if BUILTIN_TYPE_PREFIX + resolved.name in TRANSLATORS:
+                    fields[child.name] = BUILTIN_TYPE_PREFIX + resolved.name
+            elif child.type is None:
+                fields[child.name] = '{}.{}'.format(type_name, child.name)
+                walk(fields[child.name], resolved)
+            else:
+                fields[child.name] = child.type[0]
+
+    for (name, ns), t in schema.types.items():
+        if ns == NS_PARTNER:
+            walk(name, t)
+
+    return types
 
 
 class SoapClientFactory:
     def __init__(self, local_path: str = None, url: str = DEFAULT_WSDL_URL,
                  local_file_expire_time=DEFAULT_WSDL_FILE_EXPIRE_TIME,
-                 debug=False):
+                 debug=False, http_client: HttpClient = None, cache_path: str = None, use_cache: bool = True):
+        """
+        :param local_path:              path where wsdl file stored
+        :param url:                     wsdl url
+        :param local_file_expire_time:  wsdl file time to live in seconds
+        :param debug:                   enable suds debug logging
+        :param http_client:             pooled http client for soap transport
+        :param cache_path:              directory for parsed wsdl cache, by default next to wsdl file
+        :param use_cache:               load parsed wsdl from cache instead of parse wsdl file
+        """
+        self.http_client = http_client if http_client is not None else HttpClient()
         self.local_path = local_path
         self.url = url
         self.local_file_expire_time = local_file_expire_time
         self.debug = debug
+        self.cache_path = cache_path
+        self.use_cache = use_cache
         self._local_url = None
+        self._wsdl_digest = None
         self._client = None
+        self._field_types: Dict[str, Dict[str, str]] = None
+        self.templates: RequestTemplates = None
 
     def _download(self, url, local_path):
         """
@@ -145,8 +419,8 @@ class SoapClientFactory:
         if not p.exists():
             p.mkdir(parents=True)
 
+        r = self.http_client.get(url)
         with open(local_path, 'w') as of:
-            r = requests.get(url)
             of.write(r.text)
 
     def _local_wsdl_is_expired(self, local_path: str) -> bool:
@@ -160,40 +434,108 @@ class SoapClientFactory:
 
         return ts + self.local_file_expire_time < d
 
-    def fetch_wsdl(self):
+    def fetch_wsdl(self) -> bool:
         """
         Retrieve and store wsdl file
+        :return: True if new file was downloaded
         """
+        downloaded = False
         if not os.path.exists(self.local_path) \
                 or os.path.getsize(self.local_path) == 0 \
                 or self._local_wsdl_is_expired(self.local_path):
             self._download(self.url, self.local_path)
+            downloaded = True
         self._local_url = 'file:///' + self.local_path
+        self._wsdl_digest = self._file_digest(self.local_path)
+
+        return downloaded
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(chunk)
+
+        return h.hexdigest()
+
+    def _cache_root(self) -> str:
+        if self.cache_path is not None:
+            return self.cache_path
+
+        return os.path.join(os.path.dirname(os.path.abspath(self.local_path)), 'wsdl_cache')
+
+    def _cache_location(self) -> str:
+        """Cache directory for current wsdl file, so downloaded wsdl never meets stale parsed schema"""
+        name = 'v{}-suds{}-{}'.format(WSDL_CACHE_VERSION, suds.__version__, self._wsdl_digest)
+
+        return os.path.join(self._cache_root(), name)
+
+    def _purge_stale_caches(self):
+        """Drop parsed schemas of previous wsdl files"""
+        root = self._cache_root()
+        if not os.path.isdir(root):
+            return
+
+        current = os.path.basename(self._cache_location())
+        for name in os.listdir(root):
+            if name != current and name.startswith('v'):
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
 
     def init(self):
-        self.fetch_wsdl()
+        downloaded = self.fetch_wsdl()
 
-    def make(self, authenticator: Authenticator):
-        """Build and configure soap client"""
-        if self._client is None:
-            self._client = SoapClient(self._local_url, faults=False, cachingpolicy=0)
+        # cache of current file is missing only after wsdl file was changed, e.g. downloaded by other process
+        if self.use_cache and (downloaded or not os.path.isdir(self._cache_location())):
+            self._purge_stale_caches()
 
-            if self.debug:
-                logging.basicConfig(level=logging.INFO)
-                logging.getLogger('suds.client').setLevel(logging.DEBUG)
-                logging.getLogger('suds.transport').setLevel(logging.DEBUG)
-                logging.getLogger('suds.xsd.schema').setLevel(logging.DEBUG)
-                logging.getLogger('suds.wsdl').setLevel(logging.DEBUG)
-            else:
-                logging.getLogger('suds').setLevel(logging.INFO)
+    def _make_soap_client(self) -> SoapClient:
+        transport = SoapTransport(self.http_client)
+
+        if not self.use_cache:
+            return SoapClient(self._local_url, faults=False, cachingpolicy=0, transport=transport)
+
+        cache = WsdlObjectCache(location=self._cache_location())
 
-        # FIXME
-        # Need make copy by suds.client.clone() method,
-        # but now got this issue https://bitbucket.org/jurko/suds/issues/7/recursion-depth-reached
-        # cl = self._client.clone()
+        return SoapClient(self._local_url, faults=False, cachingpolicy=1, cache=cache, transport=transport)
 
-        cl = self._client
+    def _clone(self) -> SoapClient:
+        """
+        Independent soap client sharing parsed wsdl with base client.
+        suds clone() deep copies options and reaches recursion limit
+        (https://bitbucket.org/jurko/suds/issues/7/recursion-depth-reached), so options are copied shallow:
+        per client options(location, wsse, soapheaders) are replaced on bind, not mutated.
+        Transport options are linked to single client options, so each clone gets own transport
+        on top of shared http client.
+        """
+        base = self._client
+
+        clone = SoapClient.__new__(SoapClient)
+        clone.options = SoapOptions()
+        options = Unskin(clone.options)
+        for name, value in Unskin(base.options).defined.items():
+            if name != 'transport':
+                options.set(name, value)
+        clone.options.transport = SoapTransport(self.http_client)
+        clone.wsdl = base.wsdl
+        clone.factory = base.factory
+        clone.service = ServiceSelector(clone, base.wsdl.services)
+        clone.sd = base.sd
+        clone.messages = dict(tx=None, rx=None)
+
+        return clone
+
+    @property
+    def field_types(self) -> Dict[str, Dict[str, str]]:
+        """Field types of wsdl complex types, built on first use, see schema_field_types"""
+        if self._field_types is None:
+            self._field_types = schema_field_types(self._client.wsdl.schema)
 
+        return self._field_types
+
+    @staticmethod
+    def bind(cl: SoapClient, authenticator: Authenticator) -> SoapClient:
+        """Set endpoint and auth headers of authenticator to soap client"""
         cl.set_options(location=authenticator.endpoint)
 
         security = Security()
@@ -208,6 +550,119 @@ class SoapClientFactory:
 
         return cl
 
+    def load(self):
+        """Parse wsdl into base soap client and request templates, once"""
+        if self._client is None:
+            self._client = self._make_soap_client()
+            self.templates = RequestTemplates(self._client.factory)
+
+            if self.debug:
+                logging.basicConfig(level=logging.INFO)
+                logging.getLogger('suds.client').setLevel(logging.DEBUG)
+                logging.getLogger('suds.transport').setLevel(logging.DEBUG)
+                logging.getLogger('suds.xsd.schema').setLevel(logging.DEBUG)
+                logging.getLogger('suds.wsdl').setLevel(logging.DEBUG)
+            else:
+                logging.getLogger('suds').setLevel(logging.INFO)
+
+    def make(self, authenticator: Authenticator):
+        """Build and configure soap client"""
+        self.load()
+
+        return self.bind(self._clone(), authenticator)
+
+
+class SoapClientPool:
+    """
+    Pool of independent soap clients sharing parsed wsdl. Client is checked out for a single call and
+    bound to caller authenticator on checkout, so concurrent calls never share options or auth headers.
+    """
+
+    def __init__(self, factory: SoapClientFactory, size: int = DEFAULT_SOAP_POOL_SIZE):
+        """
+        :param factory: soap client factory
+        :param size:    max count of idle clients kept for reuse
+        """
+        self.factory = factory
+        self.size = size
+        self._idle: List[SoapClient] = []
+        self._lock = threading.Lock()
+
+    def checkout(self, authenticator: Authenticator) -> SoapClient:
+        """Take idle client or build new one"""
+        with self._lock:
+            cl = self._idle.pop() if self._idle else None
+
+        if cl is None:
+            return self.factory.make(authenticator)
+
+        return self.factory.bind(cl, authenticator)
+
+    def checkin(self, cl: SoapClient):
+        """Return client to pool"""
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(cl)
+
+    @contextmanager
+    def client(self, authenticator: Authenticator):
+        cl = self.checkout(authenticator)
+        try:
+            yield cl
+        finally:
+            self.checkin(cl)
+
+
+class SoapCall:
+    """
+    Soap request built by suds client without sending it. Envelope can be sent by any http client,
+    reply is parsed by the same suds client.
+    """
+
+    def __init__(self, url: str, headers: Mapping[str, str], context):
+        """
+        :param url:     soap endpoint
+        :param headers: http headers
+        :param context: suds request context
+        """
+        self.url = url
+        self.headers = headers
+        self.context = context
+
+    @classmethod
+    def make(cls, soap_client: SoapClient, operation: str, *args) -> 'SoapCall':
+        """
+        Build request of soap operation
+        :param soap_client: bound soap client
+        :param operation:   soap operation name
+        :param args:        operation arguments
+        """
+        soap_client.set_options(nosend=True)
+        try:
+            method = getattr(soap_client.service, operation)
+            context = method(*args)
+        finally:
+            soap_client.set_options(nosend=False)
+
+        headers = {'Content-Type': 'text/xml; charset=utf-8', 'SOAPAction': method.method.soap.action}
+        headers.update(soap_client.options.headers)
+
+        return cls(soap_client.options.location, headers, context)
+
+    @property
+    def envelope(self) -> bytes:
+        return self.context.envelope
+
+    def process_reply(self, content: bytes, status: int = 200, reason: str = None) -> Any:
+        """
+        Parse reply by suds
+        :return: suds reply, like returned by soap_client.service.<operation>(*args)
+        """
+        if status == 200:
+            return self.context.process_reply(content)
+
+        return self.context.process_reply(content, status, reason or 'Http error {}'.format(status))
+
 
 class Response:
     """Exact Service response wrapper"""
@@ -221,6 +676,8 @@ class Response:
         self.request_id = None
         self.results = []
         self.valid_response = False
+        self.object_type: str = None
+        self.fault: str = None
 
     @classmethod
     def make_from_service_response(cls, resp, is_rest: bool = False) -> 'Response':
@@ -232,6 +689,7 @@ class Response:
         code = None
         status = False
         message = None
+        fault = None
         more_results = False
         request_id = None
         results = []
@@ -255,10 +713,7 @@ class Response:
 
                 if 'OverallStatus' in body:
                     message = body['OverallStatus']
-                    if body['OverallStatus'] == "MoreDataAvailable":
-                        more_results = True
-                    elif body['OverallStatus'] != "OK":
-                        status = False
+                    status, more_results = cls.parse_overall_status(body['OverallStatus'])
 
                 body_container_tag = None
                 if 'Results' in body:  # most SOAP responses are wrapped in 'Results'
@@ -268,12 +723,15 @@ class Response:
 
                 if body_container_tag is not None:
                     results = body[body_container_tag]
+            else:
+                fault = getattr(body, 'faultstring', None)
 
         inst = cls()
         inst.raw_response = resp
         inst.code = code
         inst.status = status
         inst.message = message
+        inst.fault = fault
         inst.more_results = more_results
         inst.request_id = request_id
         inst.results = results
@@ -281,6 +739,50 @@ class Response:
 
         return inst
 
+    @staticmethod
+    def parse_overall_status(overall_status: str) -> Tuple[bool, bool]:
+        """
+        :param overall_status: OverallStatus of response
+        :return: is successful and has more results
+        """
+        if overall_status == "MoreDataAvailable":
+            return True, True
+
+        return overall_status == "OK", False
+
+    @classmethod
+    def merge(cls, responses: List['Response']) -> 'Response':
+        """
+        Join responses of chunked request. Results keep order of chunks
+        :param responses: chunk responses
+        """
+        inst = cls()
+        inst.raw_response = [r.raw_response for r in responses]
+        inst.code = next((r.code for r in responses if r.code != 200), 200)
+        inst.status = all(r.status for r in responses)
+        inst.message = next((r.message for r in responses if not r.status), responses[0].message)
+        inst.more_results = False
+        inst.request_id = ','.join(str(r.request_id) for r in responses if r.request_id is not None)
+        inst.results = [i for r in responses for i in r.results]
+        inst.valid_response = all(r.valid_response for r in responses)
+
+        return inst
+
+    def iter_results(self) -> Iterator[Any]:
+        """Iterate over results"""
+        return iter(self.results)
+
+    def to_dicts(self, key_to_lower: bool = False, json_serialize: bool = False) -> List[Dict[str, Any]]:
+        """
+        Results converted into plain dicts by single bulk conversion
+        :param key_to_lower:    lowercase keys of result objects
+        :param json_serialize:  convert date and time values to iso strings
+        """
+        return get_converter(key_to_lower, json_serialize).convert_many(self.iter_results())
+
+    def results_count(self) -> int:
+        return len(self.results)
+
     @property
     def is_valid(self) -> bool:
         return self.valid_response and self.status
@@ -295,6 +797,77 @@ class Response:
                           self.more_results, self.request_id, suds_results_to_simple_types(self.results))
 
 
+class StreamedResponse(Response):
+    """
+    Retrieve response parsed from raw reply bytes by lxml instead of suds. Status and request id are read on
+    creation, results are plain dicts parsed incrementally by iter_results, so pages can be consumed
+    with bounded memory. Accessing results parses all of them at once.
+    Values are typed by field types of wsdl schema, so results carry the same values as suds results.
+    """
+
+    def __init__(self):
+        super(StreamedResponse, self).__init__()
+        self._results: List[Dict[str, Any]] = None
+        self.field_types: FieldTypes = None
+
+    @classmethod
+    def make_from_content(cls, content: bytes, field_types: FieldTypes = None) -> 'StreamedResponse':
+        """
+        Build response from successful Retrieve reply
+        :param content:     reply bytes
+        :param field_types: field types of wsdl schema, see schema_field_types. Values are kept as text without them
+        """
+        overall_status, request_id = read_retrieve_status(content)
+
+        inst = cls()
+        inst.raw_response = content
+        inst.code = 200
+        inst.message = overall_status
+        inst.status, inst.more_results = cls.parse_overall_status(overall_status)
+        inst.request_id = request_id
+        inst.valid_response = True
+        inst.field_types = field_types
+
+        return inst
+
+    def __getstate__(self):
+        # field types of whole schema are not stored along with every cached response, results are parsed instead
+        state = dict(self.__dict__)
+        state['_results'] = self.results
+        state['field_types'] = None
+
+        return state
+
+    @property
+    def results(self) -> List[Dict[str, Any]]:
+        if self._results is None:
+            self._results = list(self.iter_results())
+
+        return self._results
+
+    @results.setter
+    def results(self, value: List[Dict[str, Any]]):
+        self._results = value
+
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        if self._results is not None:
+            return iter(self._results)
+
+        return iter_retrieve_results(self.raw_response, self.field_types)
+
+    @property
+    def is_parsed(self) -> bool:
+        """Results are already parsed from raw reply"""
+        return self._results is not None
+
+    def results_count(self) -> int:
+        """Count of results, not parsed results are counted without parsing"""
+        if self._results is not None:
+            return len(self._results)
+
+        return count_retrieve_results(self.raw_response)
+
+
 class Client:
     """Sales Force client.
     Call resource handlers dynamically based on their name:
@@ -304,16 +877,104 @@ class Client:
     def __init__(self):
         self.authenticator: Authenticator = None
         self.soap_client_factory: SoapClientFactory = None
-        self.soap_client = None
+        self.soap_client_pool: SoapClientPool = None
+        self.definition_cache: ObjectDefinitionCache = None
+        self.response_cache: ResponseCache = None
+        self.checkpoint_cache: CheckpointFileCache = None
+        self.de_catalog = None  # DataExtensionCatalog
+        # business units targeted by Retrieve requests and, if single, by writes. Describe runs in own account
+        self.client_ids: List[int] = []
+        self.write_chunk_size: int = DEFAULT_WRITE_CHUNK_SIZE
+        self.write_chunk_bytes: int = DEFAULT_WRITE_CHUNK_BYTES
+        self.write_parallelism: int = DEFAULT_WRITE_PARALLELISM
+        self.stream_results: bool = False
+        self.direct_write_types: frozenset = frozenset()
+        self.instrumentation: Instrumentation = Instrumentation()
+        self.retry_policy: RetryPolicy = RetryPolicy()
         self.resource_handlers_map = {}
         self.resource_handlers = {}
 
+    @property
+    def templates(self) -> RequestTemplates:
+        """Prebuilt request payloads of wsdl, shared by clients of the same soap factory"""
+        return self.soap_client_factory.templates
+
     def refresh(self, force: bool = False):
         """
         Prepare client to work
         """
         self.authenticator.refresh(force)
-        self.soap_client = self.soap_client_factory.make(self.authenticator)
+        self.soap_client_factory.load()
+
+    def soap_session(self):
+        """
+        Soap client checked out from pool for a single call and bound to current auth token.
+        Usage: with client.soap_session() as soap_client: ...
+        """
+        if self.soap_client_pool is None:
+            self.soap_client_pool = SoapClientPool(self.soap_client_factory)
+
+        return self.soap_client_pool.client(self.authenticator)
+
+    def prepare_soap_call(self, operation: str, *args) -> SoapCall:
+        """
+        Build soap request without sending it
+        :param operation:   soap operation name
+        :param args:        operation arguments
+        """
+        with self.soap_session() as soap_client:
+            return SoapCall.make(soap_client, operation, *args)
+
+    def invoke(self, record: SoapCallRecord, operation: str, *args) -> Any:
+        """
+        Execute soap operation by pooled soap client, sent and received bytes are put into record
+        :param record:      measurements of call
+        :param operation:   soap operation name
+        :param args:        operation arguments
+        :return: suds reply
+        """
+        with self.soap_session() as soap_client:
+            transport = soap_client.options.transport
+            transport.last_exchange = None
+            try:
+                return getattr(soap_client.service, operation)(*args)
+            finally:
+                record.read_exchange(transport.last_exchange)
+
+    def retrying(self, operation: str, obj_type: str, attempt: Callable[[], Response]) -> Response:
+        """
+        Repeat call while it fails by transient reason and retry policy allows it.
+        Expired token is refreshed before next attempt
+        :param operation:   soap operation name
+        :param obj_type:    requested object type
+        :param attempt:     single call
+        :return: response of last attempt, error of last attempt is raised
+        """
+        number = 1
+        while True:
+            try:
+                response = attempt()
+            except Exception as e:
+                reason = self.retry_policy.classify_error(e)
+                if not self.retry_policy.should_retry(operation, reason, number):
+                    raise
+                failure = e
+            else:
+                reason = self.retry_policy.classify_response(response)
+                if not self.retry_policy.should_retry(operation, reason, number):
+                    return response
+                failure = response
+
+            delay = self.retry_policy.delay(reason, number)
+            logging.getLogger('sfmc').warning('%s of %s failed by %s reason, retry in %.1fs: %s',
+                                              operation, obj_type, reason, delay, failure)
+            self.instrumentation.retry(operation, obj_type, reason)
+
+            if reason == RETRY_AUTH:
+                self.authenticator.refresh(force=True)
+
+            time.sleep(delay)
+            number += 1
 
     def __getattr__(self, item: str) -> 'ResourceHandler':
         if item not in self.resource_handlers_map:
@@ -324,83 +985,197 @@ class Client:
 
         return self.resource_handlers[item]
 
+    @property
+    def cache_namespace(self) -> str:
+        """Key separating cached data of different endpoints and accounts"""
+        namespace = '{}|{}'.format(self.authenticator.endpoint, self.authenticator.client_id)
+        if self.client_ids:
+            namespace += '|' + ','.join(str(i) for i in self.client_ids)
+
+        return namespace
+
     def soap_describe_object(self, obj_type: str) -> Response:
         """
         Get object definition
         :param obj_type: Resource type described at wsdl
         :return:
         """
+        return self.soap_describe_objects([obj_type])
+
+    def soap_describe_objects(self, obj_types: List[str]) -> Response:
+        """
+        Get definitions of several object types by single request
+        :param obj_types: Resource types described at wsdl
+        :return:
+        """
         self.authenticator.refresh()
 
-        request = self.soap_client.factory.create('ArrayOfObjectDefinitionRequest')
+        request = self.make_describe_request(obj_types)
+        obj_type = ','.join(obj_types)
 
-        obj_definition = {'ObjectType': obj_type}
-        request.ObjectDefinitionRequest = [obj_definition]
+        return self.retrying('Describe', obj_type, partial(self._soap_describe, request, obj_type))
 
-        resp = self.soap_client.service.Describe(request)
+    def _soap_describe(self, request, obj_type: str) -> Response:
+        with self.instrumentation.soap_call('Describe', obj_type) as record:
+            resp = self.invoke(record, 'Describe', request)
 
-        if resp is None:
-            raise SOAPRequestError('Empty response for describe request for {} object type'.format(obj_type))
+            if resp is None:
+                raise SOAPRequestError('Empty response for describe request for {} object types'.format(obj_type))
+
+            response = Response.make_from_service_response(resp)
+            record.read_response(response)
+
+        return response
+
+    def make_describe_request(self, obj_types: List[str]):
+        """Describe request payload for given object types"""
+        request = self.templates.create('ArrayOfObjectDefinitionRequest')
+        request.ObjectDefinitionRequest = [{'ObjectType': t} for t in obj_types]
+
+        return request
+
+    def prewarm_object_definitions(self, obj_types: List[str] = None) -> List['ObjectDefinition']:
+        """
+        Describe object types by single request and put definitions into definition cache
+        :param obj_types: Resource types, by default types of all bound resource handlers
+        :return: fetched definitions
+        """
+        if obj_types is None:
+            obj_types = []
+            for handler in self.resource_handlers_map.values():
+                if handler.get_resource_type() not in obj_types:
+                    obj_types.append(handler.get_resource_type())
+
+        resp = self.soap_describe_objects(obj_types)
 
-        return Response.make_from_service_response(resp)
+        if not resp.is_valid:
+            raise ResourceHandlerException('Can not describe objects {}: invalid response[{}]'.format(obj_types, resp))
+
+        definitions = [ObjectDefinition.make_from_result(r) for r in resp.results]
+
+        if self.definition_cache is not None:
+            for definition in definitions:
+                self.definition_cache.set(self.cache_namespace, definition)
+
+        return definitions
+
+    def invalidate_object_definitions(self, obj_types: List[str] = None):
+        """
+        Drop cached definitions
+        :param obj_types: Resource types, by default all types
+        """
+        if self.definition_cache is None:
+            return
+
+        if obj_types is None:
+            self.definition_cache.invalidate(self.cache_namespace)
+        else:
+            for obj_type in obj_types:
+                self.definition_cache.invalidate(self.cache_namespace, obj_type)
+
+    def invalidate_responses(self, obj_types: List[str] = None):
+        """
+        Drop cached Retrieve responses
+        :param obj_types: Resource types, by default all types
+        """
+        if self.response_cache is None:
+            return
+
+        if obj_types is None:
+            self.response_cache.invalidate(self.cache_namespace)
+        else:
+            for obj_type in obj_types:
+                self.response_cache.invalidate(self.cache_namespace, obj_type)
 
     def soap_get(self, obj_type: str, search_filter: SearchFilter = None, props: list = None,
-                 options: dict = None) -> Response:
+                 options: dict = None, stream: bool = None) -> Response:
         """
-        Get single object or array of objects by soap request
+        Get single object or array of objects by soap request.
+        Responses of object types cached by response_cache are served from cache, see ResponseCache
         :param obj_type: requested object type
         :param search_filter: search filter
         :param props: requested object fields
         :param options: additional request option
+        :param stream: parse reply by lxml into StreamedResponse, by default stream_results of client
         :return: service response
         """
+        cache_key = None
+        if self.response_cache is not None and self.response_cache.type_ttl(obj_type) is not None:
+            cache_key = self.response_cache.make_key(self.cache_namespace, obj_type, search_filter, props, options,
+                                                     self.stream_results if stream is None else stream)
+            response = self.response_cache.get(cache_key)
+            if response is not None:
+                return response
+
         self.authenticator.refresh()
 
-        request = self.soap_client.factory.create('RetrieveRequest')
+        request = self.make_retrieve_request(obj_type, search_filter, props, options)
+        response = self._soap_retrieve(request, obj_type, stream)
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+
+        return response
 
-        request.ObjectType = obj_type
+    def _soap_retrieve(self, request, obj_type: str, stream: bool = None) -> Response:
+        operation = 'Retrieve' if getattr(request, 'ContinueRequest', None) is None else 'ContinueRetrieve'
 
+        return self.retrying(operation, obj_type, partial(self._soap_retrieve_once, operation, request, obj_type,
+                                                          stream))
+
+    def _soap_retrieve_once(self, operation: str, request, obj_type: str, stream: bool = None) -> Response:
+        with self.instrumentation.soap_call(operation, obj_type) as record:
+            response = self._send_retrieve(record, request, stream)
+            response.object_type = obj_type
+            record.read_response(response)
+
+        return response
+
+    def _send_retrieve(self, record: SoapCallRecord, request, stream: bool = None) -> Response:
+        if stream is None:
+            stream = self.stream_results
+
+        if not stream:
+            return Response.make_from_service_response(self.invoke(record, 'Retrieve', request))
+
+        call = self.prepare_soap_call('Retrieve', request)
+        resp = self.soap_client_factory.http_client.post(call.url, data=call.envelope, headers=call.headers)
+        record.read_exchange((len(call.envelope), len(resp.content)))
+
+        if resp.status_code != 200:
+            check_soap_reply(resp.status_code, resp.headers, resp.content)
+            return Response.make_from_service_response(call.process_reply(resp.content, resp.status_code))
+
+        return StreamedResponse.make_from_content(resp.content, self.soap_client_factory.field_types)
+
+    def make_retrieve_request(self, obj_type: str, search_filter: SearchFilter = None, props: list = None,
+                              options: dict = None):
+        """
+        Retrieve request payload, see soap_get
+        :param obj_type: requested object type
+        :param search_filter: search filter
+        :param props: requested object fields
+        :param options: additional request option
+        :return: RetrieveRequest object
+        """
         if props is None:
             props = []
         elif type(props) is not list:
             raise TypeError('props must be list of property names or None')
 
-        request.Properties = props
-
+        filter_payload = None
         if search_filter is not None:
             if not isinstance(search_filter, SearchFilter):
                 raise TypeError('search_filter must be an {} instance'.format(SearchFilter.__class__.__name__))
 
             filter_payload = search_filter.payload()
 
-            if 'LogicalOperator' in filter_payload:
-                filter_part_left = self.soap_client.factory.create('SimpleFilterPart')
-                for prop in filter_part_left:
-                    if prop[0] in filter_payload['LeftOperand']:
-                        filter_part_left[prop[0]] = filter_payload['LeftOperand'][prop[0]]
-
-                filter_part_right = self.soap_client.factory.create('SimpleFilterPart')
-                for prop in filter_part_right:
-                    if prop[0] in filter_payload['RightOperand']:
-                        filter_part_right[prop[0]] = filter_payload['RightOperand'][prop[0]]
-
-                request_filter = self.soap_client.factory.create('ComplexFilterPart')
-                request_filter.LeftOperand = filter_part_left
-                request_filter.RightOperand = filter_part_right
-                request_filter.LogicalOperator = filter_payload['LogicalOperator']
-                for additional_operand in filter_payload.get('AdditionalOperands', []):
-                    filter_part = self.soap_client.factory.create('SimpleFilterPart')
-                    for k, v in list(additional_operand.items()):
-                        filter_part[k] = v
-                    request_filter.AdditionalOperands.Operand.append(filter_part)
-
-                request.Filter = request_filter
-            else:
-                request_filter = self.soap_client.factory.create('SimpleFilterPart')
-                for prop in request_filter:
-                    if prop[0] in filter_payload:
-                        request_filter[prop[0]] = filter_payload[prop[0]]
-                request.Filter = request_filter
+        request = self.templates.retrieve_request(obj_type, props, filter_payload)
+
+        for client_id in self.client_ids:
+            target = self.templates.create('ClientID')
+            target.ID = client_id
+            request.ClientIDs.append(target)
 
         if options is not None:
             for key, value in options.items():
@@ -410,7 +1185,7 @@ class Client:
                 else:
                     request.Options[key] = value
 
-        return Response.make_from_service_response(self.soap_client.service.Retrieve(request))
+        return request
 
     def parse_props_dict_into_ws_object(self, obj_type: str, props_dict: dict):
         """
@@ -419,7 +1194,7 @@ class Client:
         :param props_dict:  target object properties
         :return: web service object
         """
-        ws_object = self.soap_client.factory.create(obj_type)
+        ws_object = self.templates.create(obj_type)
         for k, v in props_dict.items():
             if k in ws_object:
                 ws_object[k] = v
@@ -445,53 +1220,219 @@ class Client:
 
         return ws_object
 
-    def soap_post(self, obj_type: str, props) -> Response:
+    def make_write_options(self, operation: str, options: Mapping[str, Any] = None):
         """
-        Create request
-        :param obj_type: object type described
-        :param props:   dict|list   target object field in ws format
-        :return: ws response
+        CreateOptions/UpdateOptions/DeleteOptions payload. Client targeting single business unit by client_ids
+        writes to it by Client option, write of client targeting many business units is refused
+        :param operation:   Create, Update or Delete
+        :param options:     option values, like {'SaveOptions': {'SaveOption': [...]}}
+        :return: options object or None if options are not given and client targets own account
         """
-        self.authenticator.refresh()
-        payload = self.parse_props_into_ws_object(obj_type, props)
+        if len(self.client_ids) > 1:
+            raise ConfigureError('{} of client targeting business units {} is ambiguous, use client of single '
+                                 'business unit'.format(operation, self.client_ids))
 
-        return Response.make_from_service_response(self.soap_client.service.Create(None, payload))
+        if options is None and not self.client_ids:
+            return None
 
-    def soap_patch(self, obj_type: str, props) -> Response:
-        """
-        Update request
-        :param obj_type: object type described
-        :param props:   dict|list   target object field in ws format
-        :return: ws response
-        """
-        self.authenticator.refresh()
-        payload = self.parse_props_into_ws_object(obj_type, props)
+        ws_options = self.templates.create(operation + 'Options')
+        for k, v in (options or {}).items():
+            ws_options[k] = v
 
-        return Response.make_from_service_response(self.soap_client.service.Update(None, payload))
+        if self.client_ids:
+            ws_options.Client = self.templates.create('ClientID')
+            ws_options.Client.ID = self.client_ids[0]
 
-    def soap_delete(self, obj_type, props) -> Response:
-        """
-        Delete object
+        return ws_options
+
+    def _soap_write_chunk(self, operation: str, obj_type: str, props, options: Mapping[str, Any] = None) -> Response:
+        ws_options = self.make_write_options(operation, options)
+
+        if obj_type in self.direct_write_types:
+            objects = props if isinstance(props, list) else [props]
+            return self.retrying(operation, obj_type,
+                                 partial(self._soap_write_direct, operation, obj_type, objects, ws_options))
+
+        payload = self.parse_props_into_ws_object(obj_type, props)
+
+        return self.retrying(operation, obj_type,
+                             partial(self._soap_write_payload, operation, obj_type, payload, ws_options))
+
+    def _soap_write_payload(self, operation: str, obj_type: str, payload, ws_options=None) -> Response:
+        with self.instrumentation.soap_call(operation, obj_type) as record:
+            response = Response.make_from_service_response(self.invoke(record, operation, ws_options, payload))
+            record.read_response(response)
+
+        return response
+
+    def render_write_envelope(self, call: SoapCall, operation: str, obj_type: str,
+                              objects: List[Mapping[str, Any]]) -> bytes:
+        """
+        Envelope of write request with objects rendered directly by lxml, see sfmc.envelope
+        :param call:        call of the operation built by suds without objects
+        :param operation:   Create, Update or Delete
+        :param obj_type:    object type described at wsdl
+        :param objects:     target objects properties in ws format
+        :return: envelope bytes
+        """
+        return render_write_envelope(call.envelope, operation, obj_type, objects, self.templates.object_keys(obj_type))
+
+    def _soap_write_direct(self, operation: str, obj_type: str, objects: List[Mapping[str, Any]],
+                           ws_options=None) -> Response:
+        with self.instrumentation.soap_call(operation, obj_type) as record:
+            call = self.prepare_soap_call(operation, ws_options, [])
+            envelope = self.render_write_envelope(call, operation, obj_type, objects)
+            resp = self.soap_client_factory.http_client.post(call.url, data=envelope, headers=call.headers)
+            record.read_exchange((len(envelope), len(resp.content)))
+
+            if resp.status_code != 200:
+                check_soap_reply(resp.status_code, resp.headers, resp.content)
+
+            response = Response.make_from_service_response(call.process_reply(resp.content, resp.status_code))
+            record.read_response(response)
+
+        return response
+
+    def soap_write(self, operation: str, obj_type: str, props, options: Mapping[str, Any] = None) -> Response:
+        """
+        Execute Create/Update/Delete request. List of objects is split into chunks bounded by
+        write_chunk_size objects and write_chunk_bytes estimated bytes, chunks are sent by
+        write_parallelism concurrent requests and responses are merged into one.
+        Results keep order of given objects, OrdinalID of results is shifted to position in given list.
+        Failed chunk does not stop others, see merge_write_outcomes.
+        Objects of direct_write_types are rendered into envelope by lxml instead of suds, see render_write_envelope.
+        Cached responses of object type are dropped, see ResponseCache.
+        :param operation:   Create, Update or Delete
+        :param obj_type:    object type described
+        :param props:       dict|list   target object field in ws format
+        :param options:     operation options sent with every chunk, see make_write_options
+        :return: ws response
+        """
+        self.authenticator.refresh()
+
+        try:
+            chunks = self.write_chunks(props)
+
+            if len(chunks) <= 1:
+                return self._soap_write_chunk(operation, obj_type, props, options)
+
+            def send(chunk):
+                try:
+                    return self._soap_write_chunk(operation, obj_type, chunk, options)
+                except Exception as e:
+                    return e
+
+            if self.write_parallelism > 1:
+                with ThreadPoolExecutor(max_workers=min(self.write_parallelism, len(chunks))) as executor:
+                    outcomes = list(executor.map(send, chunks))
+            else:
+                outcomes = [send(c) for c in chunks]
+
+            return self.merge_write_outcomes(chunks, outcomes)
+        finally:
+            # after write, so responses cached by concurrent reads during write are dropped too
+            self.invalidate_responses([obj_type])
+
+    def write_chunks(self, props) -> List[Any]:
+        """Split objects of write request into chunks, single object is never split"""
+        if not isinstance(props, list):
+            return [props]
+
+        return list(chunked(props, self.write_chunk_size, self.write_chunk_bytes))
+
+    @staticmethod
+    def merge_write_responses(chunks: List[Any], responses: List[Response]) -> Response:
+        """
+        Merge chunk responses, OrdinalID of results is shifted to position in whole list.
+        Response of failed chunk is None, its objects are skipped
+        """
+        offset = 0
+        written = []
+        for chunk, resp in zip(chunks, responses):
+            if resp is not None:
+                if offset:
+                    for result in resp.results:
+                        if getattr(result, 'OrdinalID', None) is not None:
+                            result.OrdinalID += offset
+                written.append(resp)
+            offset += len(chunk)
+
+        return Response.merge(written)
+
+    @classmethod
+    def merge_write_outcomes(cls, chunks: List[Any], outcomes: List[Any]) -> Response:
+        """
+        Merge responses of chunks, see merge_write_responses. If all chunks failed, error of first chunk is raised,
+        if some of them failed, PartialWriteError with merged response of written chunks is raised
+        :param chunks:      objects of chunks
+        :param outcomes:    response or exception of every chunk
+        :return: merged response
+        """
+        errors = []
+        offset = 0
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                errors.append((offset, chunk, outcome))
+            offset += len(chunk)
+
+        if not errors:
+            return cls.merge_write_responses(chunks, outcomes)
+
+        if len(errors) == len(chunks):
+            raise errors[0][2]
+
+        response = cls.merge_write_responses(chunks, [None if isinstance(o, BaseException) else o for o in outcomes])
+        offset, _, error = errors[0]
+        message = '{} of {} chunks failed, first at object {}: {}'.format(len(errors), len(chunks), offset, error)
+        raise PartialWriteError(message, response, errors) from error
+
+    def soap_post(self, obj_type: str, props) -> Response:
+        """
+        Create request. List of objects is sent by chunks, see soap_write
         :param obj_type: object type described
         :param props:   dict|list   target object field in ws format
         :return: ws response
         """
-        self.authenticator.refresh()
-        payload = self.parse_props_into_ws_object(obj_type, props)
+        return self.soap_write('Create', obj_type, props)
 
-        return Response.make_from_service_response(self.soap_client.service.Delete(None, payload))
+    def soap_patch(self, obj_type: str, props, options: Mapping[str, Any] = None) -> Response:
+        """
+        Update request. List of objects is sent by chunks, see soap_write
+        :param obj_type: object type described
+        :param props:   dict|list   target object field in ws format
+        :param options: UpdateOptions values, like SaveOptions
+        :return: ws response
+        """
+        return self.soap_write('Update', obj_type, props, options)
+
+    def soap_delete(self, obj_type, props) -> Response:
+        """
+        Delete object. List of objects is sent by chunks, see soap_write
+        :param obj_type: object type described
+        :param props:   dict|list   target object field in ws format
+        :return: ws response
+        """
+        return self.soap_write('Delete', obj_type, props)
 
-    def soap_get_more_results(self, request_id: str) -> Response:
+    def soap_get_more_results(self, request_id: str, stream: bool = None, obj_type: str = None) -> Response:
         """
         Retrieve more results
         :param request_id: Id of request marked as has more results
+        :param stream: parse reply by lxml into StreamedResponse, by default stream_results of client
+        :param obj_type: object type of initial request, used by instrumentation only
         :return: ws response
         """
         self.authenticator.refresh()
-        request = self.soap_client.factory.create('RetrieveRequest')
+        request = self.make_continue_request(request_id)
+
+        return self._soap_retrieve(request, obj_type, stream)
+
+    def make_continue_request(self, request_id: str):
+        """Retrieve request payload for next portion of results"""
+        request = self.templates.create('RetrieveRequest')
         request.ContinueRequest = request_id
 
-        return Response.make_from_service_response(self.soap_client.service.Retrieve(request))
+        return request
 
 
 class ClientFactory:
@@ -501,6 +1442,12 @@ class ClientFactory:
         self._params = {}
         self._resource_bindings = {}
         self.soap_factory = None
+        self.soap_pool = None
+        self.http_client = None
+        self.definition_cache = None
+        self.response_cache: ResponseCache = None
+        self.instrumentation: Instrumentation = None
+        self.retry_policy: RetryPolicy = None
 
     def bind_resource(self, handler: 'ResourceHandler') -> 'ClientFactory':
         """
@@ -533,61 +1480,203 @@ class ClientFactory:
 
         return self
 
-    def make_authentificator(self) -> Authenticator:
-        """Build Authentificator instance"""
-        check_required_keys(self._params, ['client_id', 'client_secret'])
-        authenticator = Authenticator(self._params.get('client_id'), self._params.get('client_secret'))
+    def make_http_client(self) -> HttpClient:
+        """Build pooled http client shared by authenticator and soap transport"""
+        if self.http_client is None:
+            factory = HttpClientFactory()
+            factory.set_params({
+                'pool_connections': self._params.get('http_pool_connections'),
+                'pool_maxsize': self._params.get('http_pool_maxsize'),
+                'connect_timeout': self._params.get('http_connect_timeout'),
+                'read_timeout': self._params.get('http_read_timeout'),
+                'keep_alive': self._params.get('http_keep_alive'),
+            })
+            self.http_client = factory.make()
+
+        return self.http_client
+
+    def make_authentificator(self, params: Mapping[str, Any] = None) -> Authenticator:
+        """
+        Build Authentificator instance
+        :param params: auth params overriding factory params, e.g. credentials of other business unit
+        """
+        params = self._params if not params else dict(self._params, **params)
+        check_required_keys(params, ['client_id', 'client_secret'])
+        authenticator = Authenticator(params.get('client_id'), params.get('client_secret'),
+                                      http_client=self.make_http_client())
+        authenticator.instrumentation = self.make_instrumentation()
 
-        if self._params.get('endpoint') not in (None, ''):
-            authenticator.endpoint = self._params.get('endpoint')
+        if params.get('endpoint') not in (None, ''):
+            authenticator.endpoint = params.get('endpoint')
 
-        if self._params.get('appsignature') not in (None, ''):
-            authenticator.appsignature = self._params.get('appsignature')
+        if params.get('appsignature') not in (None, ''):
+            authenticator.appsignature = params.get('appsignature')
 
-        if self._params.get('user_agent') not in (None, ''):
-            authenticator.user_agent = self._params.get('user_agent')
+        if params.get('user_agent') not in (None, ''):
+            authenticator.user_agent = params.get('user_agent')
 
-        if any_keys_not_none(self._params, ['auth_token, auth_token_expiration, auth_legacy_token']):
+        if params.get('auth_url') not in (None, ''):
+            authenticator.auth_url = params.get('auth_url')
+
+        if params.get('endpoints_url') not in (None, ''):
+            authenticator.endpoints_url = params.get('endpoints_url')
+
+        if any_keys_not_none(params, ['auth_token, auth_token_expiration, auth_legacy_token']):
             raise ConfigureError(
                 'auth_token, auth_token_expiration, auth_legacy_token must be presented together and have no empty value')
 
-        if all_keys_not_none(self._params, ['auth_token, auth_token_expiration, auth_legacy_token']):
-            authenticator.auth_token = self._params['auth_token']
-            authenticator.auth_token_expiration = self._params['auth_token_expiration']
-            authenticator.auth_legacy_token = self._params['auth_legacy_token']
-            if self._params['auth_refresh_token'] is not None:
-                authenticator.auth_refresh_token = self._params['auth_refresh_token']
+        if all_keys_not_none(params, ['auth_token, auth_token_expiration, auth_legacy_token']):
+            authenticator.auth_token = params['auth_token']
+            authenticator.auth_token_expiration = params['auth_token_expiration']
+            authenticator.auth_legacy_token = params['auth_legacy_token']
+            if params['auth_refresh_token'] is not None:
+                authenticator.auth_refresh_token = params['auth_refresh_token']
+
+        if params.get('token_cache_path') not in (None, ''):
+            authenticator.token_cache = TokenFileCache(params.get('token_cache_path'))
 
         authenticator.refresh()
 
+        if params.get('auth_background_refresh') in ('1', 'true', 'True', True):
+            lead = params.get('auth_refresh_lead')
+            authenticator.start_background_refresh(float(lead) if lead is not None else DEFAULT_AUTH_REFRESH_LEAD)
+
         return authenticator
 
+    def make_instrumentation(self) -> Instrumentation:
+        """
+        Instrumentation shared by all produced clients. With metrics param calls are collected into
+        process metrics registry sfmc.metrics.REGISTRY, custom instrumentation can be set to factory directly
+        """
+        if self.instrumentation is None:
+            if self._params.get('metrics') in ('1', 'true', 'True', True):
+                self.instrumentation = MetricsInstrumentation(prefix=self._params.get('metrics_prefix') or 'sfmc')
+            else:
+                self.instrumentation = Instrumentation()
+
+        return self.instrumentation
+
+    def make_retry_policy(self) -> RetryPolicy:
+        """Retry policy shared by all produced clients, retry_attempts param 1 disables retries"""
+        if self.retry_policy is None:
+            policy = RetryPolicy()
+            if self._params.get('retry_attempts') is not None:
+                policy.attempts = int(self._params['retry_attempts'])
+
+            for param, attr in (('retry_backoff', 'backoff'), ('retry_backoff_max', 'backoff_max')):
+                if self._params.get(param) is not None:
+                    setattr(policy, attr, float(self._params[param]))
+
+            if any_keys_not_none(self._params, ['retry_writes']):
+                policy.retry_writes = self._params.get('retry_writes') in ('1', 'true', 'True', True)
+
+            self.retry_policy = policy
+
+        return self.retry_policy
+
     def make_soap_factory(self):
         """Build soap client factory"""
         if self.soap_factory is None:
             check_required_keys(self._params, ['wsdl_local_path'])
-            factory = SoapClientFactory(local_path=self._params.get('wsdl_local_path'))
+            factory = SoapClientFactory(local_path=self._params.get('wsdl_local_path'),
+                                        http_client=self.make_http_client())
             if any_keys_not_none(self._params, ['wsdl_url']):
                 factory.url = self._params.get('wsdl_url')
 
             if any_keys_not_none(self._params, ['debug']):
                 factory.debug = True if self._params.get('debug') in ('1', 'true', 'True', True) else False
 
+            if any_keys_not_none(self._params, ['wsdl_cache_path']):
+                factory.cache_path = self._params.get('wsdl_cache_path')
+
+            if any_keys_not_none(self._params, ['wsdl_cache']):
+                factory.use_cache = self._params.get('wsdl_cache') in ('1', 'true', 'True', True)
+
             factory.init()
             self.soap_factory = factory
 
         return self.soap_factory
 
+    def make_soap_pool(self) -> SoapClientPool:
+        """Build soap client pool shared by all produced clients"""
+        if self.soap_pool is None:
+            size = self._params.get('soap_pool_size')
+            self.soap_pool = SoapClientPool(self.make_soap_factory(),
+                                            size=int(size) if size is not None else DEFAULT_SOAP_POOL_SIZE)
+
+        return self.soap_pool
+
+    def make_definition_cache(self) -> 'ObjectDefinitionCache':
+        """Build object definition cache shared by all produced clients"""
+        if self.definition_cache is None:
+            ttl = self._params.get('object_definition_ttl')
+            self.definition_cache = ObjectDefinitionCache(
+                ttl=float(ttl) if ttl is not None else DEFAULT_OBJECT_DEFINITION_TTL,
+                path=self._params.get('object_definition_cache_path'))
+
+        return self.definition_cache
+
+    def make_response_cache(self) -> 'ResponseCache':
+        """Build Retrieve response cache shared by all produced clients, None if no TTL is configured"""
+        configured = any(self._params.get(k) is not None for k in ('response_cache_ttl', 'response_cache_ttls'))
+        if self.response_cache is None and configured:
+            ttl = self._params.get('response_cache_ttl')
+            ttls = self._params.get('response_cache_ttls') or {}
+            size = self._params.get('response_cache_size')
+            self.response_cache = ResponseCache(
+                ttl=float(ttl) if ttl is not None else None,
+                ttls={k: float(v) for k, v in ttls.items()},
+                max_size=int(size) if size is not None else DEFAULT_RESPONSE_CACHE_SIZE,
+                path=self._params.get('response_cache_path'))
+
+        return self.response_cache
+
     def make(self) -> Client:
         """
         Build Sales Force Client
         :return: Client
         """
+        return self.make_client(self.make_authentificator())
+
+    def make_client(self, authenticator: Authenticator, client_ids: List[int] = None) -> Client:
+        """
+        Build client of given authenticator sharing wsdl, connection pool and caches with all produced clients
+        :param authenticator:   authenticator of client, it may be shared by clients of different business units
+        :param client_ids:      business units targeted by Retrieve requests, by default account of authenticator.
+                                Writes are sent to business unit if it is single, see Client.make_write_options
+        :return: Client
+        """
         client = Client()
 
         client.resource_handlers_map = self._resource_bindings
-        client.authenticator = self.make_authentificator()
+        client.authenticator = authenticator
+        client.client_ids = list(client_ids or [])
         client.soap_client_factory = self.make_soap_factory()
+        client.soap_client_pool = self.make_soap_pool()
+        client.definition_cache = self.make_definition_cache()
+        client.response_cache = self.make_response_cache()
+        client.instrumentation = self.make_instrumentation()
+        client.retry_policy = self.make_retry_policy()
+
+        if self._params.get('sync_checkpoint_path') not in (None, ''):
+            client.checkpoint_cache = CheckpointFileCache(self._params.get('sync_checkpoint_path'))
+
+        for param in ('write_chunk_size', 'write_chunk_bytes', 'write_parallelism'):
+            if self._params.get(param) is not None:
+                setattr(client, param, int(self._params[param]))
+
+        if any_keys_not_none(self._params, ['stream_results']):
+            client.stream_results = self._params.get('stream_results') in ('1', 'true', 'True', True)
+
+        if self._params.get('direct_write_types') not in (None, ''):
+            types = self._params.get('direct_write_types')
+            client.direct_write_types = frozenset(types.split(',') if isinstance(types, str) else types)
+
+        if self._params.get('de_catalog') in ('1', 'true', 'True', True):
+            from sfmc.resources.data_extension import DataExtensionCatalog, DEFAULT_CATALOG_REFRESH_INTERVAL
+            interval = self._params.get('de_catalog_refresh_interval')
+            client.de_catalog = DataExtensionCatalog(
+                client, float(interval) if interval is not None else DEFAULT_CATALOG_REFRESH_INTERVAL)
 
         client.refresh()
 
@@ -601,11 +1690,24 @@ class ClientFactory:
         return txt.format(obj_class=self.__class__.__name__, params=self._params, bindings=",".join(handlers_repr))
 
 
+def _pairs(data) -> Iterable[tuple]:
+    """Name-value pairs of suds object or plain dict"""
+    return data.items() if isinstance(data, dict) else data
+
+
+def _property_items(properties) -> Iterable[Any]:
+    """Items of Properties element of suds object or plain dict"""
+    if isinstance(properties, dict):
+        return properties.get('Property') or []
+
+    return properties[0]
+
+
 class Attributable:
 
     def __init__(self, data: Mapping[str, Any]):
         self.raw_data = data
-        self.data: Dict[str, Any] = {k: v for k, v in data}
+        self.data: Dict[str, Any] = {k: v for k, v in _pairs(data)}
 
     def __getattr__(self, item: str) -> Any:
         if item in self.data:
@@ -613,6 +1715,13 @@ class Attributable:
 
         raise AttributeError("No such attribute: " + item)
 
+    # __getattr__ must not be reached by pickle before state is restored
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     def __repr__(self):
         return "{}<{}>".format(self.__class__.__name__, self.data)
 
@@ -632,10 +1741,10 @@ class Entity:
         self.data: Dict[str, Any] = {}
         self.properties: Dict[str, EntityProperty] = None
 
-        for k, v in data:
+        for k, v in _pairs(data):
             if k == 'Properties':
                 props = {}
-                for p in v[0]:
+                for p in _property_items(v):
                     prop = EntityProperty(p)
                     props[prop.Name] = prop
 
@@ -653,7 +1762,7 @@ class Entity:
         Get entity type, expected according to wsdl definition.
         Can be different if no way to determine it from response data
         """
-        attr = getattr(self, 'Type')
+        attr = self.data.get('Type')
         if attr is None:
             return self.TYPE
 
@@ -703,10 +1812,225 @@ class Entity:
 
         return self.data[item]
 
+    # entities are sent between processes, __getattr__ must not be reached by pickle before state is restored
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     def __repr__(self) -> str:
         return "{}[data:{},properties:{}]".format(self.__class__.__name__, self.data, self.properties)
 
 
+class ColumnIndex:
+    """Positions of field and property values, shared by compact entities of one result set"""
+
+    __slots__ = ('fields', 'properties')
+
+    def __init__(self):
+        self.fields: Dict[str, int] = {}
+        self.properties: Dict[str, int] = {}
+
+    @staticmethod
+    def _position(index: Dict[str, int], name: str) -> int:
+        pos = index.get(name)
+        if pos is None:
+            pos = len(index)
+            index[name] = pos
+
+        return pos
+
+    def field_position(self, name: str) -> int:
+        return self._position(self.fields, name)
+
+    def property_position(self, name: str) -> int:
+        return self._position(self.properties, name)
+
+
+class _Missing:
+    """Placeholder of absent value in compact entity, unpickled as the same object"""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self) -> str:
+        return '<missing>'
+
+
+_MISSING = _Missing()
+
+
+def _put_value(values: List[Any], pos: int, value: Any):
+    if pos >= len(values):
+        values.extend([_MISSING] * (pos + 1 - len(values)))
+
+    values[pos] = value
+
+
+class CompactEntity:
+    """
+    Memory compact alternative to Entity with the same read API.
+    Values are kept in tuples, names live in column index shared by all entities of a result set.
+    """
+
+    __slots__ = ('columns', 'values', 'property_values')
+
+    TYPE: str = 'DefaultEntity'
+
+    def __init__(self, data, columns: ColumnIndex):
+        values = []
+        property_values = None
+
+        for k, v in _pairs(data):
+            if k == 'Properties':
+                property_values = []
+                for p in _property_items(v):
+                    if isinstance(p, dict):
+                        _put_value(property_values, columns.property_position(p.get('Name')), p.get('Value'))
+                    else:
+                        _put_value(property_values, columns.property_position(p.Name), p.Value)
+                continue
+
+            _put_value(values, columns.field_position(k), v)
+
+        self.columns = columns
+        self.values = tuple(values)
+        self.property_values = tuple(property_values) if property_values is not None else None
+
+    @staticmethod
+    def _lookup(index: Dict[str, int], values: tuple, name: str) -> Any:
+        pos = index.get(name)
+        if pos is None or pos >= len(values):
+            return _MISSING
+
+        return values[pos]
+
+    @staticmethod
+    def _items(index: Dict[str, int], values: tuple) -> Iterator[tuple]:
+        for name, pos in index.items():
+            if pos < len(values) and values[pos] is not _MISSING:
+                yield name, values[pos]
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return dict(self._items(self.columns.fields, self.values))
+
+    @property
+    def properties(self) -> Dict[str, EntityProperty]:
+        if self.property_values is None:
+            return None
+
+        return {name: EntityProperty([('Name', name), ('Value', value)])
+                for name, value in self._items(self.columns.properties, self.property_values)}
+
+    def has_properties(self) -> bool:
+        """Check entity has any properties"""
+        return self.property_values is not None
+
+    def get_type(self) -> str:
+        """Entity type, see Entity.get_type"""
+        value = self._lookup(self.columns.fields, self.values, 'Type')
+        if value is _MISSING or value is None:
+            return self.TYPE
+
+        return value
+
+    def get_property(self, name: str) -> EntityProperty:
+        """
+        Get property if exists else throw MissingProperty exception
+        :param name:
+        :return:
+        """
+        return EntityProperty([('Name', name), ('Value', self.get_property_value(name))])
+
+    def get_property_value(self, name: str) -> Any:
+        """
+        Get property value if exists else throw MissingProperty exception
+        :param name:
+        :return:
+        """
+        if not self.has_properties():
+            raise ResourceMissingPropertyException("Entity[{}] has no any properties".format(self.get_type()))
+
+        value = self._lookup(self.columns.properties, self.property_values, name)
+        if value is _MISSING:
+            raise ResourceMissingPropertyException('Missing property [{}]'.format(name))
+
+        return value
+
+    def get_properties(self) -> List[EntityProperty]:
+        if not self.has_properties():
+            raise ResourceMissingPropertyException('Entity[{}] has no any properties'.format(self.get_type()))
+
+        return list(self.properties.values())
+
+    def __iter__(self) -> Iterable:
+        return iter(self.data)
+
+    def __getattr__(self, item) -> Any:
+        if item == 'Properties':
+            if not self.has_properties():
+                raise AttributeError('No such attribute [{}]'.format(item))
+            return self.get_properties()
+
+        value = self._lookup(self.columns.fields, self.values, item)
+        if value is _MISSING:
+            raise AttributeError('No such attribute [{}]'.format(item))
+
+        return value
+
+    def __getstate__(self):
+        return self.columns, self.values, self.property_values
+
+    def __setstate__(self, state):
+        self.columns, self.values, self.property_values = state
+
+    def __repr__(self) -> str:
+        return "{}[data:{},properties:{}]".format(self.__class__.__name__, self.data, self.properties)
+
+
+class EntityList(Sequence):
+    """
+    Entities of response results. Entity is built on first access by index and cached,
+    so reading single entity of a page never builds the rest.
+    """
+
+    def __init__(self, results: List[Any], factory: Callable):
+        self._results = results
+        self._factory = factory
+        self._entities: List[Entity] = [None] * len(results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        entity = self._entities[index]
+        if entity is None:
+            entity = self._factory(self._results[index])
+            self._entities[index] = entity
+
+        return entity
+
+    def __iter__(self) -> Iterator[Entity]:
+        for i in range(len(self._results)):
+            yield self[i]
+
+    def iter_uncached(self) -> Iterator[Entity]:
+        """Iterate without caching built entities, for single pass over large pages"""
+        factory = self._factory
+        for result, entity in zip(self._results, self._entities):
+            yield entity if entity is not None else factory(result)
+
+    def __repr__(self) -> str:
+        return '{}[len:{}]'.format(self.__class__.__name__, len(self))
+
+
 class ObjectDefinitionProperty(Attributable):
     """Describe property for object definition"""
 
@@ -720,6 +2044,19 @@ class ObjectDefinition:
         self.obj_type = object_type
         self.raw_props = properties
         self.props = {p.Name: p for p in ObjectDefinitionProperty.make_from_seq(properties)}
+        self._retrievable_property_names: List[str] = None
+
+    @classmethod
+    def make_from_result(cls, result: Any) -> 'ObjectDefinition':
+        """Build definition from describe response result"""
+        return cls(str(result['ObjectType']), result['Properties'])
+
+    def __reduce__(self):
+        # suds objects are instances of dynamically built classes and can not be pickled,
+        # so definition is stored as plain property name-value pairs
+        props = [[(k, sobject_to_dict(v)) for k, v in p.data.items()] for p in self.props.values()]
+
+        return self.__class__, (self.obj_type, props)
 
     def properties(self) -> MutableMapping[str, ObjectDefinitionProperty]:
         return self.props
@@ -743,20 +2080,384 @@ class ObjectDefinition:
         return target
 
     def retrievable_property_names(self) -> List[str]:
-        return [p.Name for p in self.retrievable_properties()]
+        if self._retrievable_property_names is None:
+            self._retrievable_property_names = [p.Name for p in self.retrievable_properties()]
+
+        return list(self._retrievable_property_names)
 
     def __repr__(self) -> str:
         return "{}[object_type:{},properties:{}]".format(self.__class__.__name__, self.obj_type, self.props)
 
 
+class ObjectDefinitionCache:
+    """
+    Object definitions shared between clients. Definitions are kept per namespace(endpoint and account) and
+    object type, optionally persisted to disk so restarted workers skip describe requests.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_OBJECT_DEFINITION_TTL, path: str = None):
+        """
+        :param ttl:     definition time to live in seconds
+        :param path:    directory for persisted definitions, None - keep in memory only
+        """
+        self.ttl = ttl
+        self._memory = MemoryCache(ttl=ttl)
+        self._file = FileCache(path, ttl=ttl) if path is not None else None
+
+    def get(self, namespace: str, obj_type: str) -> ObjectDefinition:
+        """Cached definition or None"""
+        key = (namespace, obj_type)
+        definition = self._memory.get(key)
+
+        if definition is None and self._file is not None:
+            definition = self._file.get(key)
+            if definition is not None:
+                self._memory.set(key, definition)
+
+        return definition
+
+    def set(self, namespace: str, definition: ObjectDefinition):
+        key = (namespace, definition.obj_type)
+        self._memory.set(key, definition)
+
+        if self._file is not None:
+            self._file.set(key, definition)
+
+    def invalidate(self, namespace: str = None, obj_type: str = None):
+        """
+        Drop cached definitions
+        :param namespace:   drop only definitions of namespace, None - all namespaces
+        :param obj_type:    drop only definitions of object type, None - all types
+        """
+        backends = [self._memory] if self._file is None else [self._memory, self._file]
+
+        for backend in backends:
+            if namespace is not None and obj_type is not None:
+                backend.delete((namespace, obj_type))
+                continue
+
+            for key in backend.keys():
+                if (namespace is None or key[0] == namespace) and (obj_type is None or key[1] == obj_type):
+                    backend.delete(key)
+
+
+class ResponseCache:
+    """
+    Responses of read-only Retrieve requests, keyed by namespace, object type and hash of filter payload,
+    props and options. Only object types having TTL are cached, complete valid responses only.
+    Memory entries are bounded by LRU eviction, optional directory is shared between processes.
+    Entries of object type are dropped when client writes objects of the type.
+    """
+
+    def __init__(self, ttl: float = None, ttls: Mapping[str, float] = None,
+                 max_size: int = DEFAULT_RESPONSE_CACHE_SIZE, path: str = None):
+        """
+        :param ttl:         time to live in seconds of object types missing in ttls, None - such types are not cached
+        :param ttls:        time to live in seconds per object type, like {'DataExtension': 3600}.
+                            DataExtensionObject TTL applies to rows of all data extensions
+        :param max_size:    max responses kept in memory
+        :param path:        directory for persisted responses, None - keep in memory only
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        # entries are grouped by namespace and base type, so writes drop their type without visiting other entries
+        self._memory = MemoryCache(max_size=max_size, group_size=2)
+        self._file = FileCache(path, group_size=2) if path is not None else None
+
+    @staticmethod
+    def base_type(obj_type: str) -> str:
+        """Object type without data extension name, DataExtensionObject[name] -> DataExtensionObject"""
+        return obj_type.partition('[')[0]
+
+    def type_ttl(self, obj_type: str) -> float:
+        """Time to live of object type responses, None if type is not cached"""
+        if obj_type in self.ttls:
+            return self.ttls[obj_type]
+
+        return self.ttls.get(self.base_type(obj_type), self.ttl)
+
+    @classmethod
+    def make_key(cls, namespace: str, obj_type: str, search_filter: SearchFilter = None, props: list = None,
+                 options: dict = None, stream: bool = False) -> tuple:
+        """Key of request, filter payload, props and options are hashed as canonical json"""
+        request = {
+            'filter': search_filter.payload() if search_filter is not None else None,
+            'props': props,
+            'options': options,
+            'stream': bool(stream),
+        }
+        digest = hashlib.sha1(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+        return namespace, cls.base_type(obj_type), obj_type, digest
+
+    def get(self, key: tuple) -> Response:
+        """Cached response or None"""
+        response = self._memory.get(key)
+
+        if response is None and self._file is not None:
+            entry = self._file.get(key)
+            if entry is not None:
+                expires, response = entry
+                self._memory.set(key, response, ttl=expires - time.time())
+
+        return response
+
+    def set(self, key: tuple, response: Response):
+        """Store response if its object type is cached and response is complete"""
+        ttl = self.type_ttl(key[2])
+        if ttl is None or not response.is_valid or response.more_results:
+            return
+
+        self._memory.set(key, response, ttl=ttl)
+
+        if self._file is not None:
+            self._file.set(key, (time.time() + ttl, self.portable(response)), ttl=ttl)
+
+    @staticmethod
+    def portable(response: Response) -> Response:
+        """Picklable copy of response, suds results are converted into plain dicts"""
+        if isinstance(response, StreamedResponse):
+            return response
+
+        inst = Response()
+        inst.code = response.code
+        inst.status = response.status
+        inst.message = response.message
+        inst.request_id = response.request_id
+        inst.results = response.to_dicts()
+        inst.valid_response = response.valid_response
+        inst.object_type = response.object_type
+
+        return inst
+
+    def invalidate(self, namespace: str = None, obj_type: str = None):
+        """
+        Drop cached responses
+        :param namespace:   drop only responses of namespace, None - all namespaces
+        :param obj_type:    drop only responses of object type, DataExtensionObject drops rows of all data extensions.
+                            None - all types
+        """
+        base_type = self.base_type(obj_type) if obj_type is not None else None
+        backends = [self._memory] if self._file is None else [self._memory, self._file]
+
+        for backend in backends:
+            if namespace is not None and obj_type is not None:
+                backend.delete_group((namespace, base_type))
+                continue
+
+            for key in backend.keys():
+                if (namespace is None or key[0] == namespace) and (obj_type is None or key[1] == base_type):
+                    backend.delete(key)
+
+
+class PrefetchIterator:
+    """
+    Iterate over entities of resource and all next pages, while next pages are requested in background thread.
+    Background fetching stops when iterator is exhausted, closed or garbage collected.
+    """
+
+    _PAGE, _END, _ERROR = range(3)
+
+    def __init__(self, resource: 'ResourceBase', depth: int = 1):
+        """
+        :param resource:    first page
+        :param depth:       count of pages fetched ahead of consumer
+        """
+        if depth < 1:
+            raise ValueError('prefetch depth must be positive')
+
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._entities = resource.iter_entities()
+        self._finished = not resource.has_more_results
+        self._thread = None
+
+        if not self._finished:
+            # thread must not reference iterator itself, otherwise abandoned iterator is never collected
+            self._thread = threading.Thread(target=self._fetch, args=(resource, self._queue, self._stop), daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def _put(q: queue.Queue, stop: threading.Event, item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=PREFETCH_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    @classmethod
+    def _fetch(cls, resource: 'ResourceBase', q: queue.Queue, stop: threading.Event):
+        try:
+            while resource.has_more_results and not stop.is_set():
+                resource = resource.get_more_results()
+                if not cls._put(q, stop, (cls._PAGE, resource)):
+                    return
+            cls._put(q, stop, (cls._END, None))
+        except Exception as e:
+            cls._put(q, stop, (cls._ERROR, e))
+
+    def __iter__(self) -> 'PrefetchIterator':
+        return self
+
+    def __next__(self) -> 'Entity':
+        while True:
+            entity = next(self._entities, None)
+            if entity is not None:
+                return entity
+
+            if self._finished:
+                raise StopIteration
+
+            kind, value = self._queue.get()
+            if kind == self._PAGE:
+                self._entities = value.iter_entities()
+            elif kind == self._END:
+                self._finished = True
+            else:
+                self.close()
+                raise value
+
+    def close(self):
+        """Stop background fetching, closed iterator is exhausted"""
+        self._entities = iter(())
+        self._finished = True
+        self._stop.set()
+
+    def __enter__(self) -> 'PrefetchIterator':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def convert_page(content: bytes, converter: Callable[[Any], Any], field_types: FieldTypes = None) -> List[Any]:
+    """Parse raw Retrieve reply and convert every result, executed by worker process"""
+    return [converter(r) for r in iter_retrieve_results(content, field_types)]
+
+
+class ProcessPoolIterator:
+    """
+    Iterate over rows of resource and all next pages. Pages are requested in background thread, raw replies of
+    streamed pages are parsed and converted into rows by process pool, so pages are parsed on several cores while
+    next pages are fetched. Rows are returned in page order. Pages of suds responses are parsed already,
+    they are converted in background thread. Converter and rows it returns must be picklable.
+    """
+
+    _PAGE, _END, _ERROR = range(3)
+
+    def __init__(self, resource: 'ResourceBase', workers: int = None, converter: Callable[[Any], Any] = None,
+                 executor: ProcessPoolExecutor = None, depth: int = None):
+        """
+        :param resource:    first page
+        :param workers:     count of worker processes, by default count of cpus. Not used with given executor
+        :param converter:   module level function or class building row of result dict, by default entity factory
+                            of resource
+        :param executor:    process pool shared with other iterators, it is not shut down on close
+        :param depth:       count of pages fetched and parsed ahead of consumer, by default twice count of workers
+        """
+        workers = workers or os.cpu_count() or 1
+        self.converter = converter if converter is not None else resource.get_entity_factory()
+
+        self._own_executor = executor is None
+        self._executor = executor if executor is not None else ProcessPoolExecutor(max_workers=workers)
+        self._queue = queue.Queue(maxsize=depth or workers * 2)
+        self._stop = threading.Event()
+        self._finished = False
+
+        # thread must not reference iterator itself, otherwise abandoned iterator is never collected
+        self._thread = threading.Thread(target=self._fetch, daemon=True,
+                                        args=(resource, self.converter, self._executor, self._queue, self._stop))
+        self._thread.start()
+
+    @staticmethod
+    def _submit(resource: 'ResourceBase', converter: Callable[[Any], Any], executor: ProcessPoolExecutor) -> Future:
+        response = resource.response
+        if isinstance(response, StreamedResponse) and not response.is_parsed:
+            return executor.submit(convert_page, response.raw_response, converter, response.field_types)
+
+        future = Future()
+        future.set_result([converter(r) for r in response.iter_results()])
+
+        return future
+
+    @classmethod
+    def _fetch(cls, resource: 'ResourceBase', converter: Callable[[Any], Any], executor: ProcessPoolExecutor,
+               q: queue.Queue, stop: threading.Event):
+        try:
+            while True:
+                if not PrefetchIterator._put(q, stop, (cls._PAGE, cls._submit(resource, converter, executor))):
+                    return
+                if not resource.has_more_results:
+                    break
+                resource = resource.get_more_results()
+            PrefetchIterator._put(q, stop, (cls._END, None))
+        except Exception as e:
+            PrefetchIterator._put(q, stop, (cls._ERROR, e))
+
+    def iter_pages(self) -> Iterator[List[Any]]:
+        """Rows of every page in page order"""
+        try:
+            while not self._finished:
+                kind, value = self._queue.get()
+                if kind == self._PAGE:
+                    yield value.result()
+                elif kind == self._END:
+                    self._finished = True
+                else:
+                    raise value
+        finally:
+            self.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        for rows in self.iter_pages():
+            yield from rows
+
+    def close(self):
+        """Stop background fetching, pages queued for parsing are cancelled"""
+        self._finished = True
+        self._stop.set()
+
+        while True:
+            try:
+                kind, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == self._PAGE:
+                value.cancel()
+
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    def __enter__(self) -> 'ProcessPoolIterator':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
 class ResourceBase:
     """Describe API resource interface. Used for represent API response"""
 
     entity_factory: Callable = None
+    """Factory for compact entities, built with column index as second argument"""
+    compact_entity_factory: Callable = CompactEntity
+    """Build compact entities instead of regular ones"""
+    compact: bool = False
 
     def __init__(self):
         self.handler: 'ResourceHandler' = None
         self.response: Response = None
+        self.columns: ColumnIndex = None
+        self._entities: EntityList = None
 
     @classmethod
     def get_entity_factory(cls) -> Callable:
@@ -766,28 +2467,85 @@ class ResourceBase:
 
         return cls.entity_factory
 
-    def __iter__(self):
-
-        def it(resource: 'ResourceBase'):
-            index = 0
-            stop = False
-            entities = resource.entities
-            while not stop:
-                if index >= len(entities):
-                    if resource.has_more_results:
-                        resource = resource.get_more_results()
-                        entities = resource.entities
-                        index = 0
-                    else:
-                        stop = True
+    def set_compact(self, compact: bool = True, columns: ColumnIndex = None) -> 'ResourceBase':
+        """
+        Switch entities representation. Next pages inherit representation and column index
+        :param compact: build compact entities
+        :param columns: column index shared with other pages of result set
+        :return: self
+        """
+        if compact != self.compact or columns is not None:
+            self._entities = None
+
+        self.compact = compact
+        if compact:
+            self.columns = columns if columns is not None else (self.columns or ColumnIndex())
+
+        return self
+
+    def _make_entity_factory(self) -> Callable:
+        if not self.compact:
+            return self.get_entity_factory()
+
+        if self.columns is None:
+            self.columns = ColumnIndex()
 
-                    continue
+        return partial(self.compact_entity_factory, columns=self.columns)
 
-                yield entities[index]
+    def __iter__(self) -> Iterator[Entity]:
+        """Iterate over entities of all pages. Entities are not cached, so only current one is kept alive"""
+        for page in self.pages():
+            yield from page.iter_entities()
 
-                index += 1
+    def pages(self) -> Iterator['ResourceBase']:
+        """Iterate over this and all next result pages"""
+        resource = self
+        yield resource
+
+        while resource.has_more_results:
+            resource = resource.get_more_results()
+            yield resource
+
+    def __aiter__(self) -> AsyncIterator[Entity]:
+        """
+        Iterate over entities of all pages of resource produced by async client:
+        async for entity in await client.SomeResource.get(): ...
+        """
+        return self._aiter_entities()
+
+    async def _aiter_entities(self) -> AsyncIterator[Entity]:
+        async for page in self.apages():
+            for entity in page.iter_entities():
+                yield entity
+
+    async def apages(self) -> AsyncIterator['ResourceBase']:
+        """Iterate over this and all next result pages of resource produced by async client"""
+        resource = self
+        yield resource
+
+        while resource.has_more_results:
+            resource = await resource.get_more_results()
+            yield resource
+
+    def prefetch(self, depth: int = 1) -> PrefetchIterator:
+        """
+        Iterate over entities of all pages, while next pages are requested in background.
+        Usage: with resource.prefetch(2) as entities: for e in entities: ...
+        :param depth: count of pages fetched ahead of consumer
+        """
+        return PrefetchIterator(self, depth)
 
-        return it(self)
+    def process_pool(self, workers: int = None, converter: Callable[[Any], Any] = None,
+                     executor: ProcessPoolExecutor = None) -> ProcessPoolIterator:
+        """
+        Iterate over rows of all pages, raw replies are parsed and converted into rows by process pool.
+        Effective with streamed responses, see stream_results.
+        Usage: with resource.process_pool(4) as rows: for row in rows: ...
+        :param workers:     count of worker processes, by default count of cpus
+        :param converter:   picklable function of result dict, by default entity factory of resource
+        :param executor:    process pool shared with other iterators
+        """
+        return ProcessPoolIterator(self, workers, converter, executor)
 
     @classmethod
     def make_from_response(cls, handler: 'ResourceHandler', response: Response) -> 'ResourceBase':
@@ -804,11 +2562,24 @@ class ResourceBase:
         return resource
 
     @property
-    def entities(self) -> List[Entity]:
-        """Dataset entities"""
-        f = self.get_entity_factory()
+    def entities(self) -> EntityList:
+        """Dataset entities, built lazily on access"""
+        if self._entities is None:
+            self._entities = EntityList(self.response.results, self._make_entity_factory())
+
+        return self._entities
+
+    def iter_entities(self) -> Iterator[Entity]:
+        """
+        Iterate over entities of this page without caching them.
+        Streamed response is parsed along with iteration
+        """
+        if self._entities is not None:
+            return self._entities.iter_uncached()
 
-        return [f(r) for r in self.response.results]
+        factory = self._make_entity_factory()
+
+        return (factory(r) for r in self.response.iter_results())
 
     def __repr__(self):
         return "Resource<handler[{}],response[{}]>".format(self.handler.get_resource_name(), self.response)
@@ -833,7 +2604,21 @@ class ResourceBase:
         if not self.has_more_results:
             raise NoMoreDataAvailable('No more data available for request[{}]'.format(self.response.request_id))
 
-        return self.handler.more_results(self.response.request_id)
+        resource = self.handler.more_results(self.response.request_id, self.response.object_type)
+
+        if inspect.isawaitable(resource):
+            return self._inherit_representation_async(resource)
+
+        return self._inherit_representation(resource)
+
+    def _inherit_representation(self, resource: 'ResourceBase') -> 'ResourceBase':
+        if self.compact:
+            resource.set_compact(columns=self.columns)
+
+        return resource
+
+    async def _inherit_representation_async(self, resource: Awaitable['ResourceBase']) -> 'ResourceBase':
+        return self._inherit_representation(await resource)
 
     @property
     def is_valid(self):
@@ -854,6 +2639,7 @@ class ResourceHandler:
 
     def __init__(self, client):
         self.client: Client = client
+        self.compact_entities: bool = False
 
     @classmethod
     def get_resource_type(cls) -> str:
@@ -865,7 +2651,12 @@ class ResourceHandler:
 
     def make_resource(self, response: Response) -> ResourceBase:
         """Build wrapper for resource from soap-service response"""
-        return self.resource_base.make_from_response(self, response)
+        resource = self.resource_base.make_from_response(self, response)
+
+        if self.compact_entities:
+            resource.set_compact()
+
+        return resource
 
     @classmethod
     def get_resource_name(cls) -> str:
@@ -876,23 +2667,41 @@ class ResourceHandler:
         return cls.get_resource_type()
 
     def describe(self) -> ObjectDefinition:
-        """Object definition"""
-        resp = self.client.soap_describe_object(self.get_resource_type())
+        """Object definition. Served from client definition cache if it's available"""
+        definition = self.cached_definition()
 
+        if definition is None:
+            definition = self.store_definition(self.client.soap_describe_object(self.get_resource_type()))
+
+        return definition
+
+    def cached_definition(self) -> ObjectDefinition:
+        """Object definition from client definition cache or None"""
+        cache = self.client.definition_cache
+        if cache is None:
+            return None
+
+        return cache.get(self.client.cache_namespace, self.get_resource_type())
+
+    def store_definition(self, resp: Response) -> ObjectDefinition:
+        """Build object definition from describe response and put it into client definition cache"""
         if not resp.is_valid or resp.is_empty:
             raise ResourceHandlerException('Invalid response or response dataset is empty[{}]'.format(resp))
 
-        obj_type = resp.results[0]['ObjectType']
-        props = resp.results[0]['Properties']
+        definition = ObjectDefinition.make_from_result(resp.results[0])
+
+        if self.client.definition_cache is not None:
+            self.client.definition_cache.set(self.client.cache_namespace, definition)
 
-        return ObjectDefinition(obj_type, props)
+        return definition
 
-    def more_results(self, request_id: str) -> ResourceBase:
+    def more_results(self, request_id: str, obj_type: str = None) -> ResourceBase:
         """
         Get next portion of data
         :param request_id: Previous request marked as has more available results
+        :param obj_type: object type of previous request
         :return: next results portion wrapped into ResourceBase
         """
-        resp = self.client.soap_get_more_results(request_id)
+        resp = self.client.soap_get_more_results(request_id, obj_type=obj_type)
 
         return self.make_resource(resp)
@@ -0,0 +1,129 @@
+"""
+Conversion of suds objects into plain python types. Conversion function is built once per suds class and field list,
+so per-object work is a dict lookup and plain field copying.
+"""
+
+import datetime
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from suds.sudsobject import Object as SudsObject
+
+DATE_TYPES = (datetime.datetime, datetime.date, datetime.time)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+class Converter:
+    """
+    Convert suds objects into dicts. Result is the same as of recursive sobject_to_dict:
+    keys are lowercased only for top level object, lists of nested objects are converted item by item.
+    """
+
+    def __init__(self, key_to_lower: bool = False, json_serialize: bool = False):
+        """
+        :param key_to_lower:    lowercase keys of top level object
+        :param json_serialize:  convert date and time values to iso strings
+        """
+        self.key_to_lower = key_to_lower
+        self.json_serialize = json_serialize
+        self._nested: 'Converter' = self if not key_to_lower else Converter(json_serialize=json_serialize)
+        # types converted as is, checked inline by compiled functions
+        self._plain_types = set()
+        # suds classes are mapped to function compiled for last seen field list of class
+        self._value_converters: Dict[type, Callable[[Any], Any]] = {}
+        self._compiled: Dict[Tuple[type, Tuple[str, ...]], Callable[[Any], Dict[str, Any]]] = {}
+
+    def _value_converter(self, cls: type) -> Callable[[Any], Any]:
+        """Conversion of value of given type, decided once per type"""
+        fn = self._value_converters.get(cls)
+
+        if fn is None:
+            if issubclass(cls, SudsObject):
+                fn = self.convert_object
+            elif self.json_serialize and issubclass(cls, DATE_TYPES):
+                fn = _isoformat
+            else:
+                fn = _identity
+                self._plain_types.add(cls)
+            self._value_converters[cls] = fn
+
+        return fn
+
+    def convert_field(self, value: Any) -> Any:
+        """Conversion of field value, items of list are converted as values"""
+        if value.__class__ is list:
+            plain = self._plain_types
+            converters = self._value_converters
+            value_converter = self._value_converter
+            return [v if v.__class__ in plain else (converters.get(v.__class__) or value_converter(v.__class__))(v)
+                    for v in value]
+
+        return self._value_converter(value.__class__)(value)
+
+    def _compile(self, keylist: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+        """
+        Build conversion function for field list. Plain values are copied inline,
+        nested objects, lists and dates are passed to field conversion of nested converter.
+        Object with other field list is passed to convert_object
+        """
+        keys = [k.lower() for k in keylist] if self.key_to_lower else keylist
+        lines = ['def convert(obj):',
+                 '    values = obj.__dict__',
+                 '    if values["__keylist__"] != keylist:',
+                 '        return convert_object(obj)']
+        items = []
+        for i, (key, field) in enumerate(zip(keys, keylist)):
+            lines.append('    v{} = values[{!r}]'.format(i, field))
+            items.append('{!r}: v{i} if v{i}.__class__ in plain else convert_field(v{i})'.format(key, i=i))
+        lines.append('    return {' + ', '.join(items) + '}')
+
+        namespace = {'plain': self._nested._plain_types, 'convert_field': self._nested.convert_field,
+                     'convert_object': self.convert_object, 'keylist': list(keylist)}
+        exec('\n'.join(lines), namespace)
+
+        return namespace['convert']
+
+    def convert_object(self, obj: Any) -> Dict[str, Any]:
+        """Convert suds object into dict"""
+        cache_key = (obj.__class__, tuple(obj.__keylist__))
+
+        fn = self._compiled.get(cache_key)
+        if fn is None:
+            fn = self._compile(cache_key[1])
+            self._compiled[cache_key] = fn
+        self._value_converters[obj.__class__] = fn
+
+        return fn(obj)
+
+    def convert(self, obj: Any) -> Any:
+        """
+        Convert suds object into dict, other values are returned as is or converted to iso string
+        :param obj: suds object or plain value
+        :return: dict or plain value
+        """
+        return self._value_converter(obj.__class__)(obj)
+
+    def convert_many(self, objects: Iterable[Any]) -> List[Any]:
+        """Convert page of results"""
+        convert = self.convert
+        return [convert(o) for o in objects]
+
+
+_converters: Dict[Tuple[bool, bool], Converter] = {}
+
+
+def get_converter(key_to_lower: bool = False, json_serialize: bool = False) -> Converter:
+    """Shared converter for given options"""
+    key = (key_to_lower, json_serialize)
+
+    converter = _converters.get(key)
+    if converter is None:
+        converter = _converters.setdefault(key, Converter(key_to_lower, json_serialize))
+
+    return converter
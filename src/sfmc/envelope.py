@@ -0,0 +1,92 @@
+"""
+Direct rendering of Create/Update/Delete envelopes. suds builds envelope of the operation without objects,
+so auth headers and options are marshalled as usual, objects given as plain dicts are written into it by lxml
+without building and marshalling suds objects.
+"""
+
+import datetime
+from typing import Any, Iterable, List, Mapping, Sequence
+
+from lxml import etree
+
+from sfmc.parser import NS_PARTNER
+
+NS_SOAP_ENV = 'http://schemas.xmlsoap.org/soap/envelope/'
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+TAG_OBJECTS = '{%s}Objects' % NS_PARTNER
+
+
+def _text(value: Any) -> str:
+    if value is True or value is False:
+        return 'true' if value else 'false'
+
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+
+    return str(value)
+
+
+def append_value(parent, name: str, value: Any):
+    """
+    Append element of value to parent: dict is written as complex element, list as repeated elements,
+    None is skipped like by suds
+    """
+    if value is None:
+        return
+
+    if isinstance(value, (list, tuple)):
+        for v in value:
+            append_value(parent, name, v)
+        return
+
+    el = etree.SubElement(parent, '{%s}%s' % (NS_PARTNER, name))
+    if isinstance(value, Mapping):
+        for k, v in value.items():
+            append_value(el, k, v)
+    else:
+        el.text = _text(value)
+
+
+def ordered_items(obj_type: str, props: Mapping[str, Any], keys: Sequence[str]) -> List[tuple]:
+    """
+    Top level properties of object in schema order
+    :param obj_type:    object type described at wsdl
+    :param props:       object properties
+    :param keys:        properties of object type in schema order
+    """
+    for k in props:
+        if k not in keys:
+            raise ValueError('{} is not a property of {}'.format(k, obj_type))
+
+    return [(k, props[k]) for k in keys if k in props]
+
+
+def render_write_envelope(envelope: bytes, operation: str, obj_type: str, objects: Iterable[Mapping[str, Any]],
+                          keys: Sequence[str]) -> bytes:
+    """
+    Put objects into envelope of write operation
+    :param envelope:    envelope of Create/Update/Delete request built without objects
+    :param operation:   Create, Update or Delete
+    :param obj_type:    object type described at wsdl
+    :param objects:     object properties
+    :param keys:        properties of object type in schema order
+    :return: envelope bytes
+    """
+    root = etree.fromstring(envelope)
+    request = root.find('{%s}Body/{%s}%sRequest' % (NS_SOAP_ENV, NS_PARTNER, operation))
+    if request is None:
+        raise ValueError('Envelope has no {}Request element'.format(operation))
+
+    for el in request.findall(TAG_OBJECTS):
+        request.remove(el)
+
+    # request element is in partner namespace, prefix is None if it is default namespace
+    prefix = request.prefix
+    xsi_type = obj_type if prefix is None else '{}:{}'.format(prefix, obj_type)
+
+    for props in objects:
+        el = etree.SubElement(request, TAG_OBJECTS, {XSI_TYPE: xsi_type})
+        for k, v in ordered_items(obj_type, props, keys):
+            append_value(el, k, v)
+
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8')
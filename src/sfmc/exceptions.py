@@ -36,3 +36,25 @@ class ResourceMissingPropertyException(ResourceHandlerException):
 class NoMoreDataAvailable(BasePackageException):
     """Dataset is ended and no more data available"""
     pass
+
+
+class HTTPStatusError(APIRequestError):
+    """Http error reply without soap envelope, like error page of proxy or gateway"""
+
+    def __init__(self, message: str, status_code: int):
+        super(HTTPStatusError, self).__init__(message)
+        self.status_code = status_code
+
+
+class PartialWriteError(SOAPRequestError):
+    """Some chunks of chunked write request failed, objects of other chunks are written"""
+
+    def __init__(self, message: str, response, errors: list):
+        """
+        :param message:     error message
+        :param response:    merged response of written chunks, OrdinalID of results is position in whole list
+        :param errors:      (position of first object, objects, exception) of every failed chunk
+        """
+        super(PartialWriteError, self).__init__(message)
+        self.response = response
+        self.errors = errors
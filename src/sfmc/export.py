@@ -0,0 +1,335 @@
+"""
+Bulk export of data extension rows into NDJSON, CSV or Parquet file. Rows are retrieved page by page and
+every page is written as soon as it arrives, so memory is bounded by single page. Parquet requires pyarrow.
+With workers streamed pages are parsed by process pool, while next pages are fetched.
+
+Usage:
+    stats = DataExtensionExporter(client).export('rows.ndjson.gz', customer_key='de-key')
+
+Console:
+    sfmc-export --config config.json --key de-key rows.csv.gz
+"""
+
+import argparse
+import bz2
+import csv
+import gzip
+import io
+import json
+import logging
+import lzma
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+from sfmc.client import Client, ResourceBase
+from sfmc.exceptions import ConfigureError, ResourceHandlerException
+from sfmc.resources.data_extension import DataExtensionHandler, DataExtensionFieldHandler, DataExtensionRowHandler, \
+    row_payload
+from sfmc.resources.filter import SearchFilter
+
+WRITE_BUFFER_SIZE = 1024 * 1024  # bytes
+DEFAULT_PARQUET_COMPRESSION = 'snappy'
+
+"""Compressed file openers by file suffix"""
+COMPRESSIONS = {
+    'gz': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ConfigureError('pyarrow is required for parquet export, install it with: pip install pyarrow')
+
+
+def detect_format(path: str) -> Tuple[str, str]:
+    """
+    Format and compression of output file by its suffixes, like rows.ndjson.gz
+    :return: format name and compression, None if file is not compressed
+    """
+    parts = path.lower().rsplit('.', 2)[1:]
+    compression = None
+    if parts and parts[-1] in COMPRESSIONS:
+        compression = parts.pop()
+
+    fmt = parts[-1] if parts else None
+    if fmt == 'jsonl':
+        fmt = 'ndjson'
+
+    if fmt not in WRITERS:
+        raise ConfigureError('Can not detect export format of {}, expected one of {}'.format(path, sorted(WRITERS)))
+
+    return fmt, compression
+
+
+def open_text(path: str, compression: str = None) -> io.TextIOBase:
+    """Buffered text file, compressed by given compression"""
+    if compression is None:
+        return open(path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE)
+
+    if compression not in COMPRESSIONS:
+        raise ConfigureError('Unknown compression {}, expected one of {}'.format(compression, sorted(COMPRESSIONS)))
+
+    return io.TextIOWrapper(io.BufferedWriter(COMPRESSIONS[compression](path, 'wb'), WRITE_BUFFER_SIZE),
+                            encoding='utf-8', newline='')
+
+
+class ExportWriter:
+    """Write rows of data extension page by page"""
+
+    def __init__(self, path: str, fields: List[str], compression: str = None):
+        """
+        :param path:        output file
+        :param fields:      columns in output order
+        :param compression: gz, bz2 or xz for text formats, parquet codec for parquet
+        """
+        self.path = path
+        self.fields = fields
+        self.compression = compression
+
+    def write_rows(self, rows: List[Mapping[str, Any]]):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    def __enter__(self) -> 'ExportWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class NdjsonWriter(ExportWriter):
+    """Row per line json objects"""
+
+    def __init__(self, *args, **kwargs):
+        super(NdjsonWriter, self).__init__(*args, **kwargs)
+        self._file = open_text(self.path, self.compression)
+
+    def write_rows(self, rows: List[Mapping[str, Any]]):
+        self._file.writelines(json.dumps({f: r.get(f) for f in self.fields}, ensure_ascii=False, default=str) + '\n'
+                              for r in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter(ExportWriter):
+    """Csv with header row, missing values are empty"""
+
+    def __init__(self, *args, **kwargs):
+        super(CsvWriter, self).__init__(*args, **kwargs)
+        self._file = open_text(self.path, self.compression)
+        self._writer = csv.DictWriter(self._file, self.fields, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write_rows(self, rows: List[Mapping[str, Any]]):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter(ExportWriter):
+    """Parquet file of string columns, every page is written as row group"""
+
+    def __init__(self, *args, **kwargs):
+        super(ParquetWriter, self).__init__(*args, **kwargs)
+        _require_pyarrow()
+        self._schema = pyarrow.schema([(f, pyarrow.string()) for f in self.fields])
+        self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema,
+                                                     compression=self.compression or DEFAULT_PARQUET_COMPRESSION)
+
+    def write_rows(self, rows: List[Mapping[str, Any]]):
+        if not rows:
+            return
+
+        columns = [pyarrow.array([None if r.get(f) is None else str(r.get(f)) for r in rows], pyarrow.string())
+                   for f in self.fields]
+        self._writer.write_table(pyarrow.Table.from_arrays(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {
+    'ndjson': NdjsonWriter,
+    'csv': CsvWriter,
+    'parquet': ParquetWriter,
+}
+
+
+class ExportStats:
+    """Progress of export"""
+
+    def __init__(self):
+        self.rows = 0
+        self.pages = 0
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    def add_page(self, rows: int):
+        self.rows += rows
+        self.pages += 1
+        self.elapsed = time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return '{}[rows:{},pages:{},elapsed:{:.1f}s,rows_per_second:{:.0f}]'.format(
+            self.__class__.__name__, self.rows, self.pages, self.elapsed, self.rows_per_second)
+
+
+def log_progress(stats: ExportStats):
+    logging.getLogger('sfmc').info('Exported %s rows of %s pages, %.0f rows/s', stats.rows, stats.pages,
+                                   stats.rows_per_second)
+
+
+class DataExtensionExporter:
+    """Export rows of data extension into file"""
+
+    def __init__(self, client: Client):
+        self.client = client
+
+    def resolve(self, customer_key: str = None, name: str = None) -> Tuple[str, str]:
+        """Customer key and name of data extension by any of them"""
+        if customer_key is None and name is None:
+            raise ValueError('customer_key or name of data extension is required')
+
+        handler = DataExtensionHandler(self.client)
+        if customer_key is None:
+            customer_key = handler.customer_key_for_name(name)
+        elif name is None:
+            name = handler.name_for_customer_key(customer_key)
+
+        return customer_key, name
+
+    def fields(self, customer_key: str) -> List[str]:
+        """Field names of data extension in field order"""
+        res = DataExtensionFieldHandler(self.client).get(customer_key, m_props=['Name', 'Ordinal'])
+
+        if not res.is_valid:
+            raise ResourceHandlerException('Can not get fields of {}: invalid response[{}]'.format(customer_key, res))
+
+        fields = sorted(((int(e.Ordinal or 0), e.Name) for e in res), key=lambda f: f[0])
+        if not fields:
+            raise ResourceHandlerException('Data extension {} has no fields'.format(customer_key))
+
+        return [name for _, name in fields]
+
+    def rows(self, name: str, fields: List[str], m_filter: SearchFilter = None) -> ResourceBase:
+        """First page of data extension rows, next pages are requested along with iteration over pages"""
+        res = DataExtensionRowHandler(self.client).set_name(name).get(m_filter=m_filter, m_props=fields)
+
+        if not res.is_valid:
+            raise ResourceHandlerException('Can not get rows of {}: invalid response[{}]'.format(name, res))
+
+        return res
+
+    @staticmethod
+    def iter_pages(resource: ResourceBase, workers: int = None) -> Iterator[List[Mapping[str, Any]]]:
+        """Field values of rows page by page, with workers pages are parsed by process pool"""
+        if workers is None:
+            for page in resource.pages():
+                yield [e.payload() for e in page.iter_entities()]
+            return
+
+        with resource.process_pool(workers, converter=row_payload) as rows:
+            yield from rows.iter_pages()
+
+    def export(self, path: str, customer_key: str = None, name: str = None, fields: List[str] = None,
+               fmt: str = None, compression: str = None, m_filter: SearchFilter = None,
+               progress: Callable[[ExportStats], None] = log_progress, workers: int = None) -> ExportStats:
+        """
+        Write all rows of data extension into file
+        :param path:            output file
+        :param customer_key:    data extension customer key
+        :param name:            data extension name, used if customer key is not given
+        :param fields:          exported fields, by default all fields of data extension
+        :param fmt:             ndjson, csv or parquet, by default detected by path suffix
+        :param compression:     compression, by default detected by path suffix
+        :param m_filter:        filter of exported rows
+        :param progress:        called with stats after every written page
+        :param workers:         count of processes parsing pages, by default pages are parsed by current process.
+                                Effective with stream_results client param
+        :return: export stats
+        """
+        if fmt is None:
+            fmt, detected = detect_format(path)
+        elif fmt not in WRITERS:
+            raise ConfigureError('Unknown export format {}, expected one of {}'.format(fmt, sorted(WRITERS)))
+        else:
+            suffix = path.lower().rpartition('.')[2]
+            detected = suffix if suffix in COMPRESSIONS and fmt != 'parquet' else None
+
+        if compression is None:
+            compression = detected
+
+        customer_key, name = self.resolve(customer_key, name)
+        if fields is None:
+            fields = self.fields(customer_key)
+
+        stats = ExportStats()
+        with WRITERS[fmt](path, fields, compression) as writer:
+            for rows in self.iter_pages(self.rows(name, fields, m_filter), workers):
+                writer.write_rows(rows)
+                stats.add_page(len(rows))
+
+                if progress is not None:
+                    progress(stats)
+
+        return stats
+
+
+def main(argv: List[str] = None) -> int:
+    """Console entry point, see module docs"""
+    parser = argparse.ArgumentParser(prog='sfmc-export', description='Export data extension rows into file')
+    parser.add_argument('output', help='output file, format and compression are detected by suffix, '
+                                       'like rows.ndjson.gz, rows.csv, rows.parquet')
+    parser.add_argument('--config', required=True, help='json file with client params')
+    parser.add_argument('--key', help='data extension customer key')
+    parser.add_argument('--name', help='data extension name')
+    parser.add_argument('--fields', help='comma separated fields, by default all fields')
+    parser.add_argument('--format', choices=sorted(WRITERS), help='output format')
+    parser.add_argument('--compression', help='gz, bz2, xz or parquet codec')
+    parser.add_argument('--workers', type=int, help='count of processes parsing pages')
+    args = parser.parse_args(argv)
+
+    if args.key is None and args.name is None:
+        parser.error('--key or --name is required')
+
+    from sfmc import client_factory
+
+    with open(args.config, 'r') as f:
+        params: Dict[str, Any] = json.load(f)
+
+    # streamed pages are parsed along with writing
+    params.setdefault('stream_results', True)
+    client = client_factory.set_params(params).make()
+
+    def report(stats: ExportStats):
+        sys.stderr.write('\r{} rows, {} pages, {:.0f} rows/s'.format(stats.rows, stats.pages, stats.rows_per_second))
+        sys.stderr.flush()
+
+    fields = args.fields.split(',') if args.fields else None
+    stats = DataExtensionExporter(client).export(args.output, customer_key=args.key, name=args.name, fields=fields,
+                                                 fmt=args.format, compression=args.compression, progress=report,
+                                                 workers=args.workers)
+    sys.stderr.write('\nDone: {}\n'.format(stats))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,204 @@
 """Http layer for execute REST and SOAP calls"""
 
+import io
+import json
+import urllib.request
+from typing import Mapping, Any, Dict, Tuple
 
-class Client:
-    pass
+import requests
+from requests.adapters import HTTPAdapter
+from suds.transport import Transport, Reply, TransportError
 
+from sfmc.exceptions import HTTPStatusError
 
-class ClientFactory:
-    pass
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10  # seconds
+DEFAULT_READ_TIMEOUT = 300  # seconds
 
 
 class Request:
-    pass
+    """Http request description"""
+
+    def __init__(self, method: str, url: str, headers: Mapping[str, str] = None, data: Any = None,
+                 params: Mapping[str, Any] = None):
+        """
+        :param method:  http method
+        :param url:     target url
+        :param headers: request headers
+        :param data:    request body
+        :param params:  query string params
+        """
+        self.method = method
+        self.url = url
+        self.headers = dict(headers) if headers is not None else {}
+        self.data = data
+        self.params = params
+
+    def __repr__(self):
+        return '{}[method:{},url:{}]'.format(self.__class__.__name__, self.method, self.url)
 
 
 class Response:
-    pass
+    """Http response wrapper"""
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @classmethod
+    def make_from_requests_response(cls, resp: requests.Response) -> 'Response':
+        return cls(resp.status_code, resp.headers, resp.content)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def __repr__(self):
+        return '{}[status_code:{},length:{}]'.format(self.__class__.__name__, self.status_code, len(self.content))
+
+
+class Client:
+    """
+    Keep-alive http client. All requests share pooled connections of single requests session,
+    so repeated calls to the same host skip tcp and tls handshakes.
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 keep_alive: bool = True):
+        """
+        :param pool_connections:    number of per host connection pools to cache
+        :param pool_maxsize:        max connections kept open per host
+        :param connect_timeout:     connect timeout in seconds
+        :param read_timeout:        read timeout in seconds
+        :param keep_alive:          keep connections open between requests
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self._session: requests.Session = None
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def session(self) -> requests.Session:
+        """Lazily built pooled session"""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+
+            if not self.keep_alive:
+                session.headers['Connection'] = 'close'
+
+            self._session = session
+
+        return self._session
+
+    def send(self, request: Request) -> Response:
+        """
+        Execute request
+        :param request: http request
+        :return: http response
+        """
+        resp = self.session.request(request.method, request.url, headers=request.headers, data=request.data,
+                                    params=request.params, timeout=self.timeout)
+
+        return Response.make_from_requests_response(resp)
+
+    def get(self, url: str, headers: Mapping[str, str] = None, params: Mapping[str, Any] = None) -> Response:
+        return self.send(Request('GET', url, headers=headers, params=params))
+
+    def post(self, url: str, data: Any = None, headers: Mapping[str, str] = None) -> Response:
+        return self.send(Request('POST', url, headers=headers, data=data))
+
+    def close(self):
+        """Close all pooled connections"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __repr__(self):
+        return '<[{}][pool:{}x{}][timeout:{}][keep_alive:{}]>'.format(
+            self.__class__.__name__, self.pool_connections, self.pool_maxsize, self.timeout, self.keep_alive)
+
+
+class ClientFactory:
+    """Produce http clients"""
+
+    def __init__(self):
+        self._params = {}
+
+    def set_params(self, params: Mapping[str, Any]) -> 'ClientFactory':
+        """
+        Set client params
+        :param params: pool_connections, pool_maxsize, connect_timeout, read_timeout, keep_alive
+        :return: self
+        """
+        self._params.update(params)
+
+        return self
+
+    def make(self) -> Client:
+        params: Dict[str, Any] = {k: v for k, v in self._params.items() if v is not None}
+
+        if 'keep_alive' in params:
+            params['keep_alive'] = params['keep_alive'] in ('1', 'true', 'True', True)
+
+        return Client(**params)
+
+
+def check_soap_reply(status_code: int, headers: Mapping[str, str], content: bytes):
+    """Raise HTTPStatusError for error reply which is not soap envelope and can not be parsed as fault"""
+    if status_code == 200 or 'xml' in (headers.get('Content-Type') or ''):
+        return
+
+    raise HTTPStatusError('Http error {}: {}'.format(status_code, content[:200].decode('utf-8', 'replace')),
+                          status_code)
+
+
+class SoapTransport(Transport):
+    """suds transport sending soap envelopes through pooled http client"""
+
+    def __init__(self, http_client: Client):
+        super(SoapTransport, self).__init__()
+        self.http_client = http_client
+        self.last_exchange: Tuple[int, int] = None  # sent and received bytes of last envelope
+
+    def open(self, request):
+        """Open wsdl or schema document. Local files are read directly"""
+        if request.url.startswith('file:'):
+            return urllib.request.urlopen(request.url)
+
+        resp = self.http_client.get(request.url, headers=request.headers)
+        if resp.status_code != 200:
+            raise TransportError('Can not open {}'.format(request.url), resp.status_code, io.BytesIO(resp.content))
+
+        return io.BytesIO(resp.content)
+
+    def send(self, request):
+        """
+        Send soap envelope. Timeouts of the http client are used instead of suds timeout option
+        """
+        resp = self.http_client.post(request.url, data=request.message, headers=dict(request.headers))
+        self.last_exchange = (len(request.message or b''), len(resp.content or b''))
+
+        if resp.status_code in (202, 204):
+            return None
+
+        if resp.status_code != 200:
+            check_soap_reply(resp.status_code, resp.headers, resp.content)
+            raise TransportError('Http error {}'.format(resp.status_code), resp.status_code,
+                                 io.BytesIO(resp.content))
+
+        return Reply(resp.status_code, resp.headers, resp.content)
@@ -0,0 +1,343 @@
+"""
+In-process metrics. Client reports every soap call and auth refresh to its instrumentation,
+MetricsInstrumentation collects them into registry which can be rendered in prometheus text format.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)  # seconds
+DEFAULT_SIZE_BUCKETS = (1024, 8 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024)
+
+# values of overall_status label, other statuses are reported as Other so label cardinality stays bounded
+OVERALL_STATUS_OK = 'OK'
+OVERALL_STATUS_ERROR = 'Error'
+OVERALL_STATUS_MORE_DATA = 'MoreDataAvailable'
+OVERALL_STATUS_OTHER = 'Other'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+
+class Metric:
+    """Metric with values per label set"""
+
+    TYPE: str = None
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        """
+        :param name:            metric name
+        :param documentation:   help text
+        :param label_names:     names of labels, values are passed as keyword arguments
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError('{} expects labels {}, got {}'.format(self.name, self.label_names, sorted(labels)))
+
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def _format_labels(self, key: Tuple[str, ...], extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.label_names, key)) + list(extra)
+        if not pairs:
+            return ''
+
+        return '{' + ','.join('{}="{}"'.format(n, _escape(v)) for n, v in pairs) + '}'
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def exposition(self) -> List[str]:
+        lines = ['# HELP {} {}'.format(self.name, self.documentation), '# TYPE {} {}'.format(self.name, self.TYPE)]
+
+        return lines + self.samples()
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+
+    TYPE = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super(Counter, self).__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+
+        return ['{}{} {}'.format(self.name, self._format_labels(k), _format_number(v)) for k, v in values]
+
+
+class Histogram(Metric):
+    """Distribution of observed values by cumulative buckets"""
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS):
+        super(Histogram, self).__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # per label set: bucket counts, sum, count
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def get_count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+
+        return entry[2] if entry is not None else 0
+
+    def get_sum(self, **labels) -> float:
+        entry = self._values.get(self._key(labels))
+
+        return entry[1] if entry is not None else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((k, (list(c), s, n)) for k, (c, s, n) in self._values.items())
+
+        lines = []
+        for key, (counts, total, count) in values:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = self._format_labels(key, [('le', _format_number(bound))])
+                lines.append('{}_bucket{} {}'.format(self.name, labels, bucket_count))
+            lines.append('{}_sum{} {}'.format(self.name, self._format_labels(key), _format_number(total)))
+            lines.append('{}_count{} {}'.format(self.name, self._format_labels(key), count))
+
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of process, can be scraped in prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+
+        if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+            raise ValueError('Metric {} is already registered with other type or labels'.format(metric.name))
+
+        return existing
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """Get or register counter"""
+        return self._register(Counter(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS) -> Histogram:
+        """Get or register histogram"""
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def get(self, name: str) -> Metric:
+        return self._metrics[name]
+
+    def exposition(self) -> str:
+        """All metrics in prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.exposition())
+
+        return '\n'.join(lines) + '\n'
+
+
+"""Registry used by client factory when metrics are enabled"""
+REGISTRY = MetricsRegistry()
+
+
+class SoapCallRecord:
+    """Measurements of single soap request"""
+
+    def __init__(self, operation: str, obj_type: str):
+        """
+        :param operation:   Retrieve, ContinueRetrieve, Describe, Create, Update or Delete
+        :param obj_type:    requested object type, empty if unknown
+        """
+        self.operation = operation
+        self.obj_type = obj_type or ''
+        self.status = 'error'
+        self.overall_status = OVERALL_STATUS_OTHER
+        self.duration = 0.0
+        self.bytes_out: int = None
+        self.bytes_in: int = None
+        self.rows: int = None
+
+    def read_exchange(self, exchange: Tuple[int, int]):
+        """Take sent and received bytes"""
+        if exchange is not None:
+            self.bytes_out, self.bytes_in = exchange
+
+    def read_response(self, response):
+        """Take status and rows count of client response"""
+        self.status = 'ok' if response.is_valid else 'invalid'
+        self.overall_status = self.overall_status_label(response.message)
+        self.rows = response.results_count()
+
+    @staticmethod
+    def overall_status_label(overall_status: str) -> str:
+        """
+        Label of OverallStatus. Status may contain error text, like 'Error: ...' or 'Has Errors',
+        so it is mapped to OK, Error, MoreDataAvailable or Other
+        """
+        kind = str(overall_status or '').split(':')[0].strip()
+        if kind in (OVERALL_STATUS_OK, OVERALL_STATUS_MORE_DATA):
+            return kind
+
+        if kind.startswith(OVERALL_STATUS_ERROR) or kind == 'Has Errors':
+            return OVERALL_STATUS_ERROR
+
+        return OVERALL_STATUS_OTHER
+
+    def __repr__(self):
+        return '{}[operation:{},obj_type:{},status:{},duration:{:.3f}]'.format(
+            self.__class__.__name__, self.operation, self.obj_type, self.status, self.duration)
+
+
+class Instrumentation:
+    """Hooks called by client on every soap request and auth token refresh. Does nothing by default"""
+
+    @contextmanager
+    def soap_call(self, operation: str, obj_type: str = None):
+        """
+        Measure soap request, record is reported on exit even if request failed.
+        Usage: with instrumentation.soap_call('Retrieve', obj_type) as record: ...
+        """
+        record = SoapCallRecord(operation, obj_type)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - started
+            self._report(self.on_soap_call, record)
+
+    @contextmanager
+    def auth_refresh(self):
+        """Measure token refresh"""
+        started = time.perf_counter()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self._report(self.on_auth_refresh, time.perf_counter() - started, success)
+
+    def retry(self, operation: str, obj_type: str, reason: str):
+        """Report retry of failed soap request"""
+        self._report(self.on_retry, operation, obj_type or '', reason)
+
+    @staticmethod
+    def _report(hook, *args):
+        # broken instrumentation must never break api call
+        try:
+            hook(*args)
+        except Exception as e:
+            logging.getLogger('sfmc').warning('Instrumentation hook failed: %s', e)
+
+    def on_soap_call(self, record: SoapCallRecord):
+        pass
+
+    def on_auth_refresh(self, duration: float, success: bool):
+        pass
+
+    def on_retry(self, operation: str, obj_type: str, reason: str):
+        pass
+
+
+class MetricsInstrumentation(Instrumentation):
+    """Collect client calls into metrics registry"""
+
+    def __init__(self, registry: MetricsRegistry = None, prefix: str = 'sfmc'):
+        """
+        :param registry:    target registry, by default process registry
+        :param prefix:      metric names prefix
+        """
+        self.registry = registry if registry is not None else REGISTRY
+        labels = ('operation', 'object_type')
+
+        self.requests = self.registry.counter(
+            prefix + '_soap_requests_total', 'Soap requests', labels + ('status', 'overall_status'))
+        self.duration = self.registry.histogram(
+            prefix + '_soap_request_duration_seconds', 'Soap request latency', labels)
+        self.sent_bytes = self.registry.counter(prefix + '_soap_sent_bytes_total', 'Sent envelope bytes', labels)
+        self.received_bytes = self.registry.counter(
+            prefix + '_soap_received_bytes_total', 'Received reply bytes', labels)
+        self.envelope_size = self.registry.histogram(
+            prefix + '_soap_envelope_bytes', 'Envelope size', ('operation', 'direction'), DEFAULT_SIZE_BUCKETS)
+        self.rows = self.registry.counter(prefix + '_soap_rows_total', 'Result rows', labels)
+        self.pages = self.registry.counter(prefix + '_soap_pages_total', 'Retrieved result pages', ('object_type',))
+        self.retries = self.registry.counter(
+            prefix + '_soap_retries_total', 'Retried soap requests', labels + ('reason',))
+        self.auth_refreshes = self.registry.counter(prefix + '_auth_refreshes_total', 'Token refreshes', ('status',))
+        self.auth_duration = self.registry.histogram(
+            prefix + '_auth_refresh_duration_seconds', 'Token refresh latency')
+
+    def on_soap_call(self, record: SoapCallRecord):
+        labels = {'operation': record.operation, 'object_type': record.obj_type}
+
+        self.requests.inc(status=record.status, overall_status=record.overall_status, **labels)
+        self.duration.observe(record.duration, **labels)
+
+        if record.bytes_out is not None:
+            self.sent_bytes.inc(record.bytes_out, **labels)
+            self.envelope_size.observe(record.bytes_out, operation=record.operation, direction='out')
+
+        if record.bytes_in is not None:
+            self.received_bytes.inc(record.bytes_in, **labels)
+            self.envelope_size.observe(record.bytes_in, operation=record.operation, direction='in')
+
+        if record.rows is not None:
+            self.rows.inc(record.rows, **labels)
+
+        if record.operation in ('Retrieve', 'ContinueRetrieve') and record.status != 'error':
+            self.pages.inc(object_type=record.obj_type)
+
+    def on_auth_refresh(self, duration: float, success: bool):
+        self.auth_refreshes.inc(status='ok' if success else 'error')
+        self.auth_duration.observe(duration)
+
+    def on_retry(self, operation: str, obj_type: str, reason: str):
+        self.retries.inc(operation=operation, object_type=obj_type, reason=reason)
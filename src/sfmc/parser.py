@@ -0,0 +1,139 @@
+"""
+Incremental parsing of raw Retrieve replies by lxml, without building suds objects.
+Rows are plain dicts shaped like sobject_to_dict output. Values are converted like suds converts them
+(int, float, bool, datetime) when field types of wsdl schema are given, otherwise they are kept as text.
+"""
+
+import io
+import re
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+from lxml import etree
+from suds.xsd.sxbase import XBuiltin
+from suds.xsd.sxbuiltin import Factory as BuiltinFactory
+
+NS_PARTNER = 'http://exacttarget.com/wsdl/partnerAPI'
+XSI_NIL = '{http://www.w3.org/2001/XMLSchema-instance}nil'
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+
+# field type of builtin xsd type is its name with this prefix, other field types are names of complex types
+BUILTIN_TYPE_PREFIX = 'xsd:'
+
+# suds conversions of builtin xsd types converted into python types, string types are kept as text
+TRANSLATORS: Dict[str, Callable[[Optional[str]], Any]] = {
+    BUILTIN_TYPE_PREFIX + name: cls.translate for name, cls in BuiltinFactory.tags.items()
+    if cls.translate is not XBuiltin.translate}
+
+FieldTypes = Mapping[str, Mapping[str, str]]
+
+TAG_RESULTS = '{%s}Results' % NS_PARTNER
+TAG_OVERALL_STATUS = '{%s}OverallStatus' % NS_PARTNER
+TAG_REQUEST_ID = '{%s}RequestID' % NS_PARTNER
+
+# elements declared with maxOccurs > 1, kept as lists even if single element is present
+LIST_ELEMENTS = frozenset(['Property', 'Attributes', 'Lists'])
+
+RESULTS_END_RE = re.compile(rb'</(?:[\w.-]+:)?Results>|<(?:[\w.-]+:)?Results(?:\s[^>]*)?/>')
+
+
+def _local_name(tag: str) -> str:
+    return tag.rpartition('}')[2]
+
+
+def element_to_value(el, field_types: FieldTypes = None, type_name: str = None) -> Any:
+    """
+    Convert element into plain value: text or typed value for simple element, None for nil element,
+    dict for complex one. Repeated child elements are collected into list.
+    :param el:          lxml element
+    :param field_types: complex type name to its field name and field type, see sfmc.client.schema_field_types
+    :param type_name:   declared type of element, overridden by xsi:type of complex element
+    :return: plain value
+    """
+    if el.get(XSI_NIL) == 'true':
+        return None
+
+    if len(el) == 0:
+        translate = TRANSLATORS.get(type_name) if type_name is not None else None
+
+        return translate(el.text) if translate is not None else el.text
+
+    fields = None
+    if field_types is not None:
+        xsi_type = el.get(XSI_TYPE)
+        if xsi_type is not None:
+            type_name = xsi_type.rpartition(':')[2]
+        fields = field_types.get(type_name) if type_name is not None else None
+
+    data: Dict[str, Any] = {}
+    repeated = set()
+
+    for child in el:
+        if not isinstance(child.tag, str):  # comments and processing instructions
+            continue
+
+        name = _local_name(child.tag)
+        value = element_to_value(child, field_types, fields.get(name) if fields is not None else None)
+
+        if name in LIST_ELEMENTS or name in repeated:
+            data.setdefault(name, []).append(value)
+        elif name in data:
+            data[name] = [data[name], value]
+            repeated.add(name)
+        else:
+            data[name] = value
+
+    return data
+
+
+def _iterparse(content: bytes, tag):
+    return etree.iterparse(io.BytesIO(content), events=('end',), tag=tag, huge_tree=True)
+
+
+def read_retrieve_status(content: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read OverallStatus and RequestID of raw Retrieve reply. Both precede results, so parsing stops on first result
+    :param content: reply bytes
+    :return: overall status and request id
+    """
+    status = None
+    request_id = None
+
+    for _, el in _iterparse(content, (TAG_OVERALL_STATUS, TAG_REQUEST_ID, TAG_RESULTS)):
+        if el.tag == TAG_OVERALL_STATUS:
+            status = el.text
+        elif el.tag == TAG_REQUEST_ID:
+            request_id = el.text
+        else:
+            break
+
+        if status is not None and request_id is not None:
+            break
+
+    return status, request_id
+
+
+def count_retrieve_results(content: bytes) -> int:
+    """
+    Count results of raw Retrieve reply by scanning bytes for result end tags, without parsing
+    :param content: reply bytes
+    :return: results count
+    """
+    return sum(1 for _ in RESULTS_END_RE.finditer(content))
+
+
+def iter_retrieve_results(content: bytes, field_types: FieldTypes = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parse results of raw Retrieve reply one by one. Parsed elements are dropped,
+    so only current row is kept in memory besides reply bytes
+    :param content:     reply bytes
+    :param field_types: field types of wsdl schema, values are kept as text without them
+    :return: generator of row dicts
+    """
+    for _, el in _iterparse(content, TAG_RESULTS):
+        row = element_to_value(el, field_types)
+
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+        yield row
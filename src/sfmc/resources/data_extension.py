@@ -1,9 +1,14 @@
-from typing import List, Mapping, Any, Union
-from sfmc.client import ResourceBase, ResourceHandler, Entity
-from sfmc.exceptions import ResourceHandlerException
+import threading
+import time
+from typing import Dict, List, Mapping, Any, Optional, Union
+from sfmc.client import ResourceBase, ResourceHandler, Entity, CompactEntity, Response
+from sfmc.exceptions import ResourceHandlerException, ResourceMissingPropertyException, PartialWriteError
 from sfmc.resources.filter import SearchFilter
 from sfmc.resources.mixins import Gettable
 
+DEFAULT_CATALOG_REFRESH_INTERVAL = 15 * 60  # seconds
+CATALOG_FIELD_KEYS_CHUNK = 50  # data extensions per Retrieve of fields of refreshed data extensions
+
 
 class DataExtensionResource(ResourceBase):
     """Resource wrapper for DataExtension entities"""
@@ -21,6 +26,11 @@ class DataExtensionHandler(ResourceHandler, Gettable):
         :param key: data extension key
         :return: de name
         """
+        catalog = self.client.de_catalog
+        info = catalog.by_key(key) if catalog is not None else None
+        if info is not None:
+            return info.name
+
         props = ["Name", "CustomerKey"]
 
         f = SearchFilter.equals('CustomerKey', key)
@@ -43,6 +53,11 @@ class DataExtensionHandler(ResourceHandler, Gettable):
         :param name: data extension name
         :return: de key
         """
+        catalog = self.client.de_catalog
+        info = catalog.by_name(name) if catalog is not None else None
+        if info is not None:
+            return info.customer_key
+
         props = ["Name", "CustomerKey"]
 
         f = SearchFilter.equals('Name', name)
@@ -83,6 +98,12 @@ class DataExtensionFieldHandler(ResourceHandler):
         if customer_key is None:
             customer_key = self.customer_key
 
+        catalog = self.client.de_catalog
+        if catalog is not None and m_props is not None and set(m_props) <= set(catalog.field_props):
+            info = catalog.by_key(customer_key)
+            if info is not None:
+                return self.make_resource(info.fields_response())
+
         if m_props is not None and type(m_props) is list:
             props = m_props
         else:
@@ -118,9 +139,106 @@ class DataExtensionRowEntity(Entity):
         return {p.Name: p.Value for p in self.properties.values()}
 
 
+class CompactDataExtensionRowEntity(CompactEntity):
+    """Compact representation of data extension row"""
+
+    __slots__ = ()
+
+    def __getattr__(self, item) -> Any:
+        if item == 'Properties':
+            if not self.has_properties():
+                raise AttributeError('No such attribute [{}]'.format(item))
+            return self.get_properties()
+
+        if self.has_properties() and item in self.columns.properties:
+            try:
+                return self.get_property_value(item)
+            except ResourceMissingPropertyException:
+                pass
+
+        return super(CompactDataExtensionRowEntity, self).__getattr__(item)
+
+    def payload(self):
+        if not self.has_properties():
+            return {}
+
+        return dict(self._items(self.columns.properties, self.property_values))
+
+
+def row_payload(data) -> Dict[str, Any]:
+    """Field values of data extension row result, picklable converter for ResourceBase.process_pool"""
+    return DataExtensionRowEntity(data).payload()
+
+
 class DataExtensionRow(ResourceBase):
     """Resource wrapper for data extension row entities"""
     entity_factory = DataExtensionRowEntity
+    compact_entity_factory = CompactDataExtensionRowEntity
+
+
+class UpsertResult:
+    """Per row outcome of upsert, statuses and messages are in order of given rows"""
+
+    CREATED = 'created'
+    UPDATED = 'updated'
+    FAILED = 'failed'
+
+    def __init__(self, resource: ResourceBase, rows_count: int, errors: list = None):
+        """
+        :param resource:    resource of update response, merged response of written chunks if some chunks failed
+        :param rows_count:  count of sent rows
+        :param errors:      (position of first row, objects, exception) of failed chunks, see PartialWriteError
+        """
+        self.resource = resource
+        self.errors = errors or []
+        self.statuses: List[str] = [self.FAILED] * rows_count
+        self.messages: List[str] = ['No result for row'] * rows_count
+
+        for offset, chunk, error in self.errors:
+            for index in range(offset, min(offset + len(chunk), rows_count)):
+                self.messages[index] = 'Chunk failed: {}'.format(error)
+
+        for position, result in enumerate(resource.response.results):
+            ordinal = getattr(result, 'OrdinalID', None)
+            index = int(ordinal) if ordinal is not None else position
+            if not 0 <= index < rows_count:
+                continue
+
+            message = str(getattr(result, 'StatusMessage', None) or '')
+            if getattr(result, 'StatusCode', None) != 'OK':
+                self.statuses[index] = self.FAILED
+            elif message.lower().startswith('created'):
+                self.statuses[index] = self.CREATED
+            else:
+                self.statuses[index] = self.UPDATED
+            self.messages[index] = message
+
+    def _indexes(self, status: str) -> List[int]:
+        return [i for i, s in enumerate(self.statuses) if s == status]
+
+    @property
+    def created(self) -> List[int]:
+        """Positions of created rows"""
+        return self._indexes(self.CREATED)
+
+    @property
+    def updated(self) -> List[int]:
+        """Positions of updated rows"""
+        return self._indexes(self.UPDATED)
+
+    @property
+    def failed(self) -> List[int]:
+        """Positions of failed rows"""
+        return self._indexes(self.FAILED)
+
+    @property
+    def is_valid(self) -> bool:
+        """All rows are written"""
+        return self.resource.response.valid_response and self.FAILED not in self.statuses
+
+    def __repr__(self):
+        return '{}[created:{},updated:{},failed:{}]'.format(
+            self.__class__.__name__, len(self.created), len(self.updated), len(self.failed))
 
 
 class DataExtensionRowHandler(ResourceHandler):
@@ -129,6 +247,9 @@ class DataExtensionRowHandler(ResourceHandler):
     resource_name = 'DataExtensionRow'
     resource_base = DataExtensionRow
 
+    """UpdateOptions making update create missing rows"""
+    upsert_options = {'SaveOptions': {'SaveOption': [{'PropertyName': '*', 'SaveAction': 'UpdateAdd'}]}}
+
     def __init__(self, client):
         self.customer_key: str = None
         self.name: str = None
@@ -147,7 +268,12 @@ class DataExtensionRowHandler(ResourceHandler):
     def get(self, m_filter: SearchFilter = None, m_props: List[str] = None,
             m_options: Mapping[str, Any] = None) -> ResourceBase:
         """Get data extension rows(objects)"""
-        res_type = "{}[{}]".format(self.get_resource_type(), self.name)
+        name = self.name
+        if name is None and self.customer_key is not None and self.client.de_catalog is not None:
+            # handler is shared by client, so resolved name is not kept. Catalog miss falls back to retrieve
+            name = self.client.DataExtension.name_for_customer_key(self.customer_key)
+
+        res_type = "{}[{}]".format(self.get_resource_type(), name)
 
         resp = self.client.soap_get(res_type, search_filter=m_filter, props=m_props, options=m_options)
 
@@ -183,6 +309,9 @@ class DataExtensionRowHandler(ResourceHandler):
                                     to_delete: bool = False) -> Union[Mapping[str, Any], List[Mapping[str, Any]]]:
         customer_key = customer_key if customer_key is not None else self.customer_key
 
+        if customer_key is None and self.name is not None and self.client.de_catalog is not None:
+            customer_key = self.client.DataExtension.customer_key_for_name(self.name)
+
         props_converter = self._convert_props_to_scheme if to_delete is False else self._convert_props_to_scheme_for_delete
 
         if type(props) is list:
@@ -232,3 +361,207 @@ class DataExtensionRowHandler(ResourceHandler):
         resp = self.client.soap_delete(self.get_resource_type(), payload)
 
         return self.make_resource(resp)
+
+    def upsert(self, props: Union[Mapping[str, Any], List[Mapping[str, Any]]],
+               customer_key: str = None) -> UpsertResult:
+        """
+        Update existing rows and create missing ones by single request per chunk (SaveAction UpdateAdd).
+        Rows are split into chunks like by update, see Client.soap_write
+        :param props:   Single object properties or list of object properties
+        :param customer_key:    customer key
+        :return: per row result, rows of failed chunks are failed. Error is raised only if all chunks failed
+        """
+        rows = props if type(props) is list else [props]
+        payload = self._prepare_properties_payload(rows, customer_key)
+        try:
+            resp = self.client.soap_patch(self.get_resource_type(), payload, options=self.upsert_options)
+        except PartialWriteError as e:
+            return self.make_upsert_result(e.response, len(rows), e.errors)
+
+        return self.make_upsert_result(resp, len(rows))
+
+    def make_upsert_result(self, response: Response, rows_count: int, errors: list = None) -> UpsertResult:
+        return UpsertResult(self.make_resource(response), rows_count, errors)
+
+
+class DataExtensionInfo:
+    """Data extension of catalog with its fields"""
+
+    def __init__(self, entity: Any, fields: List[Any] = None):
+        """
+        :param entity:  DataExtension result
+        :param fields:  DataExtensionField results of data extension
+        """
+        self.entity = entity
+        self.name: str = entity.Name
+        self.customer_key: str = entity.CustomerKey
+        self.object_id: str = getattr(entity, 'ObjectID', None)
+        self.modified_date = getattr(entity, 'ModifiedDate', None)
+        self.fields: List[Any] = []
+        self.set_fields(fields or [])
+
+    def set_fields(self, fields: List[Any]):
+        self.fields = sorted(fields, key=lambda f: int(getattr(f, 'Ordinal', None) or 0))
+
+    @property
+    def field_names(self) -> List[str]:
+        """Field names in field order"""
+        return [f.Name for f in self.fields]
+
+    @property
+    def primary_key(self) -> List[str]:
+        return [f.Name for f in self.fields if str(getattr(f, 'IsPrimaryKey', None)).lower() == 'true']
+
+    def fields_response(self) -> Response:
+        """Fields as response of DataExtensionField Retrieve"""
+        response = Response()
+        response.code = 200
+        response.status = True
+        response.message = 'OK'
+        response.valid_response = True
+        response.object_type = DataExtensionFieldHandler.resource_type
+        response.results = list(self.fields)
+
+        return response
+
+    def __repr__(self):
+        return '{}[name:{},customer_key:{},fields:{}]'.format(
+            self.__class__.__name__, self.name, self.customer_key, len(self.fields))
+
+
+class DataExtensionCatalog:
+    """
+    In-memory index of all data extensions of business unit by name, customer key and ObjectID, with fields.
+    Catalog is loaded by paginated Retrieve of all DataExtension and DataExtensionField objects on first lookup,
+    after refresh_interval it is refreshed incrementally: only data extensions modified since last load are
+    retrieved with their fields. Used by data extension handlers of blocking client to skip lookup requests.
+    Deleted data extensions stay in catalog until reload.
+    """
+
+    de_props = ['ObjectID', 'CustomerKey', 'Name', 'ModifiedDate']
+    field_props = ['ObjectID', 'Name', 'FieldType', 'MaxLength', 'IsPrimaryKey', 'IsRequired', 'Ordinal',
+                   'DataExtension.CustomerKey']
+
+    def __init__(self, client, refresh_interval: float = DEFAULT_CATALOG_REFRESH_INTERVAL):
+        """
+        :param client:              blocking client
+        :param refresh_interval:    seconds after which catalog is refreshed on lookup, None - never refresh
+        """
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.high_water_mark = None  # max ModifiedDate of loaded data extensions
+        self.refreshed_at: float = None
+        self._by_name: Dict[str, DataExtensionInfo] = {}
+        self._by_key: Dict[str, DataExtensionInfo] = {}
+        self._by_object_id: Dict[str, DataExtensionInfo] = {}
+        self._lock = threading.RLock()
+
+    def _retrieve(self, handler: ResourceHandler, m_filter: SearchFilter, props: List[str]) -> List[Any]:
+        res = self.client.soap_get(handler.get_resource_type(), search_filter=m_filter, props=props)
+        results = []
+        while True:
+            if not res.is_valid:
+                raise ResourceHandlerException('Can not load {} catalog: invalid response[{}]'.format(
+                    handler.get_resource_type(), res))
+            results.extend(res.results)
+            if not res.more_results:
+                return results
+            res = self.client.soap_get_more_results(res.request_id, obj_type=handler.get_resource_type())
+
+    def _retrieve_fields(self, customer_keys: List[str] = None) -> Dict[str, List[Any]]:
+        """Fields grouped by data extension customer key, fields of all data extensions if keys are not given"""
+        filters = [None]
+        if customer_keys is not None:
+            filters = [SearchFilter.in_array('DataExtension.CustomerKey', customer_keys[i:i + CATALOG_FIELD_KEYS_CHUNK])
+                       if len(customer_keys[i:i + CATALOG_FIELD_KEYS_CHUNK]) > 1 else
+                       SearchFilter.equals('DataExtension.CustomerKey', customer_keys[i])
+                       for i in range(0, len(customer_keys), CATALOG_FIELD_KEYS_CHUNK)]
+
+        grouped: Dict[str, List[Any]] = {}
+        for f in filters:
+            for field in self._retrieve(DataExtensionFieldHandler, f, self.field_props):
+                grouped.setdefault(_nested_value(field, 'DataExtension', 'CustomerKey'), []).append(field)
+
+        return grouped
+
+    def _index(self, infos: List[DataExtensionInfo]):
+        for info in infos:
+            previous = self._by_key.get(info.customer_key)
+            if previous is not None:
+                self._by_name.pop(previous.name, None)
+                self._by_object_id.pop(previous.object_id, None)
+
+            self._by_key[info.customer_key] = info
+            self._by_name[info.name] = info
+            if info.object_id is not None:
+                self._by_object_id[info.object_id] = info
+
+            if info.modified_date is not None and (self.high_water_mark is None
+                                                   or info.modified_date > self.high_water_mark):
+                self.high_water_mark = info.modified_date
+
+    def load(self):
+        """Load all data extensions and fields, previous index is dropped"""
+        with self._lock:
+            entities = self._retrieve(DataExtensionHandler, None, self.de_props)
+            fields = self._retrieve_fields()
+
+            self._by_name, self._by_key, self._by_object_id = {}, {}, {}
+            self.high_water_mark = None
+            self._index([DataExtensionInfo(e, fields.get(e.CustomerKey)) for e in entities])
+            self.refreshed_at = time.time()
+
+    def refresh(self):
+        """Load data extensions modified since last load, catalog is loaded fully if it was not loaded yet"""
+        with self._lock:
+            if self.refreshed_at is None or self.high_water_mark is None:
+                return self.load()
+
+            started = time.time()
+            m_filter = SearchFilter.greater_than_or_equal('ModifiedDate', self.high_water_mark)
+            entities = self._retrieve(DataExtensionHandler, m_filter, self.de_props)
+            fields = self._retrieve_fields([e.CustomerKey for e in entities]) if entities else {}
+
+            self._index([DataExtensionInfo(e, fields.get(e.CustomerKey)) for e in entities])
+            self.refreshed_at = started
+
+    def ensure_fresh(self):
+        """Load or refresh catalog if it is not loaded or refresh interval is passed"""
+        if self.refreshed_at is None:
+            with self._lock:
+                if self.refreshed_at is None:
+                    self.load()
+        elif self.refresh_interval is not None and time.time() - self.refreshed_at > self.refresh_interval:
+            self.refresh()
+
+    def by_name(self, name: str) -> Optional[DataExtensionInfo]:
+        self.ensure_fresh()
+
+        return self._by_name.get(name)
+
+    def by_key(self, customer_key: str) -> Optional[DataExtensionInfo]:
+        self.ensure_fresh()
+
+        return self._by_key.get(customer_key)
+
+    def by_object_id(self, object_id: str) -> Optional[DataExtensionInfo]:
+        self.ensure_fresh()
+
+        return self._by_object_id.get(object_id)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __repr__(self):
+        return '{}[data_extensions:{},high_water_mark:{}]'.format(self.__class__.__name__, len(self._by_key),
+                                                                  self.high_water_mark)
+
+
+def _nested_value(obj: Any, *path: str) -> Any:
+    """Value of nested property of suds object or plain dict"""
+    for name in path:
+        if obj is None:
+            return None
+        obj = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+    return obj
@@ -1,13 +1,196 @@
-from sfmc.client import ResourceBase, ResourceHandler
+import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+from sfmc.cache import CheckpointFileCache
+from sfmc.client import ResourceBase, ResourceHandler, Entity
+from sfmc.exceptions import ResourceHandlerException
+from sfmc.resources.filter import SearchFilter
 from sfmc.resources.mixins import Gettable
 
+EVENT_DATE_PROPERTY = 'EventDate'
+DEFAULT_SYNC_WINDOW = datetime.timedelta(hours=6)
+DEFAULT_SYNC_MIN_WINDOW = datetime.timedelta(minutes=1)
+DEFAULT_SYNC_MAX_PAGES = 20  # window producing more pages is split in halves
+DEFAULT_SYNC_PARALLELISM = 4
+DEFAULT_SYNC_LAG = datetime.timedelta(minutes=15)  # recent events may be not available yet
+# event dates of SFMC are in system time of account, which is CST (UTC-6) without daylight saving
+DEFAULT_ACCOUNT_UTC_OFFSET = datetime.timedelta(hours=-6)
+
+TimeRange = Tuple[datetime.datetime, datetime.datetime]
+
+
+class EventWindow:
+    """Events of half-open time range [start, end)"""
+
+    def __init__(self, start: datetime.datetime, end: datetime.datetime, pages: List[ResourceBase]):
+        self.start = start
+        self.end = end
+        self.pages = pages
+
+    def __iter__(self) -> Iterator[Entity]:
+        for page in self.pages:
+            yield from page.iter_entities()
+
+    @property
+    def entities_count(self) -> int:
+        return sum(p.entities_count for p in self.pages)
+
+    def __repr__(self):
+        return '{}[start:{},end:{},pages:{}]'.format(self.__class__.__name__, self.start, self.end, len(self.pages))
+
+
+class EventSync:
+    """
+    Incremental retrieve of tracking events by EventDate windows. Time range is split into windows fetched
+    in parallel, window producing more than max_pages pages is dropped and fetched again as two halves.
+    Windows are returned in time order, high-water mark is stored to checkpoint cache after window is consumed,
+    so next sync starts from the end of last consumed window. Works with blocking client only.
+    """
+
+    def __init__(self, handler: ResourceHandler, window: datetime.timedelta = DEFAULT_SYNC_WINDOW,
+                 min_window: datetime.timedelta = DEFAULT_SYNC_MIN_WINDOW, max_pages: int = DEFAULT_SYNC_MAX_PAGES,
+                 parallelism: int = DEFAULT_SYNC_PARALLELISM, lag: datetime.timedelta = DEFAULT_SYNC_LAG,
+                 checkpoints: CheckpointFileCache = None, utc_offset: datetime.timedelta = DEFAULT_ACCOUNT_UTC_OFFSET):
+        """
+        :param handler:     event handler
+        :param window:      initial window length
+        :param min_window:  windows are not split below this length
+        :param max_pages:   max pages of single window
+        :param parallelism: count of concurrently fetched windows
+        :param lag:         default end of range is now minus lag
+        :param checkpoints: high-water mark storage, by default checkpoint cache of client
+        :param utc_offset:  offset of account time zone from UTC, default end of range is taken in this zone
+        """
+        self.handler = handler
+        self.window = window
+        self.min_window = min_window
+        self.max_pages = max_pages
+        self.parallelism = parallelism
+        self.lag = lag
+        self.checkpoints = checkpoints if checkpoints is not None else handler.client.checkpoint_cache
+        self.utc_offset = utc_offset
+
+    @property
+    def checkpoint_key(self) -> str:
+        return '{}|{}'.format(self.handler.client.cache_namespace, self.handler.get_resource_type())
+
+    def load_checkpoint(self) -> datetime.datetime:
+        """High-water mark of previous sync or None"""
+        if self.checkpoints is None:
+            return None
+
+        state = self.checkpoints.load(self.checkpoint_key)
+        if state is None or state.get('high_water_mark') is None:
+            return None
+
+        return datetime.datetime.strptime(state['high_water_mark'], '%Y-%m-%dT%H:%M:%S.%f')
+
+    def store_checkpoint(self, high_water_mark: datetime.datetime):
+        if self.checkpoints is not None:
+            self.checkpoints.store(self.checkpoint_key,
+                                   {'high_water_mark': high_water_mark.strftime('%Y-%m-%dT%H:%M:%S.%f')})
+
+    def default_until(self) -> datetime.datetime:
+        """
+        Now minus lag in time zone of account. Local time of host is not used, host ahead of account zone would
+        store checkpoint in future and events between would be skipped
+        """
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+        return now + self.utc_offset - self.lag
+
+    def split(self, since: datetime.datetime, until: datetime.datetime) -> List[TimeRange]:
+        """Windows covering range"""
+        windows = []
+        start = since
+        while start < until:
+            end = min(start + self.window, until)
+            windows.append((start, end))
+            start = end
+
+        return windows
+
+    @staticmethod
+    def window_filter(start: datetime.datetime, end: datetime.datetime) -> SearchFilter:
+        return SearchFilter.both(SearchFilter.greater_than_or_equal(EVENT_DATE_PROPERTY, start),
+                                 SearchFilter.less_than(EVENT_DATE_PROPERTY, end))
+
+    def fetch(self, start: datetime.datetime, end: datetime.datetime, m_props: list = None) -> List[EventWindow]:
+        """All pages of window, window is split if it has too many pages"""
+        res = self.handler.get(m_filter=self.window_filter(start, end), m_props=m_props)
+        if not res.is_valid:
+            raise ResourceHandlerException('Can not retrieve {} of [{}, {}): invalid response[{}]'.format(
+                self.handler.get_resource_type(), start, end, res))
+
+        pages = [res]
+        while pages[-1].has_more_results:
+            if len(pages) >= self.max_pages and end - start > self.min_window:
+                middle = start + (end - start) / 2
+                return self.fetch(start, middle, m_props) + self.fetch(middle, end, m_props)
+
+            pages.append(pages[-1].get_more_results())
+
+        return [EventWindow(start, end, pages)]
+
+    def run(self, since: datetime.datetime = None, until: datetime.datetime = None,
+            m_props: list = None) -> Iterator[EventWindow]:
+        """
+        Fetch events of range
+        :param since:   range start, by default stored high-water mark
+        :param until:   range end, by default now minus lag in time zone of account. Dates are compared as is,
+                        in time zone of account
+        :param m_props: retrieved props
+        :return: windows in time order
+        """
+        if since is None:
+            since = self.load_checkpoint()
+            if since is None:
+                raise ValueError('since is required for first sync of {}'.format(self.handler.get_resource_type()))
+
+        if until is None:
+            until = self.default_until()
+
+        windows = iter(self.split(since, until))
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            pending = deque(executor.submit(self.fetch, s, e, m_props) for s, e in islice(windows, self.parallelism))
+            try:
+                while pending:
+                    future = pending.popleft()
+                    following = next(windows, None)
+                    if following is not None:
+                        pending.append(executor.submit(self.fetch, following[0], following[1], m_props))
+
+                    for window in future.result():
+                        yield window
+                        self.store_checkpoint(window.end)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+class EventSyncable:
+    def sync(self, since: datetime.datetime = None, until: datetime.datetime = None, m_props: list = None,
+             **options) -> Iterator[EventWindow]:
+        """
+        Incremental sync of events, see EventSync
+        :param since:   range start, by default end of last synced window
+        :param until:   range end, by default now minus lag
+        :param m_props: retrieved props
+        :param options: EventSync options: window, min_window, max_pages, parallelism, lag, checkpoints, utc_offset
+        :return: windows of events in time order
+        """
+        return EventSync(self, **options).run(since, until, m_props)
+
 
 class BounceEventResource(ResourceBase):
     """Resource wrapper for BounceEvent entities"""
     pass
 
 
-class BounceEventHandler(ResourceHandler, Gettable):
+class BounceEventHandler(ResourceHandler, Gettable, EventSyncable):
     """BounceEvent handler"""
     resource_type = 'BounceEvent'
     resource_base = BounceEventResource
@@ -18,7 +201,7 @@ class SentEventResource(ResourceBase):
     pass
 
 
-class SentEventHandler(ResourceHandler, Gettable):
+class SentEventHandler(ResourceHandler, Gettable, EventSyncable):
     """SentEvent handler"""
     resource_type = 'SentEvent'
     resource_base = SentEventResource
@@ -29,7 +212,7 @@ class SMSMTEventResource(ResourceBase):
     pass
 
 
-class SMSMTEventHandler(ResourceHandler, Gettable):
+class SMSMTEventHandler(ResourceHandler, Gettable, EventSyncable):
     """SMSMTEvent handler"""
     resource_type = 'SMSMTEvent'
     resource_base = SMSMTEventResource
@@ -40,7 +223,7 @@ class SMSMOEventResource(ResourceBase):
     pass
 
 
-class SMSMOEventHandler(ResourceHandler, Gettable):
+class SMSMOEventHandler(ResourceHandler, Gettable, EventSyncable):
     """SMSMOEvent handler"""
     resource_type = 'SMSMOEvent'
     resource_base = SMSMOEventResource
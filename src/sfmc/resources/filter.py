@@ -25,7 +25,7 @@ class LogicalOperator:
 class SearchFilter:
 
     def __init__(self, property_name=None, simple_operator=None, value=None, value_type=None, logical_operator=None,
-                 left_operand=None, right_operand=None):
+                 left_operand=None, right_operand=None, additional_operands=None):
         self.property_name = property_name
         self.simple_operator = simple_operator
         self.value_type = value_type
@@ -33,6 +33,7 @@ class SearchFilter:
         self.logical_operator = logical_operator
         self.left_operand = left_operand
         self.right_operand = right_operand
+        self.additional_operands = additional_operands or []
 
     def payload(self):
         data = None
@@ -42,6 +43,9 @@ class SearchFilter:
                 'LogicalOperator': self.logical_operator,
                 'RightOperand': self.right_operand.payload()
             }
+
+            if self.additional_operands:
+                data['AdditionalOperands'] = [o.payload() for o in self.additional_operands]
         else:
             data = {
                 'Property': self.property_name,
@@ -54,19 +58,22 @@ class SearchFilter:
         return data
 
     @classmethod
-    def __complex_filter(cls, operator, left, right):
-        if not isinstance(left, cls) or not isinstance(right, cls):
-            raise TypeError('All operands must be instance of {} class'.format(cls.__class__.__name__))
+    def __complex_filter(cls, operator, left, right, others):
+        others = list(others)
+        if not all(isinstance(o, cls) for o in [left, right] + others):
+            raise TypeError('All operands must be instance of {} class'.format(cls.__name__))
 
-        return cls(logical_operator=operator, left_operand=left, right_operand=right)
+        return cls(logical_operator=operator, left_operand=left, right_operand=right, additional_operands=others)
 
     @classmethod
-    def both(cls, left, right):
-        return cls.__complex_filter(LogicalOperator.AND, left, right)
+    def both(cls, left, right, *others):
+        """All of operands are true, operands after the second one are sent as AdditionalOperands"""
+        return cls.__complex_filter(LogicalOperator.AND, left, right, others)
 
     @classmethod
-    def one_from(cls, left, right):
-        return cls.__complex_filter(LogicalOperator.OR, left, right)
+    def one_from(cls, left, right, *others):
+        """Any of operands is true, operands after the second one are sent as AdditionalOperands"""
+        return cls.__complex_filter(LogicalOperator.OR, left, right, others)
 
     @classmethod
     def __simple_filter(cls, operator, property_name, value=None):
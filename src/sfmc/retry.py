@@ -0,0 +1,128 @@
+"""
+Retry policy of soap calls. Failures are classified by reason, transient ones are retried with jittered
+exponential backoff, expired token is refreshed before retry.
+"""
+
+import random
+from typing import Optional, Tuple
+
+import requests
+
+from sfmc.exceptions import HTTPStatusError
+
+DEFAULT_RETRY_ATTEMPTS = 3  # attempts of single call including first one
+DEFAULT_RETRY_BACKOFF = 1  # seconds, delay before first retry
+DEFAULT_RETRY_BACKOFF_MAX = 60  # seconds
+THROTTLED_BACKOFF_FACTOR = 4  # throttled calls wait longer than other transient failures
+
+RETRY_CONNECTION = 'connection'
+RETRY_SERVER = 'server'
+RETRY_THROTTLED = 'throttled'
+RETRY_AUTH = 'auth'
+
+"""Operations safe to repeat, writes are repeated only if they were rejected before processing"""
+IDEMPOTENT_OPERATIONS = frozenset(['Retrieve', 'ContinueRetrieve', 'Describe'])
+
+# lowercased fragments of fault strings and OverallStatus
+THROTTLED_MARKERS = ('throttl', 'too many', 'too busy', 'toobusy', 'rate limit', 'concurrent request')
+AUTH_MARKERS = ('token expired', 'expired token', 'login failed', 'not authorized', 'unauthorized',
+                'security requirements')
+TRANSIENT_MARKERS = ('timeout', 'timed out', 'temporarily', 'unavailable', 'try again')
+
+
+def _match(text: str, markers: Tuple[str, ...]) -> bool:
+    return any(m in text for m in markers)
+
+
+class RetryPolicy:
+    """Decide whether failed call is repeated and how long to wait before it"""
+
+    def __init__(self, attempts: int = DEFAULT_RETRY_ATTEMPTS, backoff: float = DEFAULT_RETRY_BACKOFF,
+                 backoff_max: float = DEFAULT_RETRY_BACKOFF_MAX, retry_writes: bool = False):
+        """
+        :param attempts:        max attempts of single call, 1 disables retries
+        :param backoff:         delay before first retry in seconds, doubled for every next one
+        :param backoff_max:     max delay in seconds
+        :param retry_writes:    retry Create/Update/Delete on any transient failure, not only rejected ones.
+                                Objects may be written twice if reply of processed request is lost
+        """
+        self.attempts = attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.retry_writes = retry_writes
+
+    def classify_text(self, text: str, status_code: int = None) -> Optional[str]:
+        """Reason of failure by fault string or OverallStatus, None if failure is not transient"""
+        text = (text or '').lower()
+
+        if status_code == 429 or _match(text, THROTTLED_MARKERS):
+            return RETRY_THROTTLED
+
+        if status_code == 401 or _match(text, AUTH_MARKERS):
+            return RETRY_AUTH
+
+        if _match(text, TRANSIENT_MARKERS):
+            return RETRY_SERVER
+
+        return None
+
+    def classify_error(self, error: Exception, connection_errors: Tuple[type, ...] = ()) -> Optional[str]:
+        """
+        Reason of failure by raised error
+        :param error:               raised error
+        :param connection_errors:   additional error types of network failures
+        """
+        if isinstance(error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)
+                      + tuple(connection_errors)):
+            return RETRY_CONNECTION
+
+        if isinstance(error, HTTPStatusError):
+            reason = self.classify_text(str(error), error.status_code)
+            if reason is None and error.status_code >= 500:
+                return RETRY_SERVER
+
+            return reason
+
+        return None
+
+    def classify_response(self, response) -> Optional[str]:
+        """Reason of failure by client response, None for successful response"""
+        if response.is_valid:
+            return None
+
+        if response.code is not None and response.code != 200:
+            reason = self.classify_text(response.fault, response.code)
+            if reason is None and response.fault is None and response.code >= 500:  # gateway error, not a fault
+                return RETRY_SERVER
+
+            return reason
+
+        return self.classify_text(response.message)
+
+    def should_retry(self, operation: str, reason: Optional[str], attempt: int) -> bool:
+        """
+        :param operation:   soap operation name
+        :param reason:      reason of failure
+        :param attempt:     number of failed attempt, starting from 1
+        """
+        if reason is None or attempt >= self.attempts:
+            return False
+
+        if operation in IDEMPOTENT_OPERATIONS or self.retry_writes:
+            return True
+
+        return reason in (RETRY_THROTTLED, RETRY_AUTH)
+
+    def delay(self, reason: str, attempt: int) -> float:
+        """Seconds to wait before next attempt, half of backoff is random so concurrent callers spread out"""
+        if reason == RETRY_AUTH:
+            return 0
+
+        backoff = self.backoff * (THROTTLED_BACKOFF_FACTOR if reason == RETRY_THROTTLED else 1)
+        cap = min(self.backoff_max, backoff * 2 ** (attempt - 1))
+
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def __repr__(self):
+        return '{}[attempts:{},backoff:{},backoff_max:{},retry_writes:{}]'.format(
+            self.__class__.__name__, self.attempts, self.backoff, self.backoff_max, self.retry_writes)
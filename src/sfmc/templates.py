@@ -0,0 +1,148 @@
+"""
+Prebuilt request payloads. suds factory.create resolves schema type and builds object field by field on every call,
+so object of every type is built once and copied for every request. Templates are shared by pooled soap clients,
+so suds factory is used under lock and only while template is missing. Retrieve requests are built once per object
+type, props and filter shape, only filter values are bound per call.
+"""
+
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from suds.sudsobject import Object as SudsObject
+
+DEFAULT_MAX_RETRIEVE_TEMPLATES = 1024
+
+# keys of simple filter part payload which are not values
+FILTER_PART_KEYS = ('Property', 'SimpleOperator')
+
+
+def clone(value: Any) -> Any:
+    """Copy of suds object, nested objects and lists are copied, other values and metadata are shared"""
+    if isinstance(value, SudsObject):
+        copy = value.__class__.__new__(value.__class__)
+        values = dict(value.__dict__)
+        keylist = values['__keylist__'] = list(values['__keylist__'])
+        for k in keylist:
+            values[k] = clone(values[k])
+        copy.__dict__.update(values)
+
+        return copy
+
+    if value.__class__ is list:
+        return [clone(v) for v in value]
+
+    return value
+
+
+def filter_shape(filter_payload: Mapping[str, Any]) -> tuple:
+    """Structure of search filter payload without values, filters of the same shape share request template"""
+    if 'LogicalOperator' in filter_payload:
+        return (filter_payload['LogicalOperator'], filter_shape(filter_payload['LeftOperand']),
+                filter_shape(filter_payload['RightOperand']),
+                tuple(filter_shape(o) for o in filter_payload.get('AdditionalOperands', [])))
+
+    return (filter_payload.get('Property'), filter_payload.get('SimpleOperator'),
+            tuple(k for k in filter_payload if k not in FILTER_PART_KEYS))
+
+
+class RequestTemplates:
+    """Request payloads of single wsdl"""
+
+    def __init__(self, factory, max_retrieve_templates: int = DEFAULT_MAX_RETRIEVE_TEMPLATES):
+        """
+        :param factory:                 suds factory of wsdl
+        :param max_retrieve_templates:  cached retrieve requests, cache is dropped when it is exceeded
+        """
+        self.factory = factory
+        self.max_retrieve_templates = max_retrieve_templates
+        self._prototypes: Dict[str, Any] = {}
+        self._retrieve_requests: Dict[Tuple[str, Tuple[str, ...], Optional[tuple]], Any] = {}
+        self._lock = threading.Lock()
+
+    def _prototype(self, type_name: str) -> Any:
+        prototype = self._prototypes.get(type_name)
+        if prototype is None:
+            with self._lock:
+                prototype = self._prototypes.get(type_name)
+                if prototype is None:
+                    prototype = self._prototypes[type_name] = self.factory.create(type_name)
+
+        return prototype
+
+    def create(self, type_name: str) -> Any:
+        """Empty object of wsdl type, same as factory.create"""
+        return clone(self._prototype(type_name))
+
+    def object_keys(self, type_name: str) -> Tuple[str, ...]:
+        """Properties of wsdl type in schema order"""
+        return tuple(self._prototype(type_name).__keylist__)
+
+    def filter_part(self, filter_payload: Mapping[str, Any]) -> Any:
+        """
+        Filter part of search filter payload, complex parts are built recursively into nested ComplexFilterPart
+        :param filter_payload: SearchFilter payload
+        :return: SimpleFilterPart or ComplexFilterPart object
+        """
+        if 'LogicalOperator' in filter_payload:
+            filter_part = self.create('ComplexFilterPart')
+            filter_part.LeftOperand = self.filter_part(filter_payload['LeftOperand'])
+            filter_part.RightOperand = self.filter_part(filter_payload['RightOperand'])
+            filter_part.LogicalOperator = filter_payload['LogicalOperator']
+            for additional_operand in filter_payload.get('AdditionalOperands', []):
+                filter_part.AdditionalOperands.Operand.append(self.filter_part(additional_operand))
+
+            return filter_part
+
+        filter_part = self.create('SimpleFilterPart')
+        for k, v in filter_payload.items():
+            if k in filter_part:
+                filter_part[k] = v
+
+        return filter_part
+
+    @classmethod
+    def bind_filter(cls, filter_part: Any, filter_payload: Mapping[str, Any]):
+        """Set values of filter payload into filter part of the same shape"""
+        if 'LogicalOperator' in filter_payload:
+            cls.bind_filter(filter_part.LeftOperand, filter_payload['LeftOperand'])
+            cls.bind_filter(filter_part.RightOperand, filter_payload['RightOperand'])
+            operands = filter_payload.get('AdditionalOperands', [])
+            for part, payload in zip(filter_part.AdditionalOperands.Operand, operands):
+                cls.bind_filter(part, payload)
+            return
+
+        for k, v in filter_payload.items():
+            if k not in FILTER_PART_KEYS and k in filter_part:
+                filter_part[k] = v
+
+    def retrieve_request(self, obj_type: str, props: List[str], filter_payload: Mapping[str, Any] = None) -> Any:
+        """
+        RetrieveRequest with filter, request skeleton is built once per object type, props and filter shape
+        :param obj_type:        requested object type
+        :param props:           requested object fields
+        :param filter_payload:  SearchFilter payload or None
+        """
+        key = (obj_type, tuple(props), None if filter_payload is None else filter_shape(filter_payload))
+        template = self._retrieve_requests.get(key)
+
+        if template is None:
+            template = self.create('RetrieveRequest')
+            template.ObjectType = obj_type
+            template.Properties = list(props)
+            if filter_payload is not None:
+                template.Filter = self.filter_part(filter_payload)
+
+            with self._lock:
+                if len(self._retrieve_requests) >= self.max_retrieve_templates:
+                    self._retrieve_requests.clear()
+                self._retrieve_requests[key] = template
+
+        request = clone(template)
+        if filter_payload is not None:
+            self.bind_filter(request.Filter, filter_payload)
+
+        return request
+
+    def __repr__(self):
+        return '{}[types:{},retrieve_requests:{}]'.format(self.__class__.__name__, len(self._prototypes),
+                                                          len(self._retrieve_requests))
@@ -1,39 +1,22 @@
 """Helpful funcs"""
 
-import datetime
+from sfmc.converter import get_converter
 
 
 def sobject_to_dict(obj, key_to_lower=False, json_serialize=False):
     """
     Converts a suds object to a dict.
+    Conversion is done by shared converter compiled per suds type, see sfmc.converter.Converter
     :param json_serialize: If set, changes date and time types to iso string.
     :param key_to_lower: If set, changes index key name to lower case.
     :param obj: suds object
     :return: dict object
     """
+    return get_converter(key_to_lower, json_serialize).convert(obj)
 
-    if not hasattr(obj, '__keylist__'):
-        if json_serialize and isinstance(obj, (datetime.datetime, datetime.time, datetime.date)):
-            return obj.isoformat()
-        else:
-            return obj
-    data = {}
-    fields = obj.__keylist__
-    for field in fields:
-        val = getattr(obj, field)
-        if key_to_lower:
-            field = field.lower()
-        if isinstance(val, list):
-            data[field] = []
-            for item in val:
-                data[field].append(sobject_to_dict(item, json_serialize=json_serialize))
-        else:
-            data[field] = sobject_to_dict(val, json_serialize=json_serialize)
-    return data
-
-
-def suds_results_to_simple_types(results):
-    return [sobject_to_dict(d) for d in results]
+
+def suds_results_to_simple_types(results, json_serialize=False):
+    return get_converter(json_serialize=json_serialize).convert_many(results)
 
 
 def check_required_keys(params, required, pass_empty=True):
@@ -88,3 +71,54 @@ def any_keys_not_none(d: dict, required: list):
         return True
 
     return 0 < passed < len(required)
+
+
+def estimate_payload_size(obj, tag: str = '') -> int:
+    """
+    Rough size in bytes of object serialized to soap xml: every value is wrapped into
+    prefixed open and close tags of its key
+    :param obj: dict, list or scalar value
+    :param tag: key of the value
+    :return: estimated size
+    """
+    overhead = 2 * len(tag) + 13 if tag else 0  # <ns0:tag></ns0:tag>
+
+    if isinstance(obj, dict):
+        return overhead + sum(estimate_payload_size(v, k) for k, v in obj.items())
+
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_payload_size(i, tag) for i in obj)
+
+    if obj is None:
+        return overhead
+
+    return overhead + len(str(obj))
+
+
+def chunked(items: list, max_count: int = None, max_bytes: int = None, size_of=estimate_payload_size):
+    """
+    Split items into chunks bounded by items count and estimated size.
+    Single item bigger than max_bytes forms own chunk.
+    :param items:       items to split
+    :param max_count:   max items in chunk, None - unbounded
+    :param max_bytes:   max estimated chunk size, None - unbounded
+    :param size_of:     item size estimator
+    :return: generator of lists
+    """
+    chunk = []
+    chunk_size = 0
+
+    for item in items:
+        item_size = size_of(item) if max_bytes is not None else 0
+
+        if chunk and ((max_count is not None and len(chunk) >= max_count)
+                      or (max_bytes is not None and chunk_size + item_size > max_bytes)):
+            yield chunk
+            chunk = []
+            chunk_size = 0
+
+        chunk.append(item)
+        chunk_size += item_size
+
+    if chunk:
+        yield chunk
@@ -1,8 +1,11 @@
 import os
+import shutil
+import tempfile
 import unittest
 import json
 
-from sfmc import Client, client_factory
+from sfmc import Client, ClientFactory, client_factory, handlers
+from tests.server import StandInServer, StandInState
 
 INCLUDE_LONG_TESTS = bool(os.getenv('LONG_TESTS', False))
 ALLOW_BASED_ON_INTERNAL_CREDS_TESTS = bool(os.getenv('ALLOW_INTERNAL', False))
@@ -30,3 +33,39 @@ class TestCase(unittest.TestCase):
         client_factory.set_params(creds)
 
         return client_factory.make()
+
+
+class StandInTestCase(unittest.TestCase):
+    """
+    Base class for tests running against local stand-in server, no credentials required
+    """
+
+    state: StandInState = None
+    server: StandInServer = None
+    tmp_dir: str = None
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        """Synthetic account data served to tests of the class"""
+        return StandInState()
+
+    @classmethod
+    def setUpClass(cls):
+        cls.state = cls.make_state()
+        cls.server = StandInServer(cls.state).start()
+        cls.tmp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def make_client_factory(self, params: dict = None) -> ClientFactory:
+        factory = ClientFactory()
+        factory.bind_resources(handlers)
+        factory.set_params(self.server.client_params(os.path.join(self.tmp_dir, 'etframework.wsdl')))
+
+        if params is not None:
+            factory.set_params(params)
+
+        return factory
@@ -0,0 +1,265 @@
+"""
+Throughput benchmarks against local stand-in server, no credentials required.
+
+Every benchmark is a callable repeated given count of times, it returns count of processed rows.
+Reported are rows per second, p50/p99 latency of single call and peak traced memory.
+
+Usage:
+    python -m tests.benchmark
+    python -m tests.benchmark --rows 50000 --page-size 2500 --latency 0.05 --only pagination,add --json out.json
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from sfmc import ClientFactory, handlers
+from sfmc.resources.data_extension import row_payload
+from sfmc.util import sobject_to_dict
+from tests.server import StandInServer, StandInState
+
+FIELDS = ['C_ID', 'C_NAME', 'C_EMAIL', 'C_DATE']
+READ_DE = 'bench_read'
+WRITE_DE = 'bench_write'
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest rank percentile, q in [0, 100]"""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(1, int(math.ceil(q / 100 * len(ordered))))
+
+    return ordered[rank - 1]
+
+
+def make_row(i: int) -> Dict[str, str]:
+    return {'C_ID': str(i), 'C_NAME': 'name {}'.format(i), 'C_EMAIL': '{}@example.com'.format(i),
+            'C_DATE': '2020-01-01T00:00:00'}
+
+
+class BenchmarkResult:
+    """Measurements of repeated benchmark calls"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.durations: List[float] = []
+        self.peak_memory = 0  # bytes
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.total if self.total > 0 else 0.0
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.durations, 50)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.durations, 99)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'calls': len(self.durations), 'rows': self.rows,
+                'rows_per_second': self.rows_per_second, 'p50': self.p50, 'p99': self.p99,
+                'peak_memory': self.peak_memory}
+
+    def __repr__(self):
+        return '{}[name:{},calls:{},rows:{},rows_per_second:{:.0f},p50:{:.4f}s,p99:{:.4f}s,peak_memory:{}]'.format(
+            self.__class__.__name__, self.name, len(self.durations), self.rows, self.rows_per_second, self.p50,
+            self.p99, self.peak_memory)
+
+
+def measure(name: str, fn: Callable[[], int], repeat: int) -> BenchmarkResult:
+    """Call fn repeat times, memory is traced for the whole run"""
+    result = BenchmarkResult(name)
+
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = fn()
+            result.durations.append(time.perf_counter() - started)
+            result.rows += rows
+        result.peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return result
+
+
+class Benchmarks:
+    """Benchmarks of client against stand-in server serving synthetic data extensions"""
+
+    names = ['startup', 'soap_get', 'pagination', 'pagination_processes', 'sobject_to_dict', 'add', 'add_direct']
+
+    def __init__(self, rows: int = 10000, page_size: int = 2500, latency: float = 0.0, repeat: int = 5,
+                 write_rows: int = 2500):
+        """
+        :param rows:        rows of retrieved data extension
+        :param page_size:   rows of single Retrieve reply, next pages are marked by MoreDataAvailable
+        :param latency:     server latency of every soap call in seconds
+        :param repeat:      calls of every benchmark
+        :param write_rows:  rows written by single add call
+        """
+        self.rows = rows
+        self.repeat = repeat
+        self.write_rows = write_rows
+        self.state = StandInState(page_size=page_size, latency=latency)
+        self.state.add_data_extension(READ_DE, READ_DE + '-key', FIELDS, ['C_ID'], [make_row(i) for i in range(rows)])
+        self.state.add_data_extension(WRITE_DE, WRITE_DE + '-key', FIELDS, ['C_ID'])
+        self.server: StandInServer = None
+        self.tmp_dir: str = None
+        self._ids = itertools.count()
+
+    def __enter__(self) -> 'Benchmarks':
+        self.server = StandInServer(self.state).start()
+        self.tmp_dir = tempfile.mkdtemp()
+
+        return self
+
+    def __exit__(self, *args):
+        self.server.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_client(self, params: dict = None):
+        factory = ClientFactory()
+        factory.bind_resources(handlers)
+        factory.set_params(self.server.client_params(os.path.join(self.tmp_dir, 'etframework.wsdl')))
+        if params is not None:
+            factory.set_params(params)
+
+        return factory.make()
+
+    def bench_startup(self) -> Callable[[], int]:
+        """Client factory make, wsdl is parsed once and loaded from cache after that"""
+        def run():
+            self.make_client()
+            return 0
+
+        return run
+
+    def bench_soap_get(self) -> Callable[[], int]:
+        """Single Retrieve call of first page"""
+        client = self.make_client()
+
+        def run():
+            return client.soap_get('DataExtensionObject[{}]'.format(READ_DE), props=FIELDS).results_count()
+
+        return run
+
+    def bench_pagination(self) -> Callable[[], int]:
+        """Iteration over all rows by ResourceBase.__iter__, next pages are requested along with iteration"""
+        client = self.make_client()
+
+        def run():
+            resource = client.DataExtensionRow.set_name(READ_DE).get(m_props=FIELDS)
+            return sum(1 for _ in resource)
+
+        return run
+
+    def bench_pagination_processes(self) -> Callable[[], int]:
+        """Iteration over all rows of streamed pages parsed by process pool, see ResourceBase.process_pool"""
+        client = self.make_client({'stream_results': True})
+
+        def run():
+            resource = client.DataExtensionRow.set_name(READ_DE).get(m_props=FIELDS)
+            with resource.process_pool(converter=row_payload) as rows:
+                return sum(1 for _ in rows)
+
+        return run
+
+    def bench_sobject_to_dict(self) -> Callable[[], int]:
+        """Conversion of suds results of first page into dicts"""
+        client = self.make_client()
+        results = client.soap_get('DataExtensionObject[{}]'.format(READ_DE), props=FIELDS, stream=False).results
+
+        def run():
+            for r in results:
+                sobject_to_dict(r)
+            return len(results)
+
+        return run
+
+    def _bench_add(self, params: dict = None) -> Callable[[], int]:
+        handler = self.make_client(params).DataExtensionRow.set_name(WRITE_DE).set_customer_key(WRITE_DE + '-key')
+
+        def run():
+            rows = [make_row(next(self._ids)) for _ in range(self.write_rows)]
+            handler.add(rows)
+            return len(rows)
+
+        return run
+
+    def bench_add(self) -> Callable[[], int]:
+        """DataExtensionRowHandler.add of write_rows rows, objects are marshalled by suds"""
+        return self._bench_add()
+
+    def bench_add_direct(self) -> Callable[[], int]:
+        """DataExtensionRowHandler.add of write_rows rows, objects are rendered directly, see direct_write_types"""
+        return self._bench_add({'direct_write_types': 'DataExtensionObject'})
+
+    def run(self, names: List[str] = None) -> List[BenchmarkResult]:
+        """Run benchmarks in order of names, by default all of them"""
+        results = []
+        for name in names or self.names:
+            if name not in self.names:
+                raise ValueError('Unknown benchmark {}, expected one of {}'.format(name, self.names))
+
+            fn = getattr(self, 'bench_' + name)()
+            results.append(measure(name, fn, self.repeat))
+
+        return results
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines = ['{:<18}{:>8}{:>12}{:>14}{:>12}{:>12}{:>14}'.format(
+        'benchmark', 'calls', 'rows', 'rows/s', 'p50, ms', 'p99, ms', 'peak mem, KB')]
+    for r in results:
+        lines.append('{:<18}{:>8}{:>12}{:>14.0f}{:>12.2f}{:>12.2f}{:>14.0f}'.format(
+            r.name, len(r.durations), r.rows, r.rows_per_second, r.p50 * 1000, r.p99 * 1000, r.peak_memory / 1024))
+
+    return '\n'.join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    """Console entry point, see module docs"""
+    parser = argparse.ArgumentParser(prog='python -m tests.benchmark', description='Benchmarks of sfmc client')
+    parser.add_argument('--rows', type=int, default=10000, help='rows of retrieved data extension')
+    parser.add_argument('--page-size', type=int, default=2500, help='rows of single Retrieve reply')
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency of soap call in seconds')
+    parser.add_argument('--repeat', type=int, default=5, help='calls of every benchmark')
+    parser.add_argument('--write-rows', type=int, default=2500, help='rows written by single add call')
+    parser.add_argument('--only', help='comma separated benchmarks, one of {}'.format(','.join(Benchmarks.names)))
+    parser.add_argument('--json', help='write results into json file')
+    args = parser.parse_args(argv)
+
+    names = args.only.split(',') if args.only else None
+    with Benchmarks(rows=args.rows, page_size=args.page_size, latency=args.latency, repeat=args.repeat,
+                    write_rows=args.write_rows) as benchmarks:
+        results = benchmarks.run(names)
+
+    sys.stdout.write(format_results(results) + '\n')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([r.as_dict() for r in results], f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
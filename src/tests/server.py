@@ -0,0 +1,897 @@
+"""
+Local stand-in for the ExactTarget SOAP and auth services.
+
+Serves a reduced partner API wsdl, token and endpoint discovery routes and synthetic
+Retrieve/Create/Update/Delete/Describe responses, so client code can be exercised
+without credentials and a live account.
+"""
+
+import json
+import time
+import threading
+import uuid
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, List, Mapping, Tuple
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+NS_SOAP = 'http://schemas.xmlsoap.org/soap/envelope/'
+NS_PARTNER = 'http://exacttarget.com/wsdl/partnerAPI'
+NS_XSI = 'http://www.w3.org/2001/XMLSchema-instance'
+
+WSDL_PATH = '/etframework.wsdl'
+AUTH_PATH = '/v1/requestToken'
+ENDPOINTS_PATH = '/platform/v1/endpoints/soap'
+SERVICE_PATH = '/Service.asmx'
+
+WSDL_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:tns="http://exacttarget.com/wsdl/partnerAPI"
+             targetNamespace="http://exacttarget.com/wsdl/partnerAPI" name="PartnerAPI">
+  <types>
+    <xsd:schema elementFormDefault="qualified" targetNamespace="http://exacttarget.com/wsdl/partnerAPI">
+      <xsd:complexType name="ClientID">
+        <xsd:sequence>
+          <xsd:element name="ClientID" type="xsd:int" minOccurs="0"/>
+          <xsd:element name="ID" type="xsd:int" minOccurs="0"/>
+          <xsd:element name="PartnerClientKey" type="xsd:string" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="APIProperty">
+        <xsd:sequence>
+          <xsd:element name="Name" type="xsd:string"/>
+          <xsd:element name="Value" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="APIObject" abstract="true">
+        <xsd:sequence>
+          <xsd:element name="Client" type="tns:ClientID" minOccurs="0"/>
+          <xsd:element name="PartnerKey" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="CreatedDate" type="xsd:dateTime" minOccurs="0"/>
+          <xsd:element name="ModifiedDate" type="xsd:dateTime" minOccurs="0" nillable="true"/>
+          <xsd:element name="ID" type="xsd:int" minOccurs="0"/>
+          <xsd:element name="ObjectID" type="xsd:string" minOccurs="0" nillable="true"/>
+          <xsd:element name="CustomerKey" type="xsd:string" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="ObjectExtension">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="Type" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="Properties" minOccurs="0">
+                <xsd:complexType>
+                  <xsd:sequence>
+                    <xsd:element name="Property" type="tns:APIProperty" minOccurs="0" maxOccurs="unbounded"/>
+                  </xsd:sequence>
+                </xsd:complexType>
+              </xsd:element>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="DataExtensionObject">
+        <xsd:complexContent>
+          <xsd:extension base="tns:ObjectExtension">
+            <xsd:sequence>
+              <xsd:element name="Name" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="Keys" minOccurs="0">
+                <xsd:complexType>
+                  <xsd:sequence>
+                    <xsd:element name="Key" type="tns:APIProperty" minOccurs="0" maxOccurs="unbounded"/>
+                  </xsd:sequence>
+                </xsd:complexType>
+              </xsd:element>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="DataExtension">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="Name" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="Description" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="IsSendable" type="xsd:boolean" minOccurs="0"/>
+              <xsd:element name="CategoryID" type="xsd:long" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="DataExtensionField">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="Name" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="FieldType" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="MaxLength" type="xsd:int" minOccurs="0"/>
+              <xsd:element name="IsPrimaryKey" type="xsd:boolean" minOccurs="0"/>
+              <xsd:element name="IsRequired" type="xsd:boolean" minOccurs="0"/>
+              <xsd:element name="Ordinal" type="xsd:int" minOccurs="0"/>
+              <xsd:element name="DataExtension" type="tns:DataExtension" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="Subscriber">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="EmailAddress" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="SubscriberKey" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="Status" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="Email">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="Name" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="Subject" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="TriggeredSendDefinition">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="Name" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="TriggeredSendStatus" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="Account">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="AccountType" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="ParentID" type="xsd:int" minOccurs="0"/>
+              <xsd:element name="Name" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="BusinessUnit">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Account">
+            <xsd:sequence>
+              <xsd:element name="Description" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="TrackingEvent">
+        <xsd:complexContent>
+          <xsd:extension base="tns:APIObject">
+            <xsd:sequence>
+              <xsd:element name="SendID" type="xsd:int" minOccurs="0"/>
+              <xsd:element name="SubscriberKey" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="EventDate" type="xsd:dateTime" minOccurs="0"/>
+              <xsd:element name="EventType" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="BatchID" type="xsd:int" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="SentEvent">
+        <xsd:complexContent>
+          <xsd:extension base="tns:TrackingEvent"/>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="BounceEvent">
+        <xsd:complexContent>
+          <xsd:extension base="tns:TrackingEvent">
+            <xsd:sequence>
+              <xsd:element name="BounceCategory" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="FilterPart" abstract="true"/>
+      <xsd:complexType name="SimpleFilterPart">
+        <xsd:complexContent>
+          <xsd:extension base="tns:FilterPart">
+            <xsd:sequence>
+              <xsd:element name="Property" type="xsd:string"/>
+              <xsd:element name="SimpleOperator" type="xsd:string"/>
+              <xsd:element name="Value" type="xsd:string" minOccurs="0" maxOccurs="unbounded"/>
+              <xsd:element name="DateValue" type="xsd:dateTime" minOccurs="0" maxOccurs="unbounded"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="ComplexFilterPart">
+        <xsd:complexContent>
+          <xsd:extension base="tns:FilterPart">
+            <xsd:sequence>
+              <xsd:element name="LeftOperand" type="tns:FilterPart"/>
+              <xsd:element name="LogicalOperator" type="xsd:string"/>
+              <xsd:element name="RightOperand" type="tns:FilterPart" minOccurs="0"/>
+              <xsd:element name="AdditionalOperands" minOccurs="0">
+                <xsd:complexType>
+                  <xsd:sequence>
+                    <xsd:element name="Operand" type="tns:FilterPart" minOccurs="0" maxOccurs="unbounded"/>
+                  </xsd:sequence>
+                </xsd:complexType>
+              </xsd:element>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="SaveOption">
+        <xsd:sequence>
+          <xsd:element name="PropertyName" type="xsd:string"/>
+          <xsd:element name="SaveAction" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="Options">
+        <xsd:sequence>
+          <xsd:element name="Client" type="tns:ClientID" minOccurs="0"/>
+          <xsd:element name="RequestType" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="QueuePriority" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="SaveOptions" minOccurs="0">
+            <xsd:complexType>
+              <xsd:sequence>
+                <xsd:element name="SaveOption" type="tns:SaveOption" minOccurs="0" maxOccurs="unbounded"/>
+              </xsd:sequence>
+            </xsd:complexType>
+          </xsd:element>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="RetrieveOptions">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Options">
+            <xsd:sequence>
+              <xsd:element name="BatchSize" type="xsd:int" minOccurs="0"/>
+              <xsd:element name="IncludeObjects" type="xsd:boolean" minOccurs="0"/>
+              <xsd:element name="OnlyIncludeBase" type="xsd:boolean" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="CreateOptions">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Options"/>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="UpdateOptions">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Options">
+            <xsd:sequence>
+              <xsd:element name="Action" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="DeleteOptions">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Options"/>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="RetrieveRequest">
+        <xsd:sequence>
+          <xsd:element name="ClientIDs" type="tns:ClientID" minOccurs="0" maxOccurs="unbounded"/>
+          <xsd:element name="ObjectType" type="xsd:string"/>
+          <xsd:element name="Properties" type="xsd:string" maxOccurs="unbounded"/>
+          <xsd:element name="Filter" type="tns:FilterPart" minOccurs="0"/>
+          <xsd:element name="ContinueRequest" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="QueryAllAccounts" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="Options" type="tns:RetrieveOptions" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="Result">
+        <xsd:sequence>
+          <xsd:element name="StatusCode" type="xsd:string"/>
+          <xsd:element name="StatusMessage" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="OrdinalID" type="xsd:int" minOccurs="0"/>
+          <xsd:element name="ErrorCode" type="xsd:int" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="CreateResult">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Result">
+            <xsd:sequence>
+              <xsd:element name="NewID" type="xsd:int"/>
+              <xsd:element name="NewObjectID" type="xsd:string" minOccurs="0"/>
+              <xsd:element name="Object" type="tns:APIObject" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="UpdateResult">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Result">
+            <xsd:sequence>
+              <xsd:element name="Object" type="tns:APIObject" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="DeleteResult">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Result">
+            <xsd:sequence>
+              <xsd:element name="Object" type="tns:APIObject" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="ObjectDefinitionRequest">
+        <xsd:sequence>
+          <xsd:element name="Client" type="tns:ClientID" minOccurs="0"/>
+          <xsd:element name="ObjectType" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="ArrayOfObjectDefinitionRequest">
+        <xsd:sequence>
+          <xsd:element name="ObjectDefinitionRequest" type="tns:ObjectDefinitionRequest" minOccurs="0"
+                       maxOccurs="unbounded"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="PropertyDefinition">
+        <xsd:sequence>
+          <xsd:element name="Name" type="xsd:string"/>
+          <xsd:element name="DataType" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="IsUpdatable" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="IsRetrievable" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="IsRequired" type="xsd:boolean" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="ObjectDefinition">
+        <xsd:sequence>
+          <xsd:element name="ObjectType" type="xsd:string"/>
+          <xsd:element name="Name" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="IsCreatable" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="IsUpdatable" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="IsDeletable" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="IsRetrievable" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="Properties" type="tns:PropertyDefinition" minOccurs="0" maxOccurs="unbounded"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:element name="RetrieveRequestMsg">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="RetrieveRequest" type="tns:RetrieveRequest"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="RetrieveResponseMsg">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="OverallStatus" type="xsd:string"/>
+            <xsd:element name="RequestID" type="xsd:string" minOccurs="0"/>
+            <xsd:element name="Results" type="tns:APIObject" minOccurs="0" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="CreateRequest">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="Options" type="tns:CreateOptions"/>
+            <xsd:element name="Objects" type="tns:APIObject" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="CreateResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="Results" type="tns:CreateResult" minOccurs="0" maxOccurs="unbounded"/>
+            <xsd:element name="RequestID" type="xsd:string" minOccurs="0"/>
+            <xsd:element name="OverallStatus" type="xsd:string"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="UpdateRequest">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="Options" type="tns:UpdateOptions"/>
+            <xsd:element name="Objects" type="tns:APIObject" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="UpdateResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="Results" type="tns:UpdateResult" minOccurs="0" maxOccurs="unbounded"/>
+            <xsd:element name="RequestID" type="xsd:string" minOccurs="0"/>
+            <xsd:element name="OverallStatus" type="xsd:string"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="DeleteRequest">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="Options" type="tns:DeleteOptions"/>
+            <xsd:element name="Objects" type="tns:APIObject" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="DeleteResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="Results" type="tns:DeleteResult" minOccurs="0" maxOccurs="unbounded"/>
+            <xsd:element name="RequestID" type="xsd:string" minOccurs="0"/>
+            <xsd:element name="OverallStatus" type="xsd:string"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="DefinitionRequestMsg">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="DescribeRequests" type="tns:ArrayOfObjectDefinitionRequest"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="DefinitionResponseMsg">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="ObjectDefinition" type="tns:ObjectDefinition" minOccurs="0" maxOccurs="unbounded"/>
+            <xsd:element name="RequestID" type="xsd:string" minOccurs="0"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </types>
+  <message name="RetrieveRequestMsg"><part name="parameters" element="tns:RetrieveRequestMsg"/></message>
+  <message name="RetrieveResponseMsg"><part name="parameters" element="tns:RetrieveResponseMsg"/></message>
+  <message name="CreateRequestMsg"><part name="parameters" element="tns:CreateRequest"/></message>
+  <message name="CreateResponseMsg"><part name="parameters" element="tns:CreateResponse"/></message>
+  <message name="UpdateRequestMsg"><part name="parameters" element="tns:UpdateRequest"/></message>
+  <message name="UpdateResponseMsg"><part name="parameters" element="tns:UpdateResponse"/></message>
+  <message name="DeleteRequestMsg"><part name="parameters" element="tns:DeleteRequest"/></message>
+  <message name="DeleteResponseMsg"><part name="parameters" element="tns:DeleteResponse"/></message>
+  <message name="DefinitionRequestMsg"><part name="parameters" element="tns:DefinitionRequestMsg"/></message>
+  <message name="DefinitionResponseMsg"><part name="parameters" element="tns:DefinitionResponseMsg"/></message>
+  <portType name="Soap">
+    <operation name="Retrieve">
+      <input message="tns:RetrieveRequestMsg"/><output message="tns:RetrieveResponseMsg"/>
+    </operation>
+    <operation name="Create">
+      <input message="tns:CreateRequestMsg"/><output message="tns:CreateResponseMsg"/>
+    </operation>
+    <operation name="Update">
+      <input message="tns:UpdateRequestMsg"/><output message="tns:UpdateResponseMsg"/>
+    </operation>
+    <operation name="Delete">
+      <input message="tns:DeleteRequestMsg"/><output message="tns:DeleteResponseMsg"/>
+    </operation>
+    <operation name="Describe">
+      <input message="tns:DefinitionRequestMsg"/><output message="tns:DefinitionResponseMsg"/>
+    </operation>
+  </portType>
+  <binding name="SoapBinding" type="tns:Soap">
+    <soap:binding transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="Retrieve">
+      <soap:operation soapAction="Retrieve" style="document"/>
+      <input><soap:body use="literal"/></input><output><soap:body use="literal"/></output>
+    </operation>
+    <operation name="Create">
+      <soap:operation soapAction="Create" style="document"/>
+      <input><soap:body use="literal"/></input><output><soap:body use="literal"/></output>
+    </operation>
+    <operation name="Update">
+      <soap:operation soapAction="Update" style="document"/>
+      <input><soap:body use="literal"/></input><output><soap:body use="literal"/></output>
+    </operation>
+    <operation name="Delete">
+      <soap:operation soapAction="Delete" style="document"/>
+      <input><soap:body use="literal"/></input><output><soap:body use="literal"/></output>
+    </operation>
+    <operation name="Describe">
+      <soap:operation soapAction="Describe" style="document"/>
+      <input><soap:body use="literal"/></input><output><soap:body use="literal"/></output>
+    </operation>
+  </binding>
+  <service name="PartnerAPI">
+    <port name="Soap" binding="tns:SoapBinding">
+      <soap:address location="{location}"/>
+    </port>
+  </service>
+</definitions>
+"""
+
+"""Retrievable fields of synthetic object types, used by Describe and default Retrieve"""
+OBJECT_FIELDS = {
+    'DataExtension': ['ObjectID', 'CustomerKey', 'Name', 'Description', 'IsSendable', 'CategoryID', 'ModifiedDate'],
+    'DataExtensionField': ['ObjectID', 'CustomerKey', 'Name', 'FieldType', 'MaxLength', 'IsPrimaryKey', 'IsRequired',
+                           'Ordinal', 'DataExtension.CustomerKey'],
+    'DataExtensionObject': ['Name', 'Properties'],
+    'Subscriber': ['ID', 'EmailAddress', 'SubscriberKey', 'Status'],
+    'Email': ['ID', 'Name', 'Subject'],
+    'TriggeredSendDefinition': ['ObjectID', 'CustomerKey', 'Name', 'TriggeredSendStatus'],
+    'Account': ['ID', 'AccountType', 'ParentID', 'Name'],
+    'BusinessUnit': ['ID', 'AccountType', 'ParentID', 'Name', 'Description'],
+    'SentEvent': ['SendID', 'SubscriberKey', 'EventDate', 'EventType', 'BatchID'],
+    'BounceEvent': ['SendID', 'SubscriberKey', 'EventDate', 'EventType', 'BatchID', 'BounceCategory'],
+}
+
+
+def _local(tag: str) -> str:
+    return etree.QName(tag).localname
+
+
+def _text(el, name: str, default=None):
+    child = el.find('{%s}%s' % (NS_PARTNER, name))
+    return default if child is None else child.text
+
+
+class StandInState:
+    """Synthetic account data shared by all requests of one server"""
+
+    def __init__(self, page_size: int = 2500, latency: float = 0.0):
+        self.page_size = page_size
+        self.latency = latency
+        self.objects: Dict[str, List[Dict[str, Any]]] = {}
+        self.data_extensions: Dict[str, Dict[str, Any]] = {}
+        self.continuations: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests: List[str] = []
+        self.failures: List[Tuple[int, bytes, str]] = []  # replies sent instead of next service calls
+        self.write_clients: List[str] = []  # Client.ID of Options of every write request, None if not sent
+        self.token_requests = 0
+        self.in_flight = 0  # service calls being served
+        self.peak_in_flight = 0
+        self.token_ttl = 3600
+        self.lock = threading.Lock()
+
+    def add_objects(self, obj_type: str, rows: List[Mapping[str, Any]]):
+        self.objects.setdefault(obj_type, []).extend(dict(r) for r in rows)
+
+    def add_data_extension(self, name: str, customer_key: str, fields: List[str], primary_key: List[str],
+                           rows: List[Mapping[str, Any]] = None, modified_date: str = '2020-01-01T00:00:00'):
+        self.data_extensions[name] = {'key': customer_key, 'fields': fields, 'primary_key': primary_key,
+                                      'rows': [dict(r) for r in rows or []]}
+        self.add_objects('DataExtension', [{'Name': name, 'CustomerKey': customer_key, 'ObjectID': str(uuid.uuid4()),
+                                            'ModifiedDate': modified_date}])
+        self.add_objects('DataExtensionField', [
+            {'Name': f, 'FieldType': 'Text', 'Ordinal': i, 'IsPrimaryKey': str(f in primary_key).lower(),
+             'DataExtension': {'CustomerKey': customer_key}} for i, f in enumerate(fields)])
+
+    def data_extension_by_key(self, customer_key: str) -> Dict[str, Any]:
+        for de in self.data_extensions.values():
+            if de['key'] == customer_key:
+                return de
+
+        raise KeyError(customer_key)
+
+
+class FilterEvaluator:
+    """Evaluate partner API filter parts against plain row dicts"""
+
+    def __init__(self, element):
+        self.element = element
+
+    def __call__(self, row: Mapping[str, Any]) -> bool:
+        return self._eval(self.element, row)
+
+    def _eval(self, el, row) -> bool:
+        if el is None:
+            return True
+
+        if _text(el, 'LogicalOperator') is not None:
+            operands = [el.find('{%s}LeftOperand' % NS_PARTNER), el.find('{%s}RightOperand' % NS_PARTNER)]
+            additional = el.find('{%s}AdditionalOperands' % NS_PARTNER)
+            if additional is not None:
+                operands.extend(additional)
+            results = [self._eval(o, row) for o in operands if o is not None]
+            return all(results) if _text(el, 'LogicalOperator') == 'AND' else any(results)
+
+        prop = _text(el, 'Property')
+        operator = _text(el, 'SimpleOperator')
+        values = [c.text for c in el if _local(c.tag) in ('Value', 'DateValue')]
+        actual = self._lookup(row, prop)
+
+        if operator == 'equals':
+            return actual is not None and str(actual) == values[0]
+        if operator == 'notEquals':
+            return actual is None or str(actual) != values[0]
+        if operator == 'IN':
+            return actual is not None and str(actual) in values
+        if operator in ('greaterThan', 'greaterThanOrEqual', 'lessThan', 'lessThanOrEqual'):
+            if actual is None:
+                return False
+            actual, value = str(actual), values[0]
+            return {'greaterThan': actual > value, 'greaterThanOrEqual': actual >= value,
+                    'lessThan': actual < value, 'lessThanOrEqual': actual <= value}[operator]
+        if operator == 'between':
+            return actual is not None and values[0] <= str(actual) <= values[1]
+        if operator == 'like':
+            return actual is not None and values[0].strip('%') in str(actual)
+
+        return True
+
+    @staticmethod
+    def _lookup(row, prop):
+        value = row
+        for part in prop.split('.'):
+            if not isinstance(value, Mapping) or part not in value:
+                return None
+            value = value[part]
+
+        return value
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: 'StandInServer'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, code: int, body: bytes, content_type: str = 'text/xml; charset=utf-8'):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        if self.path.startswith(WSDL_PATH):
+            return self._reply(200, self.server.wsdl().encode('utf-8'))
+
+        if self.path.startswith(ENDPOINTS_PATH):
+            body = json.dumps({'url': self.server.service_url}).encode('utf-8')
+            return self._reply(200, body, 'application/json')
+
+        self._reply(404, b'')
+
+    def do_POST(self):
+        state = self.server.state
+        body = self._read_body()
+
+        if self.path.startswith(AUTH_PATH):
+            with state.lock:
+                state.token_requests += 1
+                n = state.token_requests
+            payload = {'accessToken': 'access-{}'.format(n), 'expiresIn': state.token_ttl,
+                       'legacyToken': 'legacy-{}'.format(n), 'refreshToken': 'refresh-{}'.format(n)}
+            return self._reply(200, json.dumps(payload).encode('utf-8'), 'application/json')
+
+        if not self.path.startswith(SERVICE_PATH):
+            return self._reply(404, b'')
+
+        with state.lock:
+            state.in_flight += 1
+            state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+        try:
+            self._service(state, body)
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+    def _service(self, state: 'StandInState', body: bytes):
+        if state.latency:
+            time.sleep(state.latency)
+
+        action = self.headers.get('SOAPAction', '').strip('"')
+        with state.lock:
+            state.requests.append(action)
+            failure = state.failures.pop(0) if state.failures else None
+
+        if failure is not None:
+            return self._reply(*failure)
+
+        envelope = etree.fromstring(body)
+        request = envelope.find('{%s}Body' % NS_SOAP)[0]
+        operation = getattr(self, '_op_' + action.lower(), None)
+        if operation is None:
+            return self._reply(500, self._fault('Unknown action ' + action))
+
+        self._reply(200, self._envelope(operation(request)))
+
+    @staticmethod
+    def _fault(message: str) -> bytes:
+        return ('<soap:Envelope xmlns:soap="{}"><soap:Body><soap:Fault><faultcode>soap:Server</faultcode>'
+                '<faultstring>{}</faultstring></soap:Fault></soap:Body></soap:Envelope>').format(
+            NS_SOAP, escape(message)).encode('utf-8')
+
+    @staticmethod
+    def _envelope(body: str) -> bytes:
+        return ('<soap:Envelope xmlns:soap="{}" xmlns:xsi="{}"><soap:Body>{}</soap:Body></soap:Envelope>'.format(
+            NS_SOAP, NS_XSI, body)).encode('utf-8')
+
+    def _render_value(self, name: str, value: Any) -> str:
+        if isinstance(value, Mapping):
+            inner = ''.join(self._render_value(k, v) for k, v in value.items())
+            return '<{0}>{1}</{0}>'.format(name, inner)
+        if isinstance(value, list):
+            return ''.join(self._render_value(name, v) for v in value)
+        return '<{0}>{1}</{0}>'.format(name, escape(str(value)))
+
+    def _render_row(self, obj_type: str, row: Mapping[str, Any], props: List[str]) -> str:
+        if obj_type == 'DataExtensionObject':
+            inner = ''.join('<Property><Name>{}</Name><Value>{}</Value></Property>'.format(
+                escape(k), escape(str(v))) for k, v in row.items() if not props or k in props)
+            return '<Results xsi:type="DataExtensionObject"><Properties>{}</Properties></Results>'.format(inner)
+
+        fields = []
+        for prop in props:
+            head = prop.split('.')[0]
+            if head in row and head not in fields:
+                fields.append(head)
+        inner = ''.join(self._render_value(f, row[f]) for f in fields)
+
+        return '<Results xsi:type="{}">{}</Results>'.format(obj_type, inner)
+
+    def _page(self, obj_type: str, props: List[str], rows: List[Mapping[str, Any]]) -> str:
+        state = self.server.state
+        page, rest = rows[:state.page_size], rows[state.page_size:]
+        request_id = str(uuid.uuid4())
+        status = 'OK'
+        if rest:
+            status = 'MoreDataAvailable'
+            with state.lock:
+                state.continuations[request_id] = (obj_type, props, rest)
+
+        results = ''.join(self._render_row(obj_type, r, props) for r in page)
+
+        return ('<RetrieveResponseMsg xmlns="{}"><OverallStatus>{}</OverallStatus><RequestID>{}</RequestID>{}'
+                '</RetrieveResponseMsg>').format(NS_PARTNER, status, request_id, results)
+
+    def _op_retrieve(self, request) -> str:
+        state = self.server.state
+        retrieve = request.find('{%s}RetrieveRequest' % NS_PARTNER)
+
+        continue_request = _text(retrieve, 'ContinueRequest')
+        if continue_request:
+            with state.lock:
+                obj_type, props, rows = state.continuations[continue_request]
+            return self._page(obj_type, props, rows)
+
+        obj_type = _text(retrieve, 'ObjectType')
+        props = [p.text for p in retrieve.findall('{%s}Properties' % NS_PARTNER) if p.text]
+        matches = FilterEvaluator(retrieve.find('{%s}Filter' % NS_PARTNER))
+
+        if obj_type.startswith('DataExtensionObject['):
+            de = state.data_extensions[obj_type[len('DataExtensionObject['):-1]]
+            rows = [r for r in de['rows'] if matches(r)]
+            obj_type = 'DataExtensionObject'
+        else:
+            rows = [r for r in state.objects.get(obj_type, []) if matches(r)]
+
+        # objects of other business units are marked by Client.ID and returned only if requested by ClientIDs
+        client_ids = [_text(c, 'ID') for c in retrieve.findall('{%s}ClientIDs' % NS_PARTNER)]
+        rows = [r for r in rows if str(FilterEvaluator._lookup(r, 'Client.ID')) in client_ids
+                or not client_ids and FilterEvaluator._lookup(r, 'Client.ID') is None]
+
+        return self._page(obj_type, props, rows)
+
+    def _objects(self, request):
+        for obj in request.findall('{%s}Objects' % NS_PARTNER):
+            key = _text(obj, 'CustomerKey')
+            props = {}
+            for container, item in (('Properties', 'Property'), ('Keys', 'Key')):
+                el = obj.find('{%s}%s' % (NS_PARTNER, container))
+                if el is None:
+                    continue
+                for p in el.findall('{%s}%s' % (NS_PARTNER, item)):
+                    props[_text(p, 'Name')] = _text(p, 'Value')
+            yield key, props
+
+    def _write(self, request, operation: str) -> str:
+        state = self.server.state
+        save_actions = [e.text for e in request.iter('{%s}SaveAction' % NS_PARTNER)]
+        options = request.find('{%s}Options' % NS_PARTNER)
+        client = options.find('{%s}Client' % NS_PARTNER) if options is not None else None
+        results = []
+
+        with state.lock:
+            state.write_clients.append(_text(client, 'ID') if client is not None else None)
+
+        for ordinal, (key, props) in enumerate(self._objects(request)):
+            try:
+                de = state.data_extension_by_key(key)
+            except KeyError:
+                results.append(('Error', 'Invalid CustomerKey', ordinal))
+                continue
+
+            pk = de['primary_key']
+            with state.lock:
+                existing = [r for r in de['rows'] if all(r.get(k) == props.get(k) for k in pk)]
+                if operation == 'Create':
+                    if existing:
+                        results.append(('Error', 'Violation of PRIMARY KEY constraint', ordinal))
+                        continue
+                    de['rows'].append(props)
+                    results.append(('OK', 'Created DataExtensionObject', ordinal))
+                elif operation == 'Update':
+                    if existing:
+                        existing[0].update(props)
+                        results.append(('OK', 'Updated DataExtensionObject', ordinal))
+                    elif 'UpdateAdd' in save_actions:
+                        de['rows'].append(props)
+                        results.append(('OK', 'Created DataExtensionObject', ordinal))
+                    else:
+                        results.append(('Error', 'The object could not be found', ordinal))
+                else:
+                    for r in existing:
+                        de['rows'].remove(r)
+                    results.append(('OK', 'Deleted DataExtensionObject', ordinal))
+
+        overall = 'OK' if all(r[0] == 'OK' for r in results) else 'Error'
+        extra = '<NewID>0</NewID>' if operation == 'Create' else ''
+        rendered = ''.join(
+            '<Results><StatusCode>{}</StatusCode><StatusMessage>{}</StatusMessage><OrdinalID>{}</OrdinalID>{}'
+            '</Results>'.format(code, message, ordinal, extra) for code, message, ordinal in results)
+
+        return '<{0}Response xmlns="{1}">{2}<RequestID>{3}</RequestID><OverallStatus>{4}</OverallStatus>' \
+               '</{0}Response>'.format(operation, NS_PARTNER, rendered, uuid.uuid4(), overall)
+
+    def _op_create(self, request) -> str:
+        return self._write(request, 'Create')
+
+    def _op_update(self, request) -> str:
+        return self._write(request, 'Update')
+
+    def _op_delete(self, request) -> str:
+        return self._write(request, 'Delete')
+
+    def _op_describe(self, request) -> str:
+        definitions = []
+        for obj_type in request.iter('{%s}ObjectType' % NS_PARTNER):
+            props = ''.join('<Properties><Name>{}</Name><DataType>String</DataType><IsUpdatable>true</IsUpdatable>'
+                            '<IsRetrievable>true</IsRetrievable></Properties>'.format(f)
+                            for f in OBJECT_FIELDS.get(obj_type.text, ['ObjectID']))
+            definitions.append('<ObjectDefinition><ObjectType>{0}</ObjectType><Name>{0}</Name>{1}'
+                               '</ObjectDefinition>'.format(obj_type.text, props))
+
+        return '<DefinitionResponseMsg xmlns="{}">{}<RequestID>{}</RequestID></DefinitionResponseMsg>'.format(
+            NS_PARTNER, ''.join(definitions), uuid.uuid4())
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    """Threaded http server emulating the auth and soap services"""
+
+    daemon_threads = True
+
+    def __init__(self, state: StandInState = None, host: str = '127.0.0.1', port: int = 0):
+        self.state = state if state is not None else StandInState()
+        super(StandInServer, self).__init__((host, port), StandInHandler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return 'http://{}:{}'.format(*self.server_address[:2])
+
+    @property
+    def service_url(self) -> str:
+        return self.base_url + SERVICE_PATH
+
+    def wsdl(self) -> str:
+        return WSDL_TEMPLATE.replace('{location}', self.service_url)
+
+    def client_params(self, wsdl_local_path: str) -> Dict[str, Any]:
+        """Client factory params pointing to this server"""
+        return {
+            'client_id': 'stand-in',
+            'client_secret': 'stand-in',
+            'auth_url': self.base_url + AUTH_PATH,
+            'endpoints_url': self.base_url + ENDPOINTS_PATH,
+            'wsdl_url': self.base_url + WSDL_PATH,
+            'wsdl_local_path': wsdl_local_path,
+        }
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,113 @@
+import asyncio
+import datetime
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc import SearchFilter
+from sfmc.aio import AsyncClient, aiohttp
+from sfmc.client import StreamedResponse
+
+GATEWAY_ERROR = (503, b'<html>Service Unavailable</html>', 'text/html')
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class AsyncClientTest(StandInTestCase):
+    fields = ['C_ID', 'C_NAME', 'C_EMAIL']
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=50, latency=0.05)
+        state.add_data_extension('async_de', 'async-de-key', cls.fields, ['C_ID'])
+
+        return state
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.client = AsyncClient.make(self.make_client_factory({'write_chunk_size': 40}), concurrency=4)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.client.close())
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_describe_and_lookup(self):
+        name = self.run_async(self.client.DataExtension.name_for_customer_key('async-de-key'))
+        self.assertEqual('async_de', name)
+
+        fields = self.run_async(self.client.DataExtensionField.set_customer_key('async-de-key').get())
+        self.assertEqual(self.fields, [e.Name for e in fields.entities])
+
+    def test_add_iterate_delete_rows(self):
+        rows = [{'C_ID': 'id-{}'.format(i), 'C_NAME': 'name {}'.format(i), 'C_EMAIL': '{}@example.com'.format(i)}
+                for i in range(120)]
+        handler = self.client.DataExtensionRow.set_customer_key('async-de-key').set_name('async_de')
+
+        res = self.run_async(handler.add(rows))
+        self.assertTrue(res.is_valid)
+        self.assertEqual(list(range(120)), [r.OrdinalID for r in res.response.results])
+
+        async def collect():
+            resource = await handler.get(m_props=self.fields)
+            return [e.C_ID async for e in resource]
+
+        # chunks are sent concurrently, so rows are stored in arbitrary order
+        self.assertEqual(sorted(r['C_ID'] for r in rows), sorted(self.run_async(collect())))
+
+        f = SearchFilter.equals('C_ID', 'id-7')
+        res = self.run_async(handler.get(m_filter=f, m_props=self.fields))
+        self.assertEqual(['name 7'], [e.C_NAME for e in res.entities])
+
+        res = self.run_async(handler.delete([{'C_ID': r['C_ID']} for r in rows]))
+        self.assertTrue(res.is_valid)
+
+    def test_upsert_with_failed_chunk(self):
+        handler = self.client.DataExtensionRow.set_customer_key('async-de-key').set_name('async_de')
+        self.state.failures.append(GATEWAY_ERROR)
+
+        res = self.run_async(handler.upsert([{'C_ID': 'upsert-{}'.format(i), 'C_NAME': 'x'} for i in range(100)]))
+
+        # chunks are sent concurrently, so failed chunk is found by its position
+        (offset, chunk, _), = res.errors
+        failed = list(range(offset, offset + len(chunk)))
+        self.assertEqual(failed, res.failed)
+        self.assertEqual([i for i in range(100) if i not in failed], res.created)
+
+    def test_bounded_concurrency(self):
+        async def get_many():
+            return await asyncio.gather(*[self.client.DataExtension.get(m_props=['Name']) for _ in range(8)])
+
+        self.state.peak_in_flight = 0
+        results = self.run_async(get_many())
+
+        self.assertTrue(all(r.is_valid for r in results))
+        # 8 requests by 4 concurrent, server latency keeps requests in flight together
+        self.assertGreater(self.state.peak_in_flight, 1)
+        self.assertLessEqual(self.state.peak_in_flight, 4)
+
+    def test_streamed_values_are_typed(self):
+        self.client.client.stream_results = True
+
+        res = self.run_async(self.client.DataExtension.get(m_props=['Name', 'ModifiedDate']))
+
+        self.assertIsInstance(res.response, StreamedResponse)
+        self.assertEqual([datetime.datetime(2020, 1, 1)], [e.ModifiedDate for e in res.entities])
+
+    def test_single_token_refresh(self):
+        self.client.authenticator.auth_token_expiration = 0
+        token_requests = self.state.token_requests
+
+        async def get_many():
+            return await asyncio.gather(*[self.client.DataExtension.get(m_props=['Name']) for _ in range(6)])
+
+        results = self.run_async(get_many())
+
+        self.assertTrue(all(r.is_valid for r in results))
+        self.assertEqual(token_requests + 1, self.state.token_requests)
+        self.assertFalse(self.client.authenticator.auth_expired())
+
+
+if __name__ == '__main__':
+    unittest.main()
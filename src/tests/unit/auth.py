@@ -0,0 +1,49 @@
+import threading
+import unittest
+
+from tests import StandInTestCase
+
+
+class AuthenticatorTest(StandInTestCase):
+
+    def test_token_reused_until_due(self):
+        cl = self.make_client_factory().make()
+        token_requests = self.state.token_requests
+
+        for _ in range(3):
+            cl.Account.get(m_props=['ID'])
+
+        self.assertEqual(token_requests, self.state.token_requests)
+
+        # refresh_delay is passed
+        cl.authenticator.last_refresh_ts -= cl.authenticator.refresh_delay + 1
+        for _ in range(3):
+            cl.Account.get(m_props=['ID'])
+
+        self.assertEqual(token_requests + 1, self.state.token_requests)
+
+    def test_concurrent_refresh_is_single(self):
+        cl = self.make_client_factory().make()
+        cl.authenticator.auth_token_expiration = 0
+        token_requests = self.state.token_requests
+
+        threads = [threading.Thread(target=cl.Account.get, kwargs={'m_props': ['ID']}) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(token_requests + 1, self.state.token_requests)
+
+    def test_token_shared_through_cache(self):
+        params = {'token_cache_path': self.tmp_dir + '/tokens'}
+        token_requests = self.state.token_requests
+
+        clients = [self.make_client_factory(params).make() for _ in range(3)]
+
+        self.assertEqual(token_requests + 1, self.state.token_requests)
+        self.assertEqual(1, len({cl.authenticator.auth_token for cl in clients}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from tests.benchmark import Benchmarks, percentile, format_results
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+
+        self.assertEqual(50.0, percentile(values, 50))
+        self.assertEqual(99.0, percentile(values, 99))
+        self.assertEqual(100.0, percentile(values, 100))
+        self.assertEqual(0.0, percentile([], 50))
+
+    def test_run(self):
+        with Benchmarks(rows=120, page_size=50, repeat=2, write_rows=30) as benchmarks:
+            results = benchmarks.run()
+
+        rows = {r.name: r.rows for r in results}
+        self.assertEqual(Benchmarks.names, [r.name for r in results])
+        self.assertEqual(2 * 50, rows['soap_get'])
+        self.assertEqual(2 * 120, rows['pagination'])
+        self.assertEqual(2 * 120, rows['pagination_processes'])
+        self.assertEqual(2 * 30, rows['add_direct'])
+        self.assertEqual(rows['add'] + rows['add_direct'], len(benchmarks.state.data_extensions['bench_write']['rows']))
+        self.assertTrue(all(r.peak_memory > 0 and len(r.durations) == 2 for r in results))
+        self.assertEqual(len(results) + 1, len(format_results(results).splitlines()))
+
+        with self.assertRaises(ValueError):
+            Benchmarks(rows=0).run(['unknown'])
+
+
+if __name__ == '__main__':
+    unittest.main()
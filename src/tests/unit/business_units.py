@@ -0,0 +1,75 @@
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc import SearchFilter
+from sfmc.exceptions import ConfigureError
+from sfmc.business_units import BusinessUnitPool
+
+
+class BusinessUnitPoolTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=2)
+        state.add_objects('BusinessUnit', [{'ID': str(mid), 'Name': 'unit {}'.format(mid), 'ParentID': '100'}
+                                           for mid in (101, 102, 103)])
+        for mid in (101, 102, 103):
+            state.add_objects('Email', [{'ID': str(mid * 10 + i), 'Name': 'email {}'.format(i),
+                                         'Client': {'ID': str(mid)}} for i in range(mid - 100)])
+        state.add_data_extension('unit_de', 'unit-de-key', ['C_ID'], ['C_ID'])
+
+        return state
+
+    def test_fan_out(self):
+        pool = BusinessUnitPool(self.make_client_factory())
+        self.assertEqual([101, 102, 103], pool.discover())
+
+        results = pool.get('Email', m_props=['ID', 'Name'])
+
+        self.assertTrue(all(r.is_valid for r in results))
+        self.assertEqual([(101, 1010), (102, 1020), (102, 1021), (103, 1030), (103, 1031), (103, 1032)],
+                         [(mid, e.ID) for mid, e in pool.merge(results)])
+        self.assertEqual([[101], [102], [103]], [pool.client(mid).client_ids for mid in (101, 102, 103)])
+
+    def test_shared_credentials(self):
+        factory = self.make_client_factory()
+        pool = BusinessUnitPool(factory, {101: {}, 102: {}, 103: {'client_id': 'unit-103', 'client_secret': 'secret'}})
+        tokens = self.state.token_requests
+
+        results = pool.get('Email', m_filter=SearchFilter.equals('Name', 'email 0'), m_props=['ID'])
+
+        self.assertEqual([1, 1, 0], [len(r.value) for r in results])
+        self.assertEqual(2, self.state.token_requests - tokens)
+        self.assertIs(pool.client(101).authenticator, pool.client(102).authenticator)
+        self.assertIsNot(pool.client(101).authenticator, pool.client(103).authenticator)
+        self.assertIs(factory.soap_pool, pool.client(103).soap_client_pool)
+
+    def test_writes_target_business_unit(self):
+        factory = self.make_client_factory()
+        pool = BusinessUnitPool(factory, {101: {}, 103: {'client_id': 'unit-103', 'client_secret': 'secret'}})
+
+        for mid, row in ((101, '1'), (103, '2')):
+            handler = pool.client(mid).DataExtensionRow.set_customer_key('unit-de-key')
+            self.assertTrue(handler.add({'C_ID': row}).is_valid)
+            self.assertTrue(handler.upsert({'C_ID': row}).is_valid)
+
+        # business unit of own credentials is written as own account
+        self.assertEqual(['101', '101', None, None], self.state.write_clients[-4:])
+
+        cl = factory.make_client(pool.authenticator(), [101, 102])
+        with self.assertRaises(ConfigureError):
+            cl.DataExtensionRow.set_customer_key('unit-de-key').add({'C_ID': '3'})
+
+    def test_failed_business_unit(self):
+        pool = BusinessUnitPool(self.make_client_factory(), {101: {}, 102: {}})
+
+        results = pool.fan_out(lambda cl: cl.Missing, [101, 102, 104])
+
+        self.assertEqual([101, 102, 104], [r.business_unit_id for r in results])
+        self.assertEqual([LookupError, LookupError, ConfigureError], [type(r.error) for r in results])
+        self.assertEqual([], list(pool.merge(results)))
+
+
+if __name__ == '__main__':
+    unittest.main()
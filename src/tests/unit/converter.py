@@ -0,0 +1,63 @@
+import datetime
+import unittest
+
+from suds.sudsobject import Factory
+
+from sfmc.converter import Converter
+from sfmc.util import sobject_to_dict, suds_results_to_simple_types
+
+
+def make_subscriber(with_attributes: bool = True):
+    subscriber = Factory.object('Subscriber')
+    subscriber.ID = 1
+    subscriber.CreatedDate = datetime.datetime(2020, 1, 2, 3, 4, 5)
+
+    client = Factory.object('ClientID')
+    client.ID = 7
+    subscriber.Client = client
+
+    if with_attributes:
+        attribute = Factory.object('Attribute')
+        attribute.Name = 'First'
+        attribute.Value = 'A'
+        subscriber.Attributes = [attribute]
+
+    return subscriber
+
+
+class ConverterTest(unittest.TestCase):
+
+    def test_convert(self):
+        self.assertEqual({
+            'ID': 1,
+            'CreatedDate': datetime.datetime(2020, 1, 2, 3, 4, 5),
+            'Client': {'ID': 7},
+            'Attributes': [{'Name': 'First', 'Value': 'A'}],
+        }, Converter().convert(make_subscriber()))
+
+    def test_top_level_keys_lowered(self):
+        self.assertEqual({
+            'id': 1,
+            'createddate': '2020-01-02T03:04:05',
+            'client': {'ID': 7},
+            'attributes': [{'Name': 'First', 'Value': 'A'}],
+        }, sobject_to_dict(make_subscriber(), key_to_lower=True, json_serialize=True))
+
+    def test_different_fields_of_same_type(self):
+        converter = Converter()
+        objects = [make_subscriber(), make_subscriber(with_attributes=False), make_subscriber()]
+
+        results = converter.convert_many(objects)
+
+        self.assertEqual(['ID', 'CreatedDate', 'Client', 'Attributes'], list(results[0]))
+        self.assertEqual(['ID', 'CreatedDate', 'Client'], list(results[1]))
+        self.assertEqual(results[0], results[2])
+
+    def test_plain_values(self):
+        self.assertEqual(5, sobject_to_dict(5))
+        self.assertEqual('2020-01-02', sobject_to_dict(datetime.date(2020, 1, 2), json_serialize=True))
+        self.assertEqual([{'ID': 7}], suds_results_to_simple_types([make_subscriber().Client]))
+
+
+if __name__ == '__main__':
+    unittest.main()
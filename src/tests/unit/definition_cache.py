@@ -0,0 +1,88 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from tests import StandInTestCase
+from sfmc.client import ObjectDefinition, ObjectDefinitionCache
+
+NAMESPACE = 'endpoint|client'
+
+
+def make_definition(obj_type: str = 'Email') -> ObjectDefinition:
+    return ObjectDefinition(obj_type, [{'Name': 'ID', 'IsRetrievable': True},
+                                       {'Name': 'Name', 'IsRetrievable': True},
+                                       {'Name': 'Secret', 'IsRetrievable': False}])
+
+
+class ObjectDefinitionCacheTest(unittest.TestCase):
+
+    def test_memory(self):
+        cache = ObjectDefinitionCache()
+        cache.set(NAMESPACE, make_definition())
+
+        self.assertEqual(['ID', 'Name'], cache.get(NAMESPACE, 'Email').retrievable_property_names())
+        self.assertIsNone(cache.get('other', 'Email'))
+        self.assertIsNone(ObjectDefinitionCache().get(NAMESPACE, 'Email'))
+
+    def test_expired(self):
+        cache = ObjectDefinitionCache(ttl=-1)
+        cache.set(NAMESPACE, make_definition())
+
+        self.assertIsNone(cache.get(NAMESPACE, 'Email'))
+
+    def test_file(self):
+        path = os.path.join(self.make_dir(), 'definitions')
+        ObjectDefinitionCache(path=path).set(NAMESPACE, make_definition())
+
+        # restarted process reads definition from disk
+        definition = ObjectDefinitionCache(path=path).get(NAMESPACE, 'Email')
+
+        self.assertEqual(['ID', 'Name'], definition.retrievable_property_names())
+        self.assertFalse(definition.get_property('Secret').IsRetrievable)
+
+    def test_invalidate(self):
+        cache = ObjectDefinitionCache(path=os.path.join(self.make_dir(), 'definitions'))
+        for namespace in (NAMESPACE, 'other'):
+            for obj_type in ('Email', 'List'):
+                cache.set(namespace, make_definition(obj_type))
+
+        cache.invalidate(NAMESPACE, 'Email')
+        self.assertIsNone(cache.get(NAMESPACE, 'Email'))
+        self.assertIsNotNone(cache.get(NAMESPACE, 'List'))
+
+        cache.invalidate('other')
+        self.assertEqual([None, None], [cache.get('other', t) for t in ('Email', 'List')])
+        self.assertIsNotNone(cache.get(NAMESPACE, 'List'))
+
+    def make_dir(self) -> str:
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, True)
+
+        return path
+
+
+class DescribedDefinitionTest(StandInTestCase):
+
+    def test_pickle_described(self):
+        cl = self.make_client_factory().make()
+        definition = cl.Email.describe()
+
+        restored = pickle.loads(pickle.dumps(definition))
+
+        self.assertEqual(definition.obj_type, restored.obj_type)
+        self.assertEqual(definition.retrievable_property_names(), restored.retrievable_property_names())
+
+    def test_describe_skipped_after_restart(self):
+        params = {'object_definition_cache_path': os.path.join(self.tmp_dir, 'definitions')}
+        self.make_client_factory(params).make().Email.get()
+        describes = self.state.requests.count('Describe')
+
+        self.make_client_factory(params).make().Email.get()
+
+        self.assertEqual(describes, self.state.requests.count('Describe'))
+
+
+if __name__ == '__main__':
+    unittest.main()
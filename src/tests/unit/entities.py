@@ -0,0 +1,176 @@
+import pickle
+import tracemalloc
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.client import ColumnIndex, CompactEntity, Entity, EntityList, _MISSING
+from sfmc.exceptions import ResourceMissingPropertyException
+from sfmc.resources.data_extension import CompactDataExtensionRowEntity, DataExtensionRowEntity
+
+
+class CountingFactory:
+
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, result):
+        self.built.append(result)
+
+        return {'entity': result}
+
+
+class EntityListTest(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = CountingFactory()
+        self.entities = EntityList(list(range(10)), self.factory)
+
+    def test_len_builds_nothing(self):
+        self.assertEqual(10, len(self.entities))
+        self.assertEqual([], self.factory.built)
+
+    def test_index(self):
+        self.assertEqual({'entity': 3}, self.entities[3])
+        self.assertEqual({'entity': 9}, self.entities[-1])
+        self.assertIs(self.entities[3], self.entities[3])
+        self.assertEqual([3, 9], self.factory.built)
+
+        with self.assertRaises(IndexError):
+            self.entities[10]
+
+    def test_slice(self):
+        self.assertEqual([{'entity': 2}, {'entity': 4}], self.entities[2:6:2])
+        self.assertEqual([2, 4], self.factory.built)
+
+    def test_iter_caches(self):
+        first = list(self.entities)
+        second = list(self.entities)
+
+        self.assertEqual(list(range(10)), self.factory.built)
+        self.assertTrue(all(a is b for a, b in zip(first, second)))
+
+    def test_iter_uncached(self):
+        cached = self.entities[5]
+        entities = list(self.entities.iter_uncached())
+
+        self.assertIs(cached, entities[5])
+        self.assertEqual([{'entity': i} for i in range(10)], entities)
+        # built entities are not kept, so next pass builds them again
+        list(self.entities.iter_uncached())
+        self.assertEqual(19, len(self.factory.built))
+        self.assertEqual(1, sum(e is not None for e in self.entities._entities))
+
+
+class ResourceEntitiesTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        state.add_objects('Email', [{'ID': str(i), 'Name': 'email {}'.format(i)} for i in range(30)])
+
+        return state
+
+    def test_entities(self):
+        res = self.make_client_factory().make().Email.get(m_props=['ID', 'Name'])
+
+        self.assertEqual(30, len(res.entities))
+        self.assertEqual('email 7', res.entities[7].Name)
+        self.assertEqual([str(i) for i in range(30)], [str(e.ID) for e in res])
+
+
+class CompactEntityTest(unittest.TestCase):
+
+    RESULTS = [
+        {'Type': 'Row', 'ID': 1, 'Name': None, 'Properties': {'Property': [{'Name': 'A', 'Value': 'a1'},
+                                                                           {'Name': 'B', 'Value': None}]}},
+        {'ID': 2, 'Extra': 'x', 'Properties': {'Property': [{'Name': 'B', 'Value': 'b2'}]}},
+        {'ID': 3},
+    ]
+
+    def pairs(self, entity_class, compact_class, results: list = None):
+        columns = ColumnIndex()
+
+        return [(entity_class(r), compact_class(r, columns)) for r in results or self.RESULTS]
+
+    def test_parity(self):
+        rows = [r for r in self.RESULTS if 'Properties' in r]
+        pairs = self.pairs(Entity, CompactEntity) + self.pairs(DataExtensionRowEntity, CompactDataExtensionRowEntity,
+                                                               rows)
+        for entity, compact in pairs:
+            self.assertEqual(entity.data, compact.data)
+            self.assertEqual(list(entity), list(compact))
+            self.assertEqual(entity.has_properties(), compact.has_properties())
+            self.assertEqual(entity.get_type(), compact.get_type())
+
+            for name in ('Type', 'ID', 'Name', 'Extra', 'A', 'B', 'Missing'):
+                self.assertEqual(self.read(entity, name), self.read(compact, name), name)
+                self.assertEqual(self.read(entity, 'get_property_value', name),
+                                 self.read(compact, 'get_property_value', name), name)
+
+            if isinstance(entity, DataExtensionRowEntity):
+                self.assertEqual(entity.payload(), compact.payload())
+            if entity.has_properties():
+                self.assertEqual({k: p.Value for k, p in entity.properties.items()},
+                                 {k: p.Value for k, p in compact.properties.items()})
+
+    def test_missing_is_not_none(self):
+        first, second, third = [c for _, c in self.pairs(Entity, CompactEntity)]
+
+        # None is a value, absent field is missing, even if other entities of result set have it
+        self.assertIsNone(first.Name)
+        self.assertEqual({'Type': 'Row', 'ID': 1, 'Name': None}, first.data)
+        self.assertIsNone(first.get_property_value('B'))
+        for entity, name in ((first, 'Extra'), (second, 'Name'), (third, 'Extra')):
+            with self.assertRaises(AttributeError):
+                getattr(entity, name)
+        with self.assertRaises(ResourceMissingPropertyException):
+            second.get_property_value('A')
+        self.assertEqual({'ID': 3}, third.data)
+        self.assertEqual('DefaultEntity', third.get_type())
+        self.assertFalse(any(v is _MISSING for v in first.data.values()))
+
+    def test_pickle(self):
+        _, compact = self.pairs(Entity, CompactEntity)[1]
+
+        restored = pickle.loads(pickle.dumps(compact))
+
+        self.assertIs(_MISSING, restored.values[compact.columns.fields['Name']])
+        self.assertEqual(compact.data, restored.data)
+        self.assertEqual('b2', restored.get_property_value('B'))
+
+    def test_memory(self):
+        fields = ['F{}'.format(i) for i in range(30)]
+        results = [{'Properties': {'Property': [{'Name': f, 'Value': '{}-{}'.format(f, r)} for f in fields]}}
+                   for r in range(1000)]
+        columns = ColumnIndex()
+
+        regular = self.traced(lambda: [DataExtensionRowEntity(r) for r in results])
+        compact = self.traced(lambda: [CompactDataExtensionRowEntity(r, columns) for r in results])
+
+        # a page of 30 column rows takes about 25x less memory
+        self.assertGreater(regular / compact, 20)
+
+    @staticmethod
+    def traced(build) -> int:
+        tracemalloc.start()
+        try:
+            entities = build()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del entities
+
+        return size
+
+    @staticmethod
+    def read(entity, name: str, *args):
+        try:
+            value = getattr(entity, name)
+            return value(*args) if args else value
+        except (AttributeError, ResourceMissingPropertyException) as e:
+            return e.__class__
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import datetime
+import unittest
+
+from lxml import etree
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.envelope import render_write_envelope, XSI_TYPE
+from sfmc.parser import NS_PARTNER
+
+SKELETON = (b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/" '
+            b'xmlns:ns0="http://exacttarget.com/wsdl/partnerAPI">'
+            b'<SOAP-ENV:Header><oAuth><oAuthToken>token</oAuthToken></oAuth></SOAP-ENV:Header>'
+            b'<SOAP-ENV:Body><ns0:UpdateRequest><ns0:Options><ns0:SaveOptions/></ns0:Options></ns0:UpdateRequest>'
+            b'</SOAP-ENV:Body></SOAP-ENV:Envelope>')
+KEYS = ('Client', 'CustomerKey', 'Properties', 'Name', 'Keys')
+FIELDS = ['C_ID', 'C_NAME']
+
+
+class RenderEnvelopeTest(unittest.TestCase):
+
+    def test_objects_are_appended(self):
+        objects = [{'Properties': {'Property': [{'Name': 'C_ID', 'Value': 1},
+                                                {'Name': 'C_DATE', 'Value': datetime.date(2020, 1, 2)}]},
+                    'CustomerKey': 'de-key', 'Name': None}]
+
+        root = etree.fromstring(render_write_envelope(SKELETON, 'Update', 'DataExtensionObject', objects, KEYS))
+        request = root.find('.//{%s}UpdateRequest' % NS_PARTNER)
+
+        self.assertEqual(['Options', 'Objects'], [etree.QName(e).localname for e in request])
+        obj = request[1]
+        self.assertEqual('ns0:DataExtensionObject', obj.get(XSI_TYPE))
+        # schema order, None is skipped
+        self.assertEqual(['CustomerKey', 'Properties'], [etree.QName(e).localname for e in obj])
+        self.assertEqual(['1', '2020-01-02'], [v.text for v in obj.iter('{%s}Value' % NS_PARTNER)])
+
+    def test_unknown_property(self):
+        with self.assertRaises(ValueError):
+            render_write_envelope(SKELETON, 'Update', 'DataExtensionObject', [{'Bogus': 1}], KEYS)
+
+
+class DirectWriteTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=500)
+        state.add_data_extension('direct_de', 'direct-de-key', FIELDS, ['C_ID'])
+
+        return state
+
+    def test_add_update_delete(self):
+        cl = self.make_client_factory({'direct_write_types': 'DataExtensionObject', 'write_chunk_size': 100}).make()
+        handler = cl.DataExtensionRow.set_name('direct_de').set_customer_key('direct-de-key')
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(250)]
+
+        res = handler.add(rows)
+        self.assertTrue(res.is_valid)
+        self.assertEqual(list(range(250)), [r.OrdinalID for r in res.response.results])
+
+        res = handler.update([{'C_ID': '7', 'C_NAME': 'renamed'}])
+        self.assertTrue(res.is_valid)
+        names = {e.C_ID: e.C_NAME for e in handler.get(m_props=FIELDS)}
+        self.assertEqual(250, len(names))
+        self.assertEqual('renamed', names['7'])
+
+        self.assertTrue(handler.delete([{'C_ID': r['C_ID']} for r in rows]).is_valid)
+        self.assertEqual([], self.state.data_extensions['direct_de']['rows'])
+
+        with self.assertRaises(ValueError):
+            cl.soap_post('DataExtensionObject', {'Bogus': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
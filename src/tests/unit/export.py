@@ -0,0 +1,110 @@
+import csv
+import gzip
+import json
+import os
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.exceptions import ConfigureError
+from sfmc.export import DataExtensionExporter, detect_format, main, pyarrow
+
+FIELDS = ['C_ID', 'C_NAME', 'C_EMAIL']
+
+
+class DetectFormatTest(unittest.TestCase):
+
+    def test_detect(self):
+        self.assertEqual(('ndjson', 'gz'), detect_format('/tmp/rows.ndjson.gz'))
+        self.assertEqual(('ndjson', None), detect_format('rows.jsonl'))
+        self.assertEqual(('csv', 'bz2'), detect_format('rows.csv.bz2'))
+        self.assertEqual(('parquet', None), detect_format('rows.parquet'))
+
+        with self.assertRaises(ConfigureError):
+            detect_format('rows.txt')
+
+
+class ExportTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i), 'C_EMAIL': '{}@example.com'.format(i)}
+                for i in range(250)]
+        state.add_data_extension('export_de', 'export-de-key', FIELDS, ['C_ID'], rows)
+
+        return state
+
+    def expected_rows(self):
+        return [{f: r[f] for f in FIELDS} for r in self.state.data_extensions['export_de']['rows']]
+
+    def test_ndjson(self):
+        path = os.path.join(self.tmp_dir, 'rows.ndjson.gz')
+        reports = []
+
+        cl = self.make_client_factory().make()
+        stats = DataExtensionExporter(cl).export(path, customer_key='export-de-key', progress=reports.append)
+
+        self.assertEqual(250, stats.rows)
+        self.assertEqual(3, stats.pages)
+        self.assertEqual(3, len(reports))
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self.assertEqual(self.expected_rows(), [json.loads(line) for line in f])
+
+    def test_csv_by_name(self):
+        path = os.path.join(self.tmp_dir, 'rows.csv')
+
+        cl = self.make_client_factory({'stream_results': True}).make()
+        DataExtensionExporter(cl).export(path, name='export_de', fields=['C_ID', 'C_NAME'])
+
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            self.assertEqual(['C_ID', 'C_NAME'], reader.fieldnames)
+            self.assertEqual([{'C_ID': r['C_ID'], 'C_NAME': r['C_NAME']} for r in self.expected_rows()],
+                             [dict(r) for r in reader])
+
+    def test_process_pool(self):
+        path = os.path.join(self.tmp_dir, 'workers.ndjson')
+
+        cl = self.make_client_factory({'stream_results': True}).make()
+        stats = DataExtensionExporter(cl).export(path, customer_key='export-de-key', workers=2, progress=None)
+
+        self.assertEqual(250, stats.rows)
+        self.assertEqual(3, stats.pages)
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(self.expected_rows(), [json.loads(line) for line in f])
+
+    def test_process_pool_entities(self):
+        cl = self.make_client_factory({'stream_results': True}).make()
+        resource = cl.DataExtensionRow.set_name('export_de').get(m_props=FIELDS)
+
+        with resource.process_pool(2) as rows:
+            self.assertEqual([r['C_ID'] for r in self.expected_rows()], [e.C_ID for e in rows])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        import pyarrow.parquet
+
+        path = os.path.join(self.tmp_dir, 'rows.parquet')
+
+        cl = self.make_client_factory().make()
+        DataExtensionExporter(cl).export(path, customer_key='export-de-key')
+
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(FIELDS, table.column_names)
+        self.assertEqual(self.expected_rows(), table.to_pylist())
+
+    def test_console(self):
+        path = os.path.join(self.tmp_dir, 'console.ndjson')
+        config = os.path.join(self.tmp_dir, 'config.json')
+        with open(config, 'w') as f:
+            json.dump(self.server.client_params(os.path.join(self.tmp_dir, 'etframework.wsdl')), f)
+
+        self.assertEqual(0, main(['--config', config, '--key', 'export-de-key', path]))
+
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(250, len(f.readlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
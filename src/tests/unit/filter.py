@@ -0,0 +1,72 @@
+import datetime
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc import SearchFilter
+
+FIELDS = ['C_ID', 'C_NAME', 'C_DATE']
+START = datetime.datetime(2020, 1, 1)
+
+
+class SearchFilterTest(unittest.TestCase):
+
+    def test_nested_payload(self):
+        date = datetime.datetime(2020, 1, 2)
+        f = SearchFilter.both(SearchFilter.equals('A', '1'),
+                              SearchFilter.one_from(SearchFilter.equals('B', '2'), SearchFilter.less_than('C', date)),
+                              SearchFilter.like('D', 'x%'))
+
+        self.assertEqual({
+            'LeftOperand': {'Property': 'A', 'SimpleOperator': 'equals', 'Value': '1'},
+            'LogicalOperator': 'AND',
+            'RightOperand': {
+                'LeftOperand': {'Property': 'B', 'SimpleOperator': 'equals', 'Value': '2'},
+                'LogicalOperator': 'OR',
+                'RightOperand': {'Property': 'C', 'SimpleOperator': 'lessThan', 'DateValue': date},
+            },
+            'AdditionalOperands': [{'Property': 'D', 'SimpleOperator': 'like', 'Value': 'x%'}],
+        }, f.payload())
+
+        with self.assertRaises(TypeError):
+            SearchFilter.both(SearchFilter.equals('A', '1'), SearchFilter.equals('B', '2'), {'Property': 'C'})
+
+
+class SearchFilterRetrieveTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i % 3),
+                 'C_DATE': (START + datetime.timedelta(days=i)).strftime('%Y-%m-%dT%H:%M:%S')} for i in range(30)]
+        state.add_data_extension('filter_de', 'filter-de-key', FIELDS, ['C_ID'], rows)
+
+        return state
+
+    def get_ids(self, m_filter: SearchFilter):
+        cl = self.make_client_factory().make()
+        res = cl.DataExtensionRow.set_name('filter_de').get(m_filter=m_filter, m_props=FIELDS)
+        self.assertTrue(res.is_valid)
+
+        return sorted(int(e.C_ID) for e in res)
+
+    def test_additional_operands(self):
+        f = SearchFilter.both(SearchFilter.equals('C_NAME', 'name 0'),
+                              SearchFilter.greater_than_or_equal('C_DATE', START + datetime.timedelta(days=6)),
+                              SearchFilter.less_than('C_DATE', START + datetime.timedelta(days=20)))
+
+        self.assertEqual([6, 9, 12, 15, 18], self.get_ids(f))
+
+    def test_nested_operands(self):
+        f = SearchFilter.one_from(
+            SearchFilter.both(SearchFilter.equals('C_NAME', 'name 1'),
+                              SearchFilter.less_than('C_DATE', START + datetime.timedelta(days=10))),
+            SearchFilter.both(SearchFilter.equals('C_NAME', 'name 2'),
+                              SearchFilter.one_from(SearchFilter.equals('C_ID', '29'), SearchFilter.equals('C_ID', '5'),
+                                                    SearchFilter.equals('C_ID', '6'))))
+
+        self.assertEqual([1, 4, 5, 7, 29], self.get_ids(f))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from suds.transport import Request as SoapRequest, TransportError
+
+from tests import StandInTestCase
+from sfmc.exceptions import HTTPStatusError
+from sfmc.http import Client, SoapTransport
+
+ENVELOPE = b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body/></soap:Envelope>'
+
+
+class SoapTransportTest(StandInTestCase):
+
+    def setUp(self):
+        self.transport = SoapTransport(Client())
+
+    def send(self, failure: tuple):
+        self.state.failures.append(failure)
+
+        return self.transport.send(SoapRequest(self.server.service_url, ENVELOPE))
+
+    def test_reply(self):
+        reply = self.send((200, ENVELOPE))
+
+        self.assertEqual(200, reply.code)
+        self.assertEqual(ENVELOPE, reply.message)
+        self.assertEqual((len(ENVELOPE), len(ENVELOPE)), self.transport.last_exchange)
+
+    def test_empty_reply(self):
+        self.assertIsNone(self.send((202, b'')))
+        self.assertIsNone(self.send((204, b'')))
+
+    def test_soap_fault(self):
+        with self.assertRaises(TransportError) as ctx:
+            self.send((500, ENVELOPE))
+
+        self.assertEqual(500, ctx.exception.httpcode)
+        self.assertEqual(ENVELOPE, ctx.exception.fp.read())
+
+    def test_error_page(self):
+        with self.assertRaises(HTTPStatusError) as ctx:
+            self.send((502, b'Bad gateway', 'text/html'))
+
+        self.assertEqual(502, ctx.exception.status_code)
+        self.assertIn('Bad gateway', str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.metrics import MetricsRegistry, MetricsInstrumentation, Instrumentation, SoapCallRecord
+from sfmc.parser import count_retrieve_results
+from tests.unit.parser import REPLY
+
+
+class RegistryTest(unittest.TestCase):
+
+    def test_counter_exposition(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('calls_total', 'Calls', ('operation',))
+        counter.inc(operation='Retrieve')
+        counter.inc(2, operation='Retrieve')
+        counter.inc(operation='Create')
+
+        self.assertEqual(3, counter.get(operation='Retrieve'))
+        self.assertEqual('\n'.join([
+            '# HELP calls_total Calls',
+            '# TYPE calls_total counter',
+            'calls_total{operation="Create"} 1',
+            'calls_total{operation="Retrieve"} 3',
+        ]) + '\n', registry.exposition())
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+
+        self.assertEqual([
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1"} 2',
+            'latency_seconds_bucket{le="+Inf"} 3',
+            'latency_seconds_sum 5.55',
+            'latency_seconds_count 3',
+        ], histogram.samples())
+
+    def test_register_is_idempotent(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('calls_total', 'Calls', ('operation',))
+
+        self.assertIs(counter, registry.counter('calls_total', 'Calls', ('operation',)))
+        with self.assertRaises(ValueError):
+            registry.histogram('calls_total', 'Calls', ('operation',))
+
+    def test_failed_hook_is_ignored(self):
+        class Broken(Instrumentation):
+            def on_soap_call(self, record):
+                raise RuntimeError('broken')
+
+        with Broken().soap_call('Retrieve', 'Account') as record:
+            record.status = 'ok'
+
+    def test_count_results(self):
+        self.assertEqual(2, count_retrieve_results(REPLY))
+
+    def test_overall_status_label(self):
+        for status, label in (('OK', 'OK'), ('MoreDataAvailable', 'MoreDataAvailable'),
+                              ('Error: Unable to find DataExtension 12345', 'Error'), ('Has Errors', 'Error'),
+                              ('Server was unable to process request 12345', 'Other'), (None, 'Other')):
+            self.assertEqual(label, SoapCallRecord.overall_status_label(status), status)
+
+
+class InstrumentedClientTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(250)]
+        state.add_data_extension('metrics_de', 'metrics-de-key', ['C_ID', 'C_NAME'], ['C_ID'], rows)
+
+        return state
+
+    def make_client(self, params: dict = None):
+        factory = self.make_client_factory(params)
+        factory.instrumentation = MetricsInstrumentation(MetricsRegistry())
+
+        return factory.make(), factory.instrumentation
+
+    def assert_pages_collected(self, instrumentation: MetricsInstrumentation):
+        labels = {'object_type': 'DataExtensionObject[metrics_de]'}
+
+        self.assertEqual(3, instrumentation.pages.get(**labels))
+        self.assertEqual(250, instrumentation.rows.get(operation='Retrieve', **labels) +
+                         instrumentation.rows.get(operation='ContinueRetrieve', **labels))
+        self.assertEqual(1, instrumentation.requests.get(operation='Retrieve', status='ok',
+                                                         overall_status='MoreDataAvailable', **labels))
+        self.assertEqual(1, instrumentation.requests.get(operation='ContinueRetrieve', status='ok',
+                                                         overall_status='OK', **labels))
+        self.assertEqual(3, instrumentation.duration.get_count(operation='Retrieve', **labels) +
+                         instrumentation.duration.get_count(operation='ContinueRetrieve', **labels))
+        self.assertGreater(instrumentation.received_bytes.get(operation='Retrieve', **labels), 0)
+        self.assertGreater(instrumentation.sent_bytes.get(operation='Retrieve', **labels), 0)
+
+    def test_retrieve_pages(self):
+        cl, instrumentation = self.make_client()
+        list(cl.DataExtensionRow.set_name('metrics_de').get(m_props=['C_ID', 'C_NAME']))
+
+        self.assert_pages_collected(instrumentation)
+        self.assertEqual(1, instrumentation.auth_refreshes.get(status='ok'))
+
+    def test_streamed_retrieve_pages(self):
+        cl, instrumentation = self.make_client({'stream_results': True})
+        list(cl.DataExtensionRow.set_name('metrics_de').get(m_props=['C_ID', 'C_NAME']))
+
+        self.assert_pages_collected(instrumentation)
+
+    def test_exposition(self):
+        cl, instrumentation = self.make_client()
+        cl.DataExtensionRow.set_name('metrics_de').get(m_props=['C_ID'])
+
+        text = instrumentation.registry.exposition()
+        self.assertIn('# TYPE sfmc_soap_request_duration_seconds histogram', text)
+        self.assertIn('sfmc_soap_pages_total{object_type="DataExtensionObject[metrics_de]"} 1', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
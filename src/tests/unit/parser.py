@@ -0,0 +1,128 @@
+import datetime
+import pickle
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.client import StreamedResponse, convert_page
+from sfmc.converter import get_converter
+from sfmc.parser import read_retrieve_status, iter_retrieve_results
+
+FIELD_TYPES = {
+    'APIObject': {'Client': 'ClientID', 'ID': 'xsd:int'},
+    'ClientID': {'ID': 'xsd:int'},
+    'Subscriber': {'Client': 'ClientID', 'ID': 'xsd:int', 'CreatedDate': 'xsd:dateTime', 'Attributes': 'Attribute'},
+    'Attribute': {'Name': 'xsd:string'},
+    'DataExtensionObject': {'Properties': 'DataExtensionObject.Properties'},
+    'DataExtensionObject.Properties': {'Property': 'APIProperty'},
+}
+
+REPLY = b"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
+               xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <soap:Body>
+    <RetrieveResponseMsg xmlns="http://exacttarget.com/wsdl/partnerAPI">
+      <OverallStatus>MoreDataAvailable</OverallStatus>
+      <RequestID>42</RequestID>
+      <Results xsi:type="DataExtensionObject">
+        <PartnerKey xsi:nil="true"/>
+        <ObjectID xsi:nil="true"/>
+        <Properties>
+          <Property><Name>C_ID</Name><Value>1</Value></Property>
+        </Properties>
+      </Results>
+      <Results xsi:type="Subscriber">
+        <Client><ID>7</ID></Client>
+        <EmailAddress>a@example.com</EmailAddress>
+        <Attributes><Name>First</Name><Value>A</Value></Attributes>
+      </Results>
+    </RetrieveResponseMsg>
+  </soap:Body>
+</soap:Envelope>"""
+
+
+class ParserTest(unittest.TestCase):
+
+    def test_read_status(self):
+        self.assertEqual(('MoreDataAvailable', '42'), read_retrieve_status(REPLY))
+
+    def test_iter_results(self):
+        rows = list(iter_retrieve_results(REPLY))
+
+        self.assertEqual([
+            {'PartnerKey': None, 'ObjectID': None, 'Properties': {'Property': [{'Name': 'C_ID', 'Value': '1'}]}},
+            {'Client': {'ID': '7'}, 'EmailAddress': 'a@example.com', 'Attributes': [{'Name': 'First', 'Value': 'A'}]},
+        ], rows)
+
+    def test_typed_values(self):
+        rows = list(iter_retrieve_results(REPLY, FIELD_TYPES))
+
+        # values of not declared fields and string fields are kept as text
+        self.assertEqual({'Property': [{'Name': 'C_ID', 'Value': '1'}]}, rows[0]['Properties'])
+        self.assertEqual({'ID': 7}, rows[1]['Client'])
+        self.assertEqual([{'Name': 'First', 'Value': 'A'}], rows[1]['Attributes'])
+
+    def test_streamed_response(self):
+        resp = StreamedResponse.make_from_content(REPLY)
+
+        self.assertTrue(resp.is_valid)
+        self.assertTrue(resp.more_results)
+        self.assertEqual('42', resp.request_id)
+        self.assertEqual(2, len(resp.results))
+
+
+class StreamedRetrieveTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(250)]
+        state.add_data_extension('stream_de', 'stream-de-key', ['C_ID', 'C_NAME'], ['C_ID'], rows)
+
+        return state
+
+    def test_iterate_pages(self):
+        cl = self.make_client_factory({'stream_results': True}).make()
+        res = cl.DataExtensionRow.set_name('stream_de').get(m_props=['C_ID', 'C_NAME'])
+
+        self.assertIsInstance(res.response, StreamedResponse)
+        self.assertEqual(100, res.entities_count)
+        self.assertEqual([str(i) for i in range(250)], [e.C_ID for e in res])
+
+    def test_same_entities_as_suds(self):
+        cl = self.make_client_factory().make()
+        handler = cl.DataExtensionRow.set_name('stream_de')
+
+        expected = [e.payload() for e in handler.get(m_props=['C_ID', 'C_NAME'])]
+
+        cl.stream_results = True
+        self.assertEqual(expected, [e.payload() for e in handler.get(m_props=['C_ID', 'C_NAME'])])
+
+    def test_same_values_as_suds(self):
+        props = ['Name', 'MaxLength', 'IsPrimaryKey', 'Ordinal', 'DataExtension.CustomerKey']
+        converter = get_converter().convert
+        values = []
+        for stream in (False, True):
+            cl = self.make_client_factory({'stream_results': stream}).make()
+            res = cl.DataExtensionField.get('stream-de-key', m_props=props)
+            values.append(res.response.to_dicts())
+
+            if stream:
+                raw = res.response.raw_response
+                values.append(convert_page(raw, converter, cl.soap_client_factory.field_types))
+                values.append(pickle.loads(pickle.dumps(res.response)).to_dicts())
+
+        suds_values, streamed, *others = values
+        self.assertEqual(suds_values, streamed)
+        for other in others:
+            self.assertEqual(suds_values, other)
+        self.assertEqual([0, 1], [r['Ordinal'] for r in streamed])
+        self.assertEqual([True, False], [r['IsPrimaryKey'] for r in streamed])
+
+        cl = self.make_client_factory({'stream_results': True}).make()
+        modified = [e.ModifiedDate for e in cl.DataExtension.get(m_props=['Name', 'ModifiedDate'])]
+        self.assertEqual([datetime.datetime(2020, 1, 1)], modified)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.exceptions import HTTPStatusError
+
+GATEWAY_ERROR = (503, b'<html>Service Unavailable</html>', 'text/html')
+
+
+class PrefetchIteratorTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(450)]
+        state.add_data_extension('prefetch_de', 'prefetch-de-key', ['C_ID', 'C_NAME'], ['C_ID'], rows)
+
+        return state
+
+    def get(self, params: dict = None):
+        cl = self.make_client_factory(params).make()
+
+        return cl.DataExtensionRow.set_name('prefetch_de').get(m_props=['C_ID'])
+
+    def test_page_order(self):
+        for depth in (1, 3):
+            with self.get().prefetch(depth) as entities:
+                self.assertEqual([str(i) for i in range(450)], [e.C_ID for e in entities])
+
+    def test_early_close(self):
+        res = self.get()
+        continued = self.state.requests.count('ContinueRetrieve')
+
+        with res.prefetch() as entities:
+            self.assertEqual('0', next(entities).C_ID)
+        entities._thread.join(timeout=5)
+
+        self.assertFalse(entities._thread.is_alive())
+        self.assertEqual([], list(entities))
+        # depth 1 fetches at most one page ahead of consumer
+        self.assertLessEqual(self.state.requests.count('ContinueRetrieve') - continued, 2)
+
+    def test_failing_page(self):
+        res = self.get({'retry_attempts': 1})
+        self.state.failures.append(GATEWAY_ERROR)
+        consumed = []
+
+        with self.assertRaises(HTTPStatusError):
+            for e in res.prefetch():
+                consumed.append(e.C_ID)
+
+        # entities of pages fetched before failure are delivered
+        self.assertEqual([str(i) for i in range(100)], consumed)
+
+
+if __name__ == '__main__':
+    unittest.main()
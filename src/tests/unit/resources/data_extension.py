@@ -1,7 +1,12 @@
 import uuid
 import unittest
-from tests import TestCase, INCLUDE_LONG_TESTS
+from tests import TestCase, StandInTestCase, INCLUDE_LONG_TESTS
+from tests.server import StandInState
 from sfmc import SearchFilter
+from sfmc.exceptions import HTTPStatusError, ResourceHandlerException
+from sfmc.resources.data_extension import UpsertResult, DataExtensionCatalog
+
+GATEWAY_ERROR = (503, b'<html>Service Unavailable</html>', 'text/html')
 
 
 class DETestCase(TestCase):
@@ -115,3 +120,130 @@ class DataExtension(DETestCase):
     @unittest.skip('Need account with special rights')
     def test_add_additional_fields_to_data_extension(self):
         self.assertTrue(False)
+
+
+class DataExtensionRowUpsertTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState()
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(3)]
+        state.add_data_extension('upsert_de', 'upsert-de-key', ['C_ID', 'C_NAME'], ['C_ID'], rows)
+        state.add_data_extension('upsert_chunks_de', 'upsert-chunks-de-key', ['C_ID', 'C_NAME'], ['C_ID'])
+
+        return state
+
+    def test_upsert(self):
+        cl = self.make_client_factory({'write_chunk_size': 2}).make()
+        handler = cl.DataExtensionRow.set_customer_key('upsert-de-key').set_name('upsert_de')
+        requests = len(self.state.requests)
+
+        res = handler.upsert([{'C_ID': '1', 'C_NAME': 'changed'}, {'C_ID': '10', 'C_NAME': 'new'},
+                              {'C_ID': '2', 'C_NAME': 'changed'}])
+
+        self.assertTrue(res.is_valid)
+        self.assertEqual([UpsertResult.UPDATED, UpsertResult.CREATED, UpsertResult.UPDATED], res.statuses)
+        self.assertEqual(2, len(self.state.requests) - requests)
+
+        rows = {e.C_ID: e.C_NAME for e in handler.get(m_props=['C_ID', 'C_NAME'])}
+        self.assertEqual({'0': 'name 0', '1': 'changed', '2': 'changed', '10': 'new'}, rows)
+
+    def test_failed_chunk(self):
+        for params, ids in (({}, range(30, 35)), ({'write_parallelism': 3}, range(40, 45))):
+            cl = self.make_client_factory(dict({'write_chunk_size': 2, 'retry_attempts': 1}, **params)).make()
+            handler = cl.DataExtensionRow.set_customer_key('upsert-chunks-de-key').set_name('upsert_chunks_de')
+            self.state.failures.append(GATEWAY_ERROR)
+
+            res = handler.upsert([{'C_ID': str(i), 'C_NAME': 'upserted'} for i in ids])
+
+            # parallel chunks race for injected failure, so failed chunk is found by its position
+            (offset, chunk, error), = res.errors
+            failed = list(range(offset, offset + len(chunk)))
+            self.assertIsInstance(error, HTTPStatusError)
+            self.assertFalse(res.is_valid)
+            self.assertEqual(failed, res.failed)
+            self.assertEqual([i for i in range(5) if i not in failed], res.created)
+            self.assertTrue(all(res.messages[i].startswith('Chunk failed') for i in failed))
+
+    def test_failed_rows(self):
+        cl = self.make_client_factory().make()
+
+        res = cl.DataExtensionRow.upsert({'C_ID': '20', 'C_NAME': 'x'}, customer_key='missing-key')
+
+        self.assertFalse(res.is_valid)
+        self.assertEqual([0], res.failed)
+        self.assertEqual(['Invalid CustomerKey'], res.messages)
+
+
+class DataExtensionCatalogTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=4)
+        for i in range(5):
+            state.add_data_extension('catalog_de_{}'.format(i), 'catalog-de-key-{}'.format(i), ['C_ID', 'C_NAME'],
+                                     ['C_ID'], modified_date='2020-01-0{}T00:00:00'.format(i + 1))
+
+        return state
+
+    def setUp(self):
+        # tests add data extensions, so each test gets fresh account data
+        self.state = self.server.state = self.make_state()
+
+    def test_lookups(self):
+        cl = self.make_client_factory({'de_catalog': True}).make()
+        self.assertIsInstance(cl.de_catalog, DataExtensionCatalog)
+
+        self.assertEqual('catalog_de_3', cl.DataExtension.name_for_customer_key('catalog-de-key-3'))
+        requests = len(self.state.requests)
+        self.assertEqual(5, len(cl.de_catalog))
+
+        self.assertEqual('catalog-de-key-1', cl.DataExtension.customer_key_for_name('catalog_de_1'))
+        fields = cl.DataExtensionField.set_customer_key('catalog-de-key-2').get(m_props=['Name', 'IsPrimaryKey'])
+        self.assertEqual(['C_ID', 'C_NAME'], [e.Name for e in fields.entities])
+        self.assertEqual(['C_ID'], cl.de_catalog.by_key('catalog-de-key-2').primary_key)
+        info = cl.de_catalog.by_name('catalog_de_4')
+        self.assertIs(info, cl.de_catalog.by_object_id(info.object_id))
+
+        self.assertEqual(requests, len(self.state.requests))
+
+    def test_fallback_to_retrieve(self):
+        cl = self.make_client_factory({'de_catalog': True}).make()
+        cl.de_catalog.load()
+        self.state.add_data_extension('catalog_late', 'catalog-late-key', ['C_ID'], ['C_ID'])
+        requests = len(self.state.requests)
+
+        self.assertEqual('catalog_late', cl.DataExtension.name_for_customer_key('catalog-late-key'))
+        self.assertEqual(requests + 1, len(self.state.requests))
+
+    def test_row_handler_catalog_miss(self):
+        cl = self.make_client_factory({'de_catalog': True}).make()
+        cl.de_catalog.load()
+        self.state.add_data_extension('catalog_late', 'catalog-late-key', ['C_ID'], ['C_ID'], [{'C_ID': '1'}])
+        handler = cl.DataExtensionRow.set_customer_key('catalog-late-key')
+
+        self.assertEqual(['1'], [str(e.C_ID) for e in handler.get(m_props=['C_ID'])])
+
+        with self.assertRaises(ResourceHandlerException):
+            handler.set_customer_key('catalog-missing-key').get(m_props=['C_ID'])
+
+    def test_row_handler_keys_in_a_row(self):
+        cl = self.make_client_factory({'de_catalog': True}).make()
+        self.state.add_data_extension('catalog_rows_1', 'catalog-rows-key-1', ['C_ID'], ['C_ID'], [{'C_ID': '1'}])
+        self.state.add_data_extension('catalog_rows_2', 'catalog-rows-key-2', ['C_ID'], ['C_ID'], [{'C_ID': '2'}])
+        handler = cl.DataExtensionRow
+
+        for key, ids in (('catalog-rows-key-1', ['1']), ('catalog-rows-key-2', ['2'])):
+            self.assertEqual(ids, [str(e.C_ID) for e in handler.set_customer_key(key).get(m_props=['C_ID'])])
+
+    def test_incremental_refresh(self):
+        cl = self.make_client_factory({'de_catalog': True}).make()
+        cl.de_catalog.load()
+        self.state.add_data_extension('catalog_new', 'catalog-new-key', ['C_ID', 'C_EMAIL'], ['C_ID'],
+                                      modified_date='2020-02-01T00:00:00')
+
+        cl.de_catalog.refresh()
+
+        self.assertEqual(6, len(cl.de_catalog))
+        self.assertEqual(['C_ID', 'C_EMAIL'], cl.de_catalog.by_key('catalog-new-key').field_names)
+        self.assertEqual('catalog-new-key', cl.DataExtension.customer_key_for_name('catalog_new'))
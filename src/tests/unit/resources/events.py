@@ -1,6 +1,12 @@
+import datetime
+import os
 import unittest
-from tests import TestCase, ALLOW_BASED_ON_INTERNAL_CREDS_TESTS
+from tests import TestCase, StandInTestCase, ALLOW_BASED_ON_INTERNAL_CREDS_TESTS
+from tests.server import StandInState
 from sfmc import ObjectDefinition
+from sfmc.resources.events import EventSync
+
+START = datetime.datetime(2020, 1, 1)
 
 
 class BounceEventTestCase(TestCase):
@@ -68,3 +74,58 @@ class SMSMOEventTestCase(TestCase):
         self.assertTrue(resp.is_valid)
         if len(resp.entities) > 0:
             self.assertTrue(resp.entities[0].ObjectID)
+
+
+class EventSyncTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=5)
+        state.add_objects('SentEvent', [
+            {'SendID': str(i), 'SubscriberKey': 'key {}'.format(i), 'EventType': 'Sent',
+             'EventDate': (START + datetime.timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%S')} for i in range(48)])
+
+        return state
+
+    def make_client(self, params: dict):
+        mode = 'stream' if params.get('stream_results') else 'suds'
+        checkpoints = os.path.join(self.tmp_dir, 'checkpoints', self.id().rsplit('.', 1)[-1], mode)
+
+        return self.make_client_factory(dict({'sync_checkpoint_path': checkpoints}, **params)).make()
+
+    def test_windows_are_split_and_ordered(self):
+        for params in ({}, {'stream_results': True}):
+            cl = self.make_client(params)
+            options = {'window': datetime.timedelta(hours=12), 'max_pages': 2, 'checkpoints': None}
+
+            windows = list(cl.SentEvent.sync(START, START + datetime.timedelta(days=2), m_props=['SendID'], **options))
+
+            self.assertEqual(8, len(windows))
+            self.assertEqual([datetime.timedelta(hours=6)] * 8, [w.end - w.start for w in windows])
+            self.assertEqual(list(range(48)), [e.SendID for w in windows for e in w])
+
+    def test_sync_continues_from_checkpoint(self):
+        props = ['SendID', 'EventDate']
+
+        for params in ({}, {'stream_results': True}):
+            # checkpoints are kept per path, so both paths start from scratch
+            cl = self.make_client(params)
+
+            first = list(cl.SentEvent.sync(START, START + datetime.timedelta(hours=30), m_props=props))
+            self.assertEqual(30, sum(w.entities_count for w in first))
+
+            second = list(cl.SentEvent.sync(until=START + datetime.timedelta(days=3), m_props=props))
+            self.assertEqual(list(range(30, 48)), [e.SendID for w in second for e in w])
+
+            with self.assertRaises(ValueError):
+                list(cl.BounceEvent.sync(m_props=['SendID']))
+
+    def test_default_until_in_account_zone(self):
+        handler = self.make_client({}).SentEvent
+        utc_now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+        for offset in (datetime.timedelta(hours=-6), datetime.timedelta(hours=3)):
+            sync = EventSync(handler, lag=datetime.timedelta(minutes=10), checkpoints=None, utc_offset=offset)
+            expected = utc_now + offset - datetime.timedelta(minutes=10)
+
+            self.assertLess(abs(sync.default_until() - expected), datetime.timedelta(minutes=1))
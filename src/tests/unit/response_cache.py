@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc import SearchFilter
+from sfmc.cache import MemoryCache
+from sfmc.client import Response, ResponseCache
+
+FIELDS = ['C_ID', 'C_NAME']
+
+
+def make_response() -> Response:
+    response = Response()
+    response.code = 200
+    response.status = response.valid_response = True
+    response.message = 'OK'
+    response.results = []
+
+    return response
+
+
+class ResponseCacheKeyTest(unittest.TestCase):
+
+    def test_key(self):
+        f = SearchFilter.equals('CustomerKey', 'a')
+        key = ResponseCache.make_key('ns', 'DataExtensionObject[de]', f, ['Name'], {'BatchSize': 10})
+        same = SearchFilter.equals('CustomerKey', 'a')
+
+        self.assertEqual(key, ResponseCache.make_key('ns', 'DataExtensionObject[de]', same, ['Name'],
+                                                     {'BatchSize': 10}))
+        self.assertEqual(('ns', 'DataExtensionObject', 'DataExtensionObject[de]'), key[:3])
+        self.assertNotEqual(key, ResponseCache.make_key('ns', 'DataExtensionObject[de]', f, ['Name']))
+        self.assertNotEqual(key, ResponseCache.make_key('ns', 'DataExtensionObject[de]', f, ['Name'], {'BatchSize': 10},
+                                                        stream=True))
+
+    def test_type_ttl(self):
+        cache = ResponseCache(ttls={'DataExtension': 60, 'DataExtensionObject': 5})
+
+        self.assertEqual(60, cache.type_ttl('DataExtension'))
+        self.assertEqual(5, cache.type_ttl('DataExtensionObject[de]'))
+        self.assertIsNone(cache.type_ttl('Email'))
+        self.assertEqual(1, ResponseCache(ttl=1, ttls={'Email': 2}).type_ttl('Subscriber'))
+
+    def test_invalidate_visits_only_type(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, True)
+        cache = ResponseCache(ttl=60, path=path)
+        keys = [ResponseCache.make_key(namespace, obj_type, SearchFilter.equals('ID', str(i)))
+                for namespace in ('ns', 'other') for obj_type in ('Email', 'DataExtensionObject[de]') for i in range(3)]
+        for key in keys:
+            cache.set(key, make_response())
+
+        loaded = []
+        load = cache._file._load
+        cache._file._load = lambda file_name: loaded.append(file_name) or load(file_name)
+        cache.invalidate('ns', 'DataExtensionObject[other_de]')
+
+        self.assertEqual([], loaded)
+        restarted = ResponseCache(ttl=60, path=path)
+        for c in (cache, restarted):
+            self.assertEqual([k for k in keys if k[:2] != ('ns', 'DataExtensionObject')],
+                             [k for k in keys if c.get(k) is not None])
+
+    def test_memory_groups_follow_eviction(self):
+        cache = MemoryCache(max_size=2, group_size=1)
+        for key in (('a', 1), ('b', 1), ('a', 2)):
+            cache.set(key, key)
+
+        cache.delete_group(('a',))
+
+        self.assertEqual([('b', 1)], cache.keys())
+        self.assertEqual({('b',): {('b', 1)}}, cache._groups)
+
+
+class ResponseCacheTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(10)]
+        state.add_data_extension('cached_de', 'cached-de-key', FIELDS, ['C_ID'], rows)
+
+        return state
+
+    def make_client(self, params: dict = None):
+        factory = self.make_client_factory({'response_cache_ttls': {'DataExtension': 60, 'DataExtensionObject': 60}})
+        if params is not None:
+            factory.set_params(params)
+
+        return factory.make()
+
+    def count_requests(self, fn, action: str = None) -> int:
+        requests = len(self.state.requests)
+        fn()
+
+        return len([a for a in self.state.requests[requests:] if action in (None, a)])
+
+    def test_lookup_is_cached(self):
+        cl = self.make_client()
+
+        self.assertEqual(1, self.count_requests(lambda: cl.DataExtension.name_for_customer_key('cached-de-key')))
+        self.assertEqual(0, self.count_requests(lambda: cl.DataExtension.name_for_customer_key('cached-de-key')))
+        self.assertEqual(1, self.count_requests(lambda: cl.DataExtension.customer_key_for_name('cached_de')))
+        # not cached type, first get also describes DataExtensionField, so only retrieves are counted
+        self.assertEqual(1, self.count_requests(lambda: cl.DataExtensionField.get('cached-de-key'), 'Retrieve'))
+        self.assertEqual(1, self.count_requests(lambda: cl.DataExtensionField.get('cached-de-key'), 'Retrieve'))
+
+    def test_write_invalidates_type(self):
+        cl = self.make_client()
+        handler = cl.DataExtensionRow.set_name('cached_de').set_customer_key('cached-de-key')
+        f = SearchFilter.equals('C_ID', '3')
+
+        self.assertEqual(['name 3'], [e.C_NAME for e in handler.get(m_filter=f, m_props=FIELDS)])
+        self.assertEqual(0, self.count_requests(lambda: handler.get(m_filter=f, m_props=FIELDS)))
+
+        handler.update({'C_ID': '3', 'C_NAME': 'renamed'})
+
+        self.assertEqual(['renamed'], [e.C_NAME for e in handler.get(m_filter=f, m_props=FIELDS)])
+
+    def test_ttl_and_shared_directory(self):
+        path = os.path.join(self.tmp_dir, 'responses')
+        cl = self.make_client({'response_cache_ttls': {'DataExtension': 0.2}, 'response_cache_path': path})
+        cl.DataExtension.name_for_customer_key('cached-de-key')
+
+        other = self.make_client({'response_cache_ttls': {'DataExtension': 0.2}, 'response_cache_path': path})
+        self.assertEqual(0, self.count_requests(lambda: other.DataExtension.name_for_customer_key('cached-de-key')))
+
+        time.sleep(0.3)
+        self.assertEqual(1, self.count_requests(lambda: cl.DataExtension.name_for_customer_key('cached-de-key')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+
+import requests
+
+from tests import StandInTestCase
+from tests.server import StandInState, StandInHandler
+from sfmc.exceptions import HTTPStatusError
+from sfmc.metrics import MetricsRegistry, MetricsInstrumentation
+from sfmc.retry import RetryPolicy, RETRY_CONNECTION, RETRY_SERVER, RETRY_THROTTLED, RETRY_AUTH
+
+XML = 'text/xml; charset=utf-8'
+GATEWAY_ERROR = (503, b'<html>Service Unavailable</html>', 'text/html')
+THROTTLED_FAULT = (500, StandInHandler._fault('Server.TooBusy: request is throttled'), XML)
+EXPIRED_TOKEN_FAULT = (500, StandInHandler._fault('Token Expired'), XML)
+VALIDATION_FAULT = (500, StandInHandler._fault('Invalid property'), XML)
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_classify_error(self):
+        policy = RetryPolicy()
+
+        self.assertEqual(RETRY_CONNECTION, policy.classify_error(requests.ConnectionError()))
+        self.assertEqual(RETRY_CONNECTION, policy.classify_error(requests.ReadTimeout()))
+        self.assertEqual(RETRY_SERVER, policy.classify_error(HTTPStatusError('Http error 502', 502)))
+        self.assertEqual(RETRY_THROTTLED, policy.classify_error(HTTPStatusError('Http error 429', 429)))
+        self.assertEqual(RETRY_AUTH, policy.classify_error(HTTPStatusError('Http error 401', 401)))
+        self.assertIsNone(policy.classify_error(HTTPStatusError('Http error 404', 404)))
+        self.assertIsNone(policy.classify_error(ValueError()))
+
+    def test_writes_retried_only_if_rejected(self):
+        policy = RetryPolicy(attempts=3)
+
+        self.assertTrue(policy.should_retry('ContinueRetrieve', RETRY_CONNECTION, 1))
+        self.assertTrue(policy.should_retry('Create', RETRY_THROTTLED, 1))
+        self.assertFalse(policy.should_retry('Create', RETRY_CONNECTION, 1))
+        self.assertFalse(policy.should_retry('Retrieve', RETRY_CONNECTION, 3))
+        self.assertFalse(policy.should_retry('Retrieve', None, 1))
+
+        policy.retry_writes = True
+        self.assertTrue(policy.should_retry('Create', RETRY_CONNECTION, 1))
+
+    def test_delay_is_bounded(self):
+        policy = RetryPolicy(backoff=1, backoff_max=10)
+
+        for attempt in range(1, 10):
+            self.assertLessEqual(policy.delay(RETRY_SERVER, attempt), 10)
+            self.assertGreaterEqual(policy.delay(RETRY_SERVER, attempt), min(10, 2 ** (attempt - 1)) / 2)
+        self.assertEqual(0, policy.delay(RETRY_AUTH, 1))
+
+
+class RetryTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(250)]
+        state.add_data_extension('retry_de', 'retry-de-key', ['C_ID', 'C_NAME'], ['C_ID'], rows)
+        # written rows go to own data extension, so retrieves of other tests see same rows
+        state.add_data_extension('retry_write_de', 'retry-write-de-key', ['C_ID', 'C_NAME'], ['C_ID'])
+
+        return state
+
+    def setUp(self):
+        self.state.failures.clear()
+
+    def make_client(self, params: dict = None):
+        factory = self.make_client_factory({'retry_backoff': 0})
+        if params is not None:
+            factory.set_params(params)
+        factory.instrumentation = MetricsInstrumentation(MetricsRegistry())
+
+        return factory.make(), factory.instrumentation
+
+    def test_failed_page_is_retried(self):
+        for params in ({}, {'stream_results': True}):
+            cl, instrumentation = self.make_client(params)
+            res = cl.DataExtensionRow.set_name('retry_de').get(m_props=['C_ID'])
+
+            self.state.failures.extend([GATEWAY_ERROR, THROTTLED_FAULT])
+            self.assertEqual(250, len(list(res)))
+
+            labels = {'operation': 'ContinueRetrieve', 'object_type': 'DataExtensionObject[retry_de]'}
+            self.assertEqual(1, instrumentation.retries.get(reason=RETRY_SERVER, **labels))
+            self.assertEqual(1, instrumentation.retries.get(reason=RETRY_THROTTLED, **labels))
+
+    def test_expired_token_is_refreshed(self):
+        cl, instrumentation = self.make_client()
+        token = cl.authenticator.auth_token
+
+        self.state.failures.append(EXPIRED_TOKEN_FAULT)
+        res = cl.DataExtensionRow.set_name('retry_de').get(m_props=['C_ID'])
+
+        self.assertTrue(res.is_valid)
+        self.assertNotEqual(token, cl.authenticator.auth_token)
+
+    def test_attempts_are_bounded(self):
+        cl, _ = self.make_client({'retry_attempts': 2})
+
+        self.state.failures.extend([GATEWAY_ERROR] * 2)
+        with self.assertRaises(HTTPStatusError):
+            cl.DataExtensionRow.set_name('retry_de').get(m_props=['C_ID'])
+
+    def test_fault_is_not_retried(self):
+        cl, instrumentation = self.make_client()
+
+        self.state.failures.append(VALIDATION_FAULT)
+        res = cl.DataExtensionRow.set_name('retry_de').get(m_props=['C_ID'])
+
+        self.assertFalse(res.is_valid)
+        self.assertEqual('Invalid property', res.response.fault)
+
+    def test_create_is_not_repeated(self):
+        cl, _ = self.make_client()
+        handler = cl.DataExtensionRow.set_name('retry_write_de').set_customer_key('retry-write-de-key')
+
+        self.state.failures.append(GATEWAY_ERROR)
+        with self.assertRaises(HTTPStatusError):
+            handler.add({'C_ID': 'retry-1', 'C_NAME': 'a'})
+
+        self.state.failures.append(THROTTLED_FAULT)
+        self.assertTrue(handler.add({'C_ID': 'retry-2', 'C_NAME': 'b'}).is_valid)
+
+
+if __name__ == '__main__':
+    unittest.main()
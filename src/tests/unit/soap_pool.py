@@ -0,0 +1,68 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.client import SoapClientPool
+
+
+def oauth_token(soap_client) -> str:
+    return soap_client.options.soapheaders[0].getChild('oAuthToken').getText()
+
+
+class SoapClientPoolTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        state.add_objects('Email', [{'ID': str(i), 'Name': 'email {}'.format(i)} for i in range(10)])
+
+        return state
+
+    def make_authenticator(self, factory, token: str):
+        authenticator = factory.make_authentificator()
+        authenticator.refresh()
+        authenticator.auth_legacy_token = token
+
+        return authenticator
+
+    def test_checkout_isolation(self):
+        factory = self.make_client_factory()
+        pool = SoapClientPool(factory.make_soap_factory())
+        first = pool.checkout(self.make_authenticator(factory, 'first'))
+        second = pool.checkout(self.make_authenticator(factory, 'second'))
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.options.transport, second.options.transport)
+        self.assertIs(first.wsdl, second.wsdl)
+        self.assertIs(first.factory, second.factory)
+        self.assertEqual(['first', 'second'], [oauth_token(first), oauth_token(second)])
+
+    def test_checkin_reuse(self):
+        factory = self.make_client_factory()
+        pool = SoapClientPool(factory.make_soap_factory(), size=2)
+        clients = [pool.checkout(self.make_authenticator(factory, 'first')) for _ in range(3)]
+        for cl in clients:
+            pool.checkin(cl)
+
+        reused = pool.checkout(self.make_authenticator(factory, 'second'))
+
+        self.assertIs(clients[1], reused)
+        self.assertEqual('second', oauth_token(reused))
+        self.assertEqual(1, len(pool._idle))
+
+    def test_concurrent_calls(self):
+        cl = self.make_client_factory({'soap_pool_size': 2}).make()
+
+        def call(_):
+            return sorted(int(e.ID) for e in cl.Email.get(m_props=['ID', 'Name']))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(call, range(16)))
+
+        self.assertEqual([list(range(10))] * 16, results)
+        self.assertLessEqual(len(cl.soap_client_pool._idle), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
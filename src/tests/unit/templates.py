@@ -0,0 +1,63 @@
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc import SearchFilter
+from sfmc.templates import filter_shape
+
+FIELDS = ['C_ID', 'C_NAME']
+
+
+class FilterShapeTest(unittest.TestCase):
+
+    def test_values_are_not_part_of_shape(self):
+        def make(c_id, name):
+            return SearchFilter.both(SearchFilter.equals('C_ID', c_id), SearchFilter.like('C_NAME', name)).payload()
+
+        self.assertEqual(filter_shape(make('1', 'a%')), filter_shape(make('2', 'b%')))
+        self.assertNotEqual(filter_shape(make('1', 'a%')), filter_shape(SearchFilter.equals('C_ID', '1').payload()))
+
+
+class RequestTemplatesTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState(page_size=100)
+        rows = [{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in range(20)]
+        state.add_data_extension('templates_de', 'templates-de-key', FIELDS, ['C_ID'], rows)
+
+        return state
+
+    def test_copies_are_independent(self):
+        cl = self.make_client_factory().make()
+
+        first = cl.templates.create('RetrieveRequest')
+        first.ObjectType = 'DataExtension'
+        first.Properties.append('Name')
+        second = cl.templates.create('RetrieveRequest')
+
+        self.assertIsNone(second.ObjectType)
+        self.assertEqual([], second.Properties)
+        self.assertIs(first.__metadata__, second.__metadata__)
+
+    def test_values_are_bound_per_request(self):
+        cl = self.make_client_factory().make()
+        handler = cl.DataExtensionRow.set_name('templates_de')
+
+        for i in (3, 7, 11):
+            f = SearchFilter.one_from(SearchFilter.equals('C_ID', str(i)), SearchFilter.equals('C_ID', str(i + 1)),
+                                      SearchFilter.equals('C_NAME', 'name {}'.format(i + 2)))
+            res = handler.get(m_filter=f, m_props=FIELDS)
+            self.assertEqual([str(i), str(i + 1), str(i + 2)], sorted((e.C_ID for e in res), key=int))
+
+        obj_type = 'DataExtensionObject[templates_de]'
+        request = cl.make_retrieve_request(obj_type, SearchFilter.equals('C_ID', '1'), FIELDS, {'BatchSize': 10})
+        self.assertEqual('1', request.Filter.Value)
+        self.assertEqual(10, request.Options.BatchSize)
+        request = cl.make_retrieve_request(obj_type, SearchFilter.equals('C_ID', '2'), FIELDS)
+        self.assertEqual('2', request.Filter.Value)
+        self.assertIsNone(request.Options.BatchSize)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+from tests import StandInTestCase
+from tests.server import StandInState
+from sfmc.client import Client, Response
+from sfmc.exceptions import HTTPStatusError, PartialWriteError
+
+GATEWAY_ERROR = (503, b'<html>Service Unavailable</html>', 'text/html')
+FIELDS = ['C_ID', 'C_NAME']
+
+
+class Result:
+
+    def __init__(self, ordinal_id):
+        self.OrdinalID = ordinal_id
+
+
+def make_response(count: int) -> Response:
+    response = Response()
+    response.code = 200
+    response.status = response.valid_response = True
+    response.message = 'OK'
+    response.results = [Result(i) for i in range(count)]
+
+    return response
+
+
+class WriteChunksTest(unittest.TestCase):
+
+    def test_split_by_count(self):
+        cl = Client()
+        cl.write_chunk_size = 2
+
+        self.assertEqual([[1, 2], [3, 4], [5]], cl.write_chunks([1, 2, 3, 4, 5]))
+        self.assertEqual([{'C_ID': 1}], cl.write_chunks({'C_ID': 1}))
+
+    def test_split_by_bytes(self):
+        cl = Client()
+        cl.write_chunk_bytes = 300
+        objects = [{'C_ID': str(i), 'C_NAME': 'x' * 100} for i in range(5)]
+
+        chunks = cl.write_chunks(objects)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(objects, [o for c in chunks for o in c])
+        # object bigger than limit forms own chunk
+        self.assertEqual([[{'C_NAME': 'x' * 1000}]], cl.write_chunks([{'C_NAME': 'x' * 1000}]))
+
+    def test_ordinal_shift(self):
+        chunks = [[1, 2], [3, 4], [5]]
+
+        merged = Client.merge_write_responses(chunks, [make_response(2), make_response(2), make_response(1)])
+
+        self.assertEqual([0, 1, 2, 3, 4], [r.OrdinalID for r in merged.results])
+        self.assertTrue(merged.is_valid)
+
+    def test_failed_chunk_is_skipped(self):
+        chunks = [[1, 2], [3, 4], [5]]
+        error = ValueError('failed')
+
+        with self.assertRaises(PartialWriteError) as ctx:
+            Client.merge_write_outcomes(chunks, [make_response(2), error, make_response(1)])
+
+        self.assertEqual([0, 1, 4], [r.OrdinalID for r in ctx.exception.response.results])
+        self.assertEqual([(2, [3, 4], error)], ctx.exception.errors)
+        self.assertIs(error, ctx.exception.__cause__)
+
+        with self.assertRaises(ValueError):
+            Client.merge_write_outcomes(chunks[:1], [error])
+
+
+class SoapWriteTest(StandInTestCase):
+
+    @classmethod
+    def make_state(cls) -> StandInState:
+        state = StandInState()
+        state.add_data_extension('write_de', 'write-de-key', FIELDS, ['C_ID'])
+
+        return state
+
+    def add(self, ids, params: dict = None):
+        cl = self.make_client_factory(dict({'write_chunk_size': 2, 'retry_attempts': 1}, **(params or {}))).make()
+        handler = cl.DataExtensionRow.set_customer_key('write-de-key').set_name('write_de')
+
+        return handler.add([{'C_ID': str(i), 'C_NAME': 'name {}'.format(i)} for i in ids])
+
+    def test_chunks_are_merged(self):
+        requests = self.state.requests.count('Create')
+
+        res = self.add(range(5))
+
+        self.assertTrue(res.is_valid)
+        self.assertEqual(3, self.state.requests.count('Create') - requests)
+        self.assertEqual([0, 1, 2, 3, 4], [r.OrdinalID for r in res.response.results])
+
+    def test_written_chunks_are_reported(self):
+        for params, ids in (({}, range(10, 15)), ({'write_parallelism': 3}, range(20, 25))):
+            self.state.failures.append(GATEWAY_ERROR)
+
+            with self.assertRaises(PartialWriteError) as ctx:
+                self.add(ids, params)
+
+            # parallel chunks race for injected failure, so failed chunk is found by its position
+            (offset, chunk, error), = ctx.exception.errors
+            failed = list(range(offset, offset + len(chunk)))
+            self.assertIsInstance(error, HTTPStatusError)
+            self.assertEqual([str(ids[i]) for i in failed], [o['Properties']['Property'][0]['Value'] for o in chunk])
+            self.assertEqual([i for i in range(5) if i not in failed],
+                             [r.OrdinalID for r in ctx.exception.response.results])
+
+            rows = {r['C_ID'] for r in self.state.data_extensions['write_de']['rows']}
+            self.assertEqual({str(ids[i]) for i in range(5) if i not in failed}, rows & {str(i) for i in ids})
+
+
+if __name__ == '__main__':
+    unittest.main()
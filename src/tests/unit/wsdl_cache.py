@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+
+from tests import StandInTestCase
+from tests.server import WSDL_PATH
+from sfmc.client import SoapClientFactory, WsdlObjectCache, WSDL_PICKLE_RECURSION_LIMIT
+
+
+class WsdlCacheTest(StandInTestCase):
+
+    def setUp(self):
+        self.local_path = os.path.join(self.tmp_dir, self.id().rsplit('.', 1)[-1], 'etframework.wsdl')
+        os.makedirs(os.path.dirname(self.local_path))
+
+    def make_factory(self) -> SoapClientFactory:
+        factory = SoapClientFactory(local_path=self.local_path, url=self.server.base_url + WSDL_PATH)
+        factory.init()
+
+        return factory
+
+    def cache_files(self, factory: SoapClientFactory) -> dict:
+        location = factory._cache_location()
+
+        return {name: os.path.getmtime(os.path.join(location, name))
+                for name in os.listdir(location) if name.startswith('suds-')}
+
+    def test_round_trip(self):
+        factory = self.make_factory()
+        factory._make_soap_client()
+        files = self.cache_files(factory)
+        self.assertTrue(files)
+
+        # files kept old show that restarted process reads parsed wsdl instead of writing it again
+        for name in files:
+            os.utime(os.path.join(factory._cache_location(), name), (1000, 1000))
+        restarted = self.make_factory()
+        soap_client = restarted._make_soap_client()
+
+        self.assertEqual({name: 1000 for name in files}, self.cache_files(restarted))
+        self.assertIsNotNone(soap_client.factory.create('Email'))
+
+    def test_deep_object(self):
+        cache = WsdlObjectCache(location=os.path.dirname(self.local_path))
+        deep = []
+        for _ in range(WSDL_PICKLE_RECURSION_LIMIT // 4):
+            deep = [deep]
+
+        cache.put('deep', deep)
+        restored = cache.get('deep')
+
+        depth = 0
+        while restored:
+            restored, depth = restored[0], depth + 1
+        self.assertEqual(WSDL_PICKLE_RECURSION_LIMIT // 4, depth)
+        self.assertGreaterEqual(sys.getrecursionlimit(), WSDL_PICKLE_RECURSION_LIMIT)
+
+    def test_stale_purged_after_download(self):
+        factory = self.make_factory()
+        factory._make_soap_client()
+        stale = os.path.join(factory._cache_root(), 'v0-stale')
+        os.makedirs(stale)
+
+        self.make_factory()
+        self.assertTrue(os.path.isdir(stale))
+
+        os.utime(self.local_path, (1000, 1000))
+        self.make_factory()
+        self.assertFalse(os.path.isdir(stale))
+        self.assertTrue(os.path.isdir(factory._cache_location()))
+
+
+if __name__ == '__main__':
+    unittest.main()